@@ -11,6 +11,8 @@ from src.fw.algorithms.gradient_search import GradientSearch
 from src.fw.algorithms.greedy import GreedySearch
 from src.fw.algorithms.a_star import AStar
 from src.fw.algorithms.random_algo import FullRandom
+from src.fw.algorithms.bfhs import BreadthFirstHeuristicSearch
+from src.fw.algorithms.beam import BeamSearch
 
 
 def algorithms() -> tuple[Algorithm]:
@@ -25,6 +27,10 @@ def algorithms() -> tuple[Algorithm]:
         GreedySearch(),
         GradientSearch(),
         AStar(),
+        BeamSearch(),
+
+        # Memory-bounded algorithms
+        BreadthFirstHeuristicSearch(),
 
         # Random algorithms
         # Random()
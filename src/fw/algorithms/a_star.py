@@ -1,5 +1,8 @@
-from src.fw import State
+import heapq
+
+from src.fw import State, Union
 from src.fw.algorithms.base import Algorithm
+from src.fw.algorithms.closed_set import ClosedSet
 
 
 class AStar(Algorithm):
@@ -7,29 +10,62 @@ class AStar(Algorithm):
     heuristic functions to evaluate each node in the graph and using this
     approach it usually finds a very good solution.
 
-    The drawback is that this naive implementation is not optimized for this
-    approach and takes longer time to search (due to the nature of the
-    parents back-tracking).
+    The cost to get to the state (g) is the sum of the costs of the applied
+    operators, so it works with weighted operators as well.
+
+    The fringe is a binary heap ordered by `g + h` (the states of the same
+    value in the order they were scheduled), so each state is estimated just
+    once, when it's scheduled, and the best one is found in a logarithmic
+    time.
     """
 
-    def __init__(self):
-        super().__init__("A_STAR")
+    def __init__(self, closed_set: Union[ClosedSet, None] = None):
+        super().__init__("A_STAR", closed_set)
+
+        # Scheduled states with their g + h and the order of scheduling
+        self.__heap: list[tuple[float, int, State]] = []
+        self.__scheduled = 0
+
+    @property
+    def fringe(self) -> tuple[State]:
+        return tuple([state for _, _, state in self.__heap])
+
+    @property
+    def fringe_size(self) -> int:
+        return len(self.__heap)
+
+    def add_to_fringe(self, state: State):
+        heapq.heappush(
+            self.__heap, (self._g_plus_h(state), self.__scheduled, state))
+        self.__scheduled += 1
+
+    def drop_from_fringe(self, state: State):
+        for index, (_, _, scheduled) in enumerate(self.__heap):
+            if scheduled == state:
+                self.__heap.pop(index)
+                heapq.heapify(self.__heap)
+                return
+
+        raise ValueError("State is not in the fringe")
+
+    def reset(self):
+        super().reset()
+        self.__heap.clear()
+        self.__scheduled = 0
 
-    def next_state(self):
+    def next_state(self) -> State:
         """Tries to find a best state considering both path length from the
         beginning and a lower bound estimate of a cost to get to the goal
         state."""
 
-        # Find the best state to search in and remove it from fringe
-        best = min(self.fringe, key=self._g_plus_h)
-        self.drop_from_fringe(best)
-        return best
+        # Take the best state to search in out of the fringe
+        return heapq.heappop(self.__heap)[2]
 
     def _g_plus_h(self, state: State) -> float:
         """Helper function to evaluate a state to a float by a cost to
         get to the current state (g) and a lower-bound cost estimate to
         get from it to the goal state (h).
         """
-        g = len(state.all_parents())
-        h = state.distance_from(self.goal_state)
+        g = state.path_cost
+        h = self.estimate(state)
         return g + h
@@ -1,31 +1,79 @@
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Sequence
 
 from src.fw import State, Operator, Union
+from src.fw.algorithms.closed_set import (
+    ClosedSet, ListClosedSet, RankedClosedSet)
+from src.fw.heuristic import Heuristic
+from src.fw.ranking import Ranking
+
+
+@dataclass
+class SearchStatistics:
+    """Summary of the work done by an algorithm during the last search."""
+
+    expanded: int                   # Number of states searched in
+    generated: int                  # Number of descendants created
+    closed: int                     # Number of closed states
+    omission_probability: float     # Chance a state was skipped mistakenly
 
 
 class Algorithm(ABC):
     """Abstract class declaring the protocol of an algorithm to search the
     state space.
+
+    The algorithm remembers the already searched states in a closed set. By
+    default, it's an exact one comparing the states one by one, but any
+    other (like a probabilistic one with a fixed memory footprint) can be
+    given instead.
     """
 
-    def __init__(self, name: str):
+    def __init__(self, name: str, closed_set: Union[ClosedSet, None] = None):
         self.__name = name
         self.__goal: Union[State, None] = None
+        self.__ranking: Union[Ranking, None] = None
+        self.__heuristic: Union[Heuristic, None] = None
 
         # Scheduled states to be searched in
         self.__fringe: list[State] = []
 
+        # Closed set given by the caller (kept for all the searches)
+        self.__given_closed = closed_set
+
         # States the algorithm already searched and found their descendants
-        self.__closed: list[State] = []
+        self.__closed = (
+            closed_set if closed_set is not None else ListClosedSet())
+
+        # Counters of the work done
+        self.__expanded = 0
+        self.__generated = 0
 
     @property
     def fringe(self) -> tuple[State]:
         return tuple(self.__fringe)
 
+    @property
+    def fringe_size(self) -> int:
+        """Number of the states scheduled to be searched."""
+        return len(self.__fringe)
+
     @property
     def closed(self) -> tuple[State]:
         return tuple(self.__closed)
 
+    @property
+    def closed_set(self) -> ClosedSet:
+        """Collection of the already searched states."""
+        return self.__closed
+
+    @closed_set.setter
+    def closed_set(self, closed_set: ClosedSet):
+        """Replaces the collection of the already searched states (for all
+        the following searches)."""
+        self.__given_closed = closed_set
+        self.__closed = closed_set
+
     def add_to_fringe(self, state: State):
         self.__fringe.append(state)
 
@@ -36,10 +84,38 @@ class Algorithm(ABC):
         self.__fringe.remove(state)
 
     def add_to_closed(self, state: State):
-        self.__closed.append(state)
+        self.__closed.add(state)
 
     def is_in_closed(self, state: State) -> bool:
-        return state in self.closed
+        return state in self.__closed
+
+    def note_expansion(self, n_generated: int):
+        """Counts a searched state with the given number of descendants."""
+        self.__expanded += 1
+        self.__generated += n_generated
+
+    def note_expansions(self, n_expanded: int, n_generated: int):
+        """Counts the given number of the searched states with all their
+        descendants at once (for the algorithms expanding them in bulk)."""
+        self.__expanded += n_expanded
+        self.__generated += n_generated
+
+    def reset(self):
+        """Forgets everything from the previous search."""
+        self.__fringe.clear()
+        self.__closed.clear()
+        self.__expanded = 0
+        self.__generated = 0
+
+    @property
+    def statistics(self) -> SearchStatistics:
+        """Summary of the work done during the last search."""
+        return SearchStatistics(
+            expanded=self.__expanded,
+            generated=self.__generated,
+            closed=len(self.__closed),
+            omission_probability=self.__closed.omission_probability
+        )
 
     @property
     def name(self) -> str:
@@ -57,6 +133,65 @@ class Algorithm(ABC):
         """
         self.__goal = goal
 
+    @property
+    def ranking(self) -> Union[Ranking, None]:
+        """Ranking of the states of the searched problem. When given, the
+        algorithm can use array-indexed tables instead of collections of
+        states."""
+        return self.__ranking
+
+    @ranking.setter
+    def ranking(self, ranking: Union[Ranking, None]):
+        """Setter for the ranking of the states of the searched problem.
+
+        When no closed set was given by the caller, the ranking decides the
+        default one - a bit array indexed by the ranks when it's given,
+        the exact list of the states otherwise.
+        """
+        self.__ranking = ranking
+
+        if self.__given_closed is None:
+            self.__closed = (
+                RankedClosedSet(ranking) if ranking else ListClosedSet())
+
+    @property
+    def heuristic(self) -> Union[Heuristic, None]:
+        """Heuristic the informed algorithms estimate the cost to the goal
+        with. When not given, the distance of the states is used."""
+        return self.__heuristic
+
+    @heuristic.setter
+    def heuristic(self, heuristic: Union[Heuristic, None]):
+        """Setter for the heuristic estimating the cost to the goal."""
+        self.__heuristic = heuristic
+
+    def estimate(
+            self,
+            state: State,
+            goal_state: Union[State, None] = None
+    ) -> float:
+        """Estimates the cost to get from the given state to the goal one
+        (by default, to the goal state of the algorithm)."""
+        goal_state = goal_state if goal_state is not None else self.__goal
+
+        if self.__heuristic is None:
+            return state.distance_from(goal_state)
+        return self.__heuristic.estimate(state, goal_state)
+
+    def estimate_many(
+            self,
+            states: Sequence[State],
+            goal_state: Union[State, None] = None
+    ) -> Sequence[float]:
+        """Estimates the costs of all the given states at once (by default,
+        to the goal state of the algorithm). The layered algorithms use it
+        to evaluate the whole layer in bulk."""
+        goal_state = goal_state if goal_state is not None else self.__goal
+
+        if self.__heuristic is None:
+            return goal_state.distance_from_many(states, goal_state)
+        return self.__heuristic.estimate_many(states, goal_state)
+
     @abstractmethod
     def next_state(self) -> State:
         """Provides next state to be searched."""
@@ -71,9 +206,10 @@ class Algorithm(ABC):
         When finished, it returns the state equivalent to the goal one with
         assigned tree-path from the root with all the applied operators.
         """
+        self.reset()
         self.add_to_fringe(initial_state)
 
-        while len(self.fringe) > 0:
+        while self.fringe_size > 0:
             current = self.next_state()
 
             # When the current state is the desired one
@@ -84,19 +220,27 @@ class Algorithm(ABC):
             if self.is_in_closed(current):
                 continue
 
+            n_generated = 0
+
             # Try all the operators
             for operator in operators:
 
+                # Skip stepping back to the parent
+                if operator.reverts(current):
+                    continue
+
                 # If can this operator be applied on a current state
                 if operator.can_be_applied(current):
                     # Schedule further searching of the descendant
                     self.add_to_fringe(operator.apply(current))
+                    n_generated += 1
 
             # Close after searching
             self.add_to_closed(current)
+            self.note_expansion(n_generated)
 
         # There's no state to be searched in and still no solution found
-        raise NoSolutionFound(state=self.closed[-1])
+        raise NoSolutionFound(state=self.__closed.last)
 
     def __repr__(self):
         return self.name
@@ -0,0 +1,106 @@
+from heapq import nsmallest
+from typing import Union
+
+from src.fw import State, Operator
+from src.fw.algorithms.base import Algorithm, NoSolutionFound
+from src.fw.algorithms.closed_set import ClosedSet
+
+
+class BeamSearch(Algorithm):
+    """Search algorithm going "by layers" (same as the Breadth-First Search),
+    but keeping only a limited number of the most promising states of each
+    layer (the beam) - the ones estimated closest to the goal. The rest of
+    the layer is dropped, so the work done for each layer is bounded by the
+    width of the beam.
+
+    All the states of a new layer are estimated at once, so the vectorized
+    distances of the problem (see `State.distance_from_many`) are used in
+    bulk.
+
+    Since the states are dropped, the search is not complete (the only path
+    to the goal might lead through a dropped state) and the solution found
+    is not guaranteed to be the shortest one.
+    """
+
+    def __init__(
+            self,
+            width: int = 100,
+            closed_set: Union[ClosedSet, None] = None
+    ):
+        super().__init__("BEAM", closed_set)
+
+        if width < 1:
+            raise ValueError(f"Width of the beam has to be positive: {width}")
+
+        self.__width = width
+
+    @property
+    def width(self) -> int:
+        """Maximum number of the states kept in a layer."""
+        return self.__width
+
+    def next_state(self):
+        """Not used in this algorithm."""
+
+    def solve(
+            self,
+            initial_state: State,
+            goal_state: State,
+            operators: tuple[Operator]
+    ) -> State:
+        """Searches the layers of the best states until the goal is found.
+        """
+        self.reset()
+
+        current = [initial_state]
+        self.add_to_closed(initial_state)
+
+        while current:
+            for state in current:
+                if state.is_terminal_state(goal_state):
+                    return state
+
+            following: list[State] = []
+            keys = set()
+
+            for state in current:
+                n_generated = 0
+
+                for operator in operators:
+                    if operator.reverts(state):
+                        continue
+
+                    if not operator.can_be_applied(state):
+                        continue
+
+                    n_generated += 1
+                    child = operator.apply(state)
+                    child_key = child.canonical_key()
+
+                    if child_key in keys or self.is_in_closed(child):
+                        continue
+
+                    keys.add(child_key)
+                    following.append(child)
+
+                self.note_expansion(n_generated)
+
+            if len(following) > self.__width:
+                # The whole layer is estimated at once
+                estimates = self.estimate_many(following, goal_state)
+                best = nsmallest(
+                    self.__width,
+                    range(len(following)),
+                    key=estimates.__getitem__
+                )
+                following = [following[index] for index in sorted(best)]
+
+            for state in following:
+                self.add_to_closed(state)
+
+            current = following
+
+        raise NoSolutionFound(
+            state=initial_state,
+            message="All the states of the beam were searched"
+        )
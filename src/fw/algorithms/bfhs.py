@@ -0,0 +1,301 @@
+from typing import Callable, Hashable, Union
+
+from src.fw import State, Operator
+from src.fw.algorithms.base import Algorithm, NoSolutionFound
+from src.fw.algorithms.closed_set import RankedClosedSet
+from src.fw.ranking import ParentTable
+
+
+class BreadthFirstHeuristicSearch(Algorithm):
+    """Memory-efficient search algorithm keeping only the frontier layers
+    instead of the whole list of closed states.
+
+    It searches the graph "by layers" (same as the Breadth-First Search),
+    but it is meant to be used on reversible problems (like moving in a maze
+    or sliding the puzzle fields). Every neighbour of a state in such a
+    problem lies either in the previous, the current or the next layer,
+    so the duplicates can be detected using these three layers only.
+    All the states of the older layers are simply forgotten.
+
+    Since the states are forgotten, the path cannot be back-tracked by the
+    parents. Instead, each state remembers its ancestor at the middle layer
+    (relay) and the solution is reconstructed by divide-and-conquer - the
+    search is recursively repeated for both halves of the path.
+
+    When the `upper_bound` of the solution length is given, the states with
+    `g + h` exceeding it are pruned. In this case the distance of the states
+    has to be a lower-bound estimate (admissible heuristic). The states of
+    each new layer are estimated all at once, so the vectorized distances
+    of the problem (see `State.distance_from_many`) are used in bulk.
+
+    When the ranking of the states is declared, the layers of the states
+    are complemented by array-indexed tables of the visited states and their
+    parents, so the path is simply back-tracked with no repeated search.
+
+    The duplicates are recognized by the canonical keys of the states. Since
+    the equivalent states might not be interchangeable on the reconstructed
+    path, the reconstruction compares the states themselves, so they have to
+    be hashable.
+    """
+
+    def __init__(self, upper_bound: Union[float, None] = None):
+        super().__init__("BFHS")
+        self.__upper_bound = upper_bound
+        self.__operators: tuple[Operator] = ()
+
+    @property
+    def upper_bound(self) -> Union[float, None]:
+        """Upper bound of the solution length used for pruning."""
+        return self.__upper_bound
+
+    def next_state(self):
+        """Not used in this algorithm."""
+
+    def solve(
+            self,
+            initial_state: State,
+            goal_state: State,
+            operators: tuple[Operator]
+    ) -> State:
+        """Finds the terminal state layer by layer and then reconstructs the
+        path to it by divide-and-conquer.
+        """
+        self.reset()
+        self.__operators = tuple(operators)
+
+        if self.ranking:
+            return self._ranked_search(initial_state, goal_state)
+
+        found = self._layered_search(
+            initial_state,
+            lambda state: state.is_terminal_state(goal_state),
+            key=lambda state: state.canonical_key()
+        )
+
+        if not found:
+            raise NoSolutionFound(
+                state=initial_state,
+                message="All the layers were searched"
+            )
+
+        depth, terminal, _ = found
+        applied = self._reconstruct(initial_state, terminal, depth, 0)
+
+        # Rebuild the whole path from the initial state
+        current = initial_state
+        for operator in applied:
+            current = operator.apply(current)
+
+        return current
+
+    def _ranked_search(self, initial_state: State, goal_state: State) -> State:
+        """Searches the graph by layers while recording the visited states
+        and their parents into the tables indexed by the ranks."""
+        visited = RankedClosedSet(self.ranking)
+        parents = ParentTable(self.ranking.size)
+
+        initial_rank = self.ranking.rank(initial_state)
+        visited.add_rank(initial_rank)
+
+        current = [(initial_state, initial_rank)]
+        depth = 0
+
+        while current:
+            for state, rank in current:
+                if state.is_terminal_state(goal_state):
+                    return self._rebuild(initial_state, parents, rank)
+
+            children: list[tuple[State, int, int]] = []
+
+            for state, rank in current:
+                n_generated = 0
+
+                for index, operator in enumerate(self.__operators):
+                    if operator.reverts(state):
+                        continue
+
+                    if not operator.can_be_applied(state):
+                        continue
+
+                    n_generated += 1
+                    child = operator.apply(state).detach()
+                    children.append((child, rank, index))
+
+                self.note_expansion(n_generated)
+
+            within = self._within_bound(
+                [child for child, _, _ in children], depth + 1)
+            following = []
+
+            for (child, rank, index), keep in zip(children, within):
+                if not keep:
+                    continue
+
+                child_rank = self.ranking.rank(child)
+
+                if visited.add_rank(child_rank):
+                    parents.set(child_rank, rank, index)
+                    following.append((child, child_rank))
+
+            current = following
+            depth += 1
+
+        raise NoSolutionFound(
+            state=initial_state,
+            message="All the layers were searched"
+        )
+
+    def _rebuild(
+            self,
+            initial_state: State,
+            parents: ParentTable,
+            rank: int
+    ) -> State:
+        """Applies the operators recorded in the table of parents on the way
+        to the state of the given rank."""
+        current = initial_state
+
+        for index in parents.operator_indexes(rank):
+            current = self.__operators[index].apply(current)
+
+        return current
+
+    def _layered_search(
+            self,
+            start: State,
+            is_goal: Callable[[State], bool],
+            key: Callable[[State], Hashable] = lambda state: state,
+            max_depth: Union[int, None] = None,
+            relay_depth: Union[int, None] = None,
+            depth_offset: int = 0
+    ) -> Union[tuple[int, State, Union[State, None]], None]:
+        """Searches the graph by layers from the given start state until
+        the goal is found.
+
+        :param is_goal: Predicate recognizing the goal state.
+
+        :param key: Function deriving the key to recognize the duplicates.
+
+        :param max_depth: Maximum number of layers to be searched.
+
+        :param relay_depth: Depth of the layer each state should remember
+                            its ancestor from.
+
+        :param depth_offset: Depth of the start state in the original search
+                             (used for pruning by the upper bound).
+
+        :return: Tuple of depth of the found goal, the goal itself and its
+                 relay ancestor. When there's no goal found, None.
+        """
+        previous: dict[Hashable, tuple[State, Union[State, None]]] = {}
+        current = {key(start): (start, start if relay_depth == 0 else None)}
+        depth = 0
+
+        while current:
+            for state, relay in current.values():
+                if is_goal(state):
+                    return depth, state, relay
+
+            if max_depth is not None and depth >= max_depth:
+                break
+
+            following: dict[Hashable, tuple[State, Union[State, None]]] = {}
+
+            for state, relay in current.values():
+                n_generated = 0
+
+                for operator in self.__operators:
+                    if operator.reverts(state):
+                        continue
+
+                    if not operator.can_be_applied(state):
+                        continue
+
+                    n_generated += 1
+
+                    # Forget the parent - it's reachable through the relay
+                    child = operator.apply(state).detach()
+                    child_key = key(child)
+
+                    if child_key in following or child_key in current:
+                        continue
+
+                    if child_key in previous:
+                        continue
+
+                    child_relay = child if depth + 1 == relay_depth else relay
+                    following[child_key] = (child, child_relay)
+
+                self.note_expansion(n_generated)
+
+            # The whole layer is estimated at once
+            within = self._within_bound(
+                [child for child, _ in following.values()],
+                depth_offset + depth + 1
+            )
+            following = {
+                child_key: entry
+                for (child_key, entry), keep in zip(following.items(), within)
+                if keep
+            }
+
+            previous, current = current, following
+            depth += 1
+
+        return None
+
+    def _within_bound(self, states: list[State], g: int) -> list[bool]:
+        """Returns for each of the states of the same depth if it can lie on
+        a path shorter than the upper bound. All the states are estimated at
+        once (see `Algorithm.estimate_many`)."""
+        if self.upper_bound is None or not states:
+            return [True] * len(states)
+
+        return [
+            g + h <= self.upper_bound for h in self.estimate_many(states)
+        ]
+
+    def _reconstruct(
+            self,
+            start: State,
+            end: State,
+            depth: int,
+            depth_offset: int
+    ) -> list[Operator]:
+        """Finds the operators leading from the start state to the end one
+        with the known distance between them by recursively splitting the
+        path at the middle layer.
+        """
+        if depth == 0:
+            return []
+
+        if depth == 1:
+            for operator in self.__operators:
+                if operator.can_be_applied(start):
+                    if operator.apply(start) == end:
+                        return [operator]
+
+            raise NoSolutionFound(
+                state=start, message="Couldn't reconstruct the path")
+
+        middle = depth // 2
+
+        found = self._layered_search(
+            start,
+            lambda state: state == end,
+            max_depth=depth,
+            relay_depth=middle,
+            depth_offset=depth_offset
+        )
+
+        if not found:
+            raise NoSolutionFound(
+                state=start, message="Couldn't reconstruct the path")
+
+        relay = found[2]
+
+        return (
+            self._reconstruct(start, relay, middle, depth_offset) +
+            self._reconstruct(
+                relay, end, depth - middle, depth_offset + middle)
+        )
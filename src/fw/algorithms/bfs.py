@@ -1,5 +1,6 @@
-from src.fw import State
+from src.fw import State, Union
 from src.fw.algorithms.base import Algorithm
+from src.fw.algorithms.closed_set import ClosedSet
 
 
 class BreadthFirstSearch(Algorithm):
@@ -7,8 +8,8 @@ class BreadthFirstSearch(Algorithm):
     (state space) "by layers".
     """
 
-    def __init__(self):
-        super().__init__("BFS")
+    def __init__(self, closed_set: Union[ClosedSet, None] = None):
+        super().__init__("BFS", closed_set)
 
     def next_state(self) -> State:
         """Return the first item (FIFO - queue)"""
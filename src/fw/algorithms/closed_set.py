@@ -0,0 +1,278 @@
+"""This module contains the definitions of the closed sets - collections
+remembering the states the algorithm already searched.
+
+Most importantly, it declares the following classes:
+
+    - ClosedSet:
+        Abstract protocol of all the closed sets.
+
+    - ListClosedSet:
+        Exact closed set comparing the states one by one. It works with any
+        state, but it's slow for a larger number of states.
+
+    - HashClosedSet:
+        Exact closed set based on hashing. States have to be hashable.
+
+    - BloomClosedSet:
+        Probabilistic closed set with a fixed memory footprint. It can
+        mistakenly report a state as closed (omit it from the search).
+
+    - RankedClosedSet:
+        Exact closed set backed by a bit array indexed by the ranks of the
+        states.
+"""
+
+from abc import ABC, abstractmethod
+from math import exp
+from typing import Hashable, Iterator, Union
+
+from src.fw import State
+from src.fw.ranking import Ranking
+
+
+class ClosedSet(ABC):
+    """Abstract class declaring the protocol of a collection of the already
+    searched states.
+    """
+
+    def __init__(self):
+        self.__last: Union[State, None] = None
+
+    @property
+    def last(self) -> Union[State, None]:
+        """The most recently closed state."""
+        return self.__last
+
+    def add(self, state: State):
+        """Marks the given state as closed."""
+        self.__last = state
+        self._add(state)
+
+    def clear(self):
+        """Forgets all the closed states."""
+        self.__last = None
+        self._clear()
+
+    @property
+    def omission_probability(self) -> float:
+        """Probability a new state is mistakenly reported as already closed.
+        For exact closed sets, it's always zero.
+        """
+        return 0.0
+
+    @abstractmethod
+    def _add(self, state: State):
+        """Stores the given state."""
+
+    @abstractmethod
+    def _clear(self):
+        """Removes all the stored states."""
+
+    @abstractmethod
+    def __contains__(self, state: State) -> bool:
+        """Returns if the given state was already closed."""
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """Number of the closed states."""
+
+    @abstractmethod
+    def __iter__(self) -> Iterator[State]:
+        """Iterates over the closed states."""
+
+
+class ListClosedSet(ClosedSet):
+    """Closed set storing the states in a list. The membership is checked by
+    comparing the canonical key of the given state with the keys of all the
+    closed ones.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.__states: list[State] = []
+        self.__keys: list[Hashable] = []
+
+    def _add(self, state: State):
+        self.__states.append(state)
+        self.__keys.append(state.canonical_key())
+
+    def _clear(self):
+        self.__states.clear()
+        self.__keys.clear()
+
+    def __contains__(self, state: State) -> bool:
+        return state.canonical_key() in self.__keys
+
+    def __len__(self) -> int:
+        return len(self.__states)
+
+    def __iter__(self) -> Iterator[State]:
+        return iter(self.__states)
+
+
+class HashClosedSet(ClosedSet):
+    """Closed set storing the states in a hash table by their canonical keys
+    with a constant time membership check.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.__states: dict[Hashable, State] = {}
+
+    def _add(self, state: State):
+        self.__states.setdefault(state.canonical_key(), state)
+
+    def _clear(self):
+        self.__states.clear()
+
+    def __contains__(self, state: State) -> bool:
+        return state.canonical_key() in self.__states
+
+    def __len__(self) -> int:
+        return len(self.__states)
+
+    def __iter__(self) -> Iterator[State]:
+        return iter(self.__states.values())
+
+
+class BloomClosedSet(ClosedSet):
+    """Probabilistic closed set (Bloom filter) backed by a bit array of
+    a fixed size.
+
+    Each state is mapped onto `n_hashes` bits of the array. The state is
+    considered closed when all of its bits are set. This might happen even
+    for a state that was never closed (its bits were set by other states),
+    so such state is omitted from the search. On the other hand, the memory
+    footprint doesn't grow no matter how many states are closed.
+
+    With `n_hashes=1`, it works as a bitstate hash table.
+
+    The states are hashed by their canonical keys.
+    """
+
+    def __init__(self, size_bytes: int = 1 << 20, n_hashes: int = 3):
+        super().__init__()
+
+        if size_bytes < 1:
+            raise ValueError(f"Size has to be positive: {size_bytes = }")
+        elif n_hashes < 1:
+            raise ValueError(f"Needs at least one hash: {n_hashes = }")
+
+        self.__bits = bytearray(size_bytes)
+        self.__n_bits = size_bytes * 8
+        self.__n_hashes = n_hashes
+        self.__n_added = 0
+
+    @property
+    def size_bytes(self) -> int:
+        """Size of the bit array in bytes."""
+        return len(self.__bits)
+
+    @property
+    def n_hashes(self) -> int:
+        """Number of bits each state is mapped onto."""
+        return self.__n_hashes
+
+    @property
+    def omission_probability(self) -> float:
+        """Estimated probability a new state is reported as closed, based on
+        the number of the closed states: `(1 - e^(-k * n / m)) ^ k`.
+        """
+        k, n, m = self.n_hashes, self.__n_added, self.__n_bits
+        return (1 - exp(-k * n / m)) ** k
+
+    def _indexes(self, state: State) -> Iterator[int]:
+        """Derives the bit indexes of the given state by double hashing."""
+        h1 = _mix(hash(state.canonical_key()) & _MASK)
+        h2 = _mix(h1) | 1
+
+        for i in range(self.n_hashes):
+            yield (h1 + i * h2) % self.__n_bits
+
+    def _add(self, state: State):
+        for index in self._indexes(state):
+            self.__bits[index >> 3] |= 1 << (index & 7)
+        self.__n_added += 1
+
+    def _clear(self):
+        self.__bits = bytearray(len(self.__bits))
+        self.__n_added = 0
+
+    def __contains__(self, state: State) -> bool:
+        for index in self._indexes(state):
+            if not self.__bits[index >> 3] & (1 << (index & 7)):
+                return False
+        return True
+
+    def __len__(self) -> int:
+        """Number of the closed states (including the duplicates)."""
+        return self.__n_added
+
+    def __iter__(self) -> Iterator[State]:
+        raise TypeError("Bloom closed set doesn't remember the states")
+
+
+class RankedClosedSet(ClosedSet):
+    """Exact closed set backed by a bit array with a bit for each rank of
+    the given ranking. It takes a fixed amount of memory (one bit per
+    possible state) and checks the membership in a constant time.
+    """
+
+    def __init__(self, ranking: Ranking):
+        super().__init__()
+        self.__ranking = ranking
+        self.__bits = bytearray((ranking.size + 7) // 8)
+        self.__n_added = 0
+
+    @property
+    def ranking(self) -> Ranking:
+        """Ranking the bit array is indexed by."""
+        return self.__ranking
+
+    def add_rank(self, rank: int) -> bool:
+        """Marks the state of the given rank as closed. Returns if it wasn't
+        closed before."""
+        mask = 1 << (rank & 7)
+
+        if self.__bits[rank >> 3] & mask:
+            return False
+
+        self.__bits[rank >> 3] |= mask
+        self.__n_added += 1
+        return True
+
+    def contains_rank(self, rank: int) -> bool:
+        """Returns if the state of the given rank was already closed."""
+        return bool(self.__bits[rank >> 3] & (1 << (rank & 7)))
+
+    def _add(self, state: State):
+        self.add_rank(self.ranking.rank(state))
+
+    def _clear(self):
+        self.__bits = bytearray(len(self.__bits))
+        self.__n_added = 0
+
+    def __contains__(self, state: State) -> bool:
+        return self.contains_rank(self.ranking.rank(state))
+
+    def __len__(self) -> int:
+        return self.__n_added
+
+    def __iter__(self) -> Iterator[State]:
+        """Iterates over the closed states (recreated from their ranks)."""
+        for byte_index, byte in enumerate(self.__bits):
+            for bit in range(8):
+                if byte & (1 << bit):
+                    yield self.ranking.unrank(byte_index * 8 + bit)
+
+
+# 64-bit mask of the hash values
+_MASK = (1 << 64) - 1
+
+
+def _mix(value: int) -> int:
+    """Scrambles the bits of the given 64-bit integer (SplitMix64 finalizer),
+    so even the similar hashes are spread across the whole bit array."""
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & _MASK
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & _MASK
+    return value ^ (value >> 31)
@@ -1,5 +1,6 @@
-from src.fw import State
+from src.fw import State, Union
 from src.fw.algorithms.base import Algorithm
+from src.fw.algorithms.closed_set import ClosedSet
 
 
 class DepthFirstSearch(Algorithm):
@@ -7,8 +8,8 @@ class DepthFirstSearch(Algorithm):
     (state space) "by branches".
     """
 
-    def __init__(self):
-        super().__init__("DFS")
+    def __init__(self, closed_set: Union[ClosedSet, None] = None):
+        super().__init__("DFS", closed_set)
 
     def next_state(self) -> State:
         """Return the last item (LIFO - stack)"""
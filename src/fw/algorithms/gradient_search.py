@@ -1,5 +1,6 @@
-from src.fw import State, Operator
+from src.fw import State, Operator, Union
 from src.fw.algorithms.base import Algorithm, NoSolutionFound
+from src.fw.algorithms.closed_set import ClosedSet
 
 
 class GradientSearch(Algorithm):
@@ -14,8 +15,8 @@ class GradientSearch(Algorithm):
     function value) it ends with an error - stuck in a local extrema.
     """
 
-    def __init__(self):
-        super().__init__("GRADIENT")
+    def __init__(self, closed_set: Union[ClosedSet, None] = None):
+        super().__init__("GRADIENT", closed_set)
 
     def next_state(self):
         """Not used in this algorithm."""
@@ -27,23 +28,28 @@ class GradientSearch(Algorithm):
             operators: tuple[Operator]
     ) -> State:
         """"""
+        self.reset()
         current_state = initial_state
-        closed = []
 
         while current_state != goal_state:
             children: list[State] = []
 
             # Get the child states
             for operator in operators:
+                if operator.reverts(current_state):
+                    continue
+
                 if operator.can_be_applied(current_state):
                     child = operator.apply(current_state)
-                    if child not in closed:
+                    if not self.is_in_closed(child):
                         children.append(child)
 
+            self.note_expansion(len(children))
+
             def evaluate(state: State) -> float:
-                """Tries to evaluate the distance between the given state
+                """Tries to estimate the cost between the given state
                 and a goal one for easier readability of the code."""
-                return state.distance_from(goal_state)
+                return self.estimate(state, goal_state)
 
             if not children:
                 raise NoSolutionFound(
@@ -68,7 +74,7 @@ class GradientSearch(Algorithm):
                 )
 
             # Close the state
-            closed.append(current_state)
+            self.add_to_closed(current_state)
 
             # When got better, set the best one as next state
             current_state = best
@@ -1,5 +1,6 @@
-from src.fw import State
+from src.fw import State, Union
 from src.fw.algorithms.base import Algorithm
+from src.fw.algorithms.closed_set import ClosedSet
 
 
 class GreedySearch(Algorithm):
@@ -7,8 +8,8 @@ class GreedySearch(Algorithm):
     a nearest-neighbour decisioning.
     """
 
-    def __init__(self):
-        super().__init__("GREEDY")
+    def __init__(self, closed_set: Union[ClosedSet, None] = None):
+        super().__init__("GREEDY", closed_set)
 
     def next_state(self) -> State:
         """Return the state closest to the goal state.
@@ -20,9 +21,10 @@ class GreedySearch(Algorithm):
 
         # Helper function
         def comparison(state):
-            """Return a distance between the given state and the goal.
+            """Return an estimated cost to get from the given state to
+            the goal.
             """
-            return state.distance_from(self.goal_state)
+            return self.estimate(state)
 
         # Find the state in fringe that is closest to the goal
         closest = min(self.fringe, key=comparison)
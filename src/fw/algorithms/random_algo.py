@@ -8,7 +8,8 @@ from src.fw.algorithms.base import NoSolutionFound
 class FullRandom(Algorithm):
     """This algorithm is implemented just for the notion of non-systematic
     algorithm and it's drawbacks. It simply tries to go in a random direction
-    with no idea if it's returning back or not.
+    with no idea where it has been before. It only avoids returning straight
+    back, unless it's the only way to go.
 
     To prevent it's possible long-running, it's limited in number of states
     it goes through. By default, this limit is set to 10k.
@@ -36,6 +37,7 @@ class FullRandom(Algorithm):
         """Naive implementation of a fully random algorithm to search the
         state space.
         """
+        self.reset()
         counter = 0
         current = initial_state
 
@@ -43,14 +45,27 @@ class FullRandom(Algorithm):
         while counter < self.limit:
 
             # When the current state is the desired one
-            if current == goal_state:
+            if current.is_terminal_state(goal_state):
                 return current
 
             # Select random operator
             available_ops = [o for o in operators if o.can_be_applied(current)]
+
+            # Avoid stepping back, when there's another way
+            forward_ops = [o for o in available_ops if not o.reverts(current)]
+            available_ops = forward_ops if forward_ops else available_ops
+
+            if not available_ops:
+                raise NoSolutionFound(
+                    state=current,
+                    message="There's no operator to be applied"
+                )
+
             randomly_selected = choice(available_ops)
+            self.note_expansion(1)
 
             current = randomly_selected.apply(current)
+            counter += 1
 
         # There's no state to be searched in and still no solution found
         raise NoSolutionFound(
@@ -0,0 +1,64 @@
+"""This module contains the definition of heuristics - estimates of the cost
+to get from a state to the goal one, used by the informed algorithms.
+
+By default, the algorithms estimate the cost by the distance of the states
+(`State.distance_from`). A heuristic replaces this estimate with another
+one - typically a more precise one, e.g. precomputed for the given problem
+instance - without changing the states themselves.
+
+Most importantly, it declares the following classes:
+
+    - Heuristic:
+        Abstract protocol of all the heuristics.
+
+    - DistanceHeuristic:
+        Heuristic using the distance of the states (the default estimate).
+"""
+
+from abc import ABC, abstractmethod
+from typing import Sequence
+
+from src.fw.state import State
+
+
+class Heuristic(ABC):
+    """Abstract class declaring the protocol of an estimate of the cost to
+    get from a state to the goal one.
+    """
+
+    @abstractmethod
+    def estimate(self, state: State, goal_state: State) -> float:
+        """Estimates the cost to get from the given state to the goal one.
+
+        :param state: State the estimate is calculated for.
+
+        :param goal_state: State the algorithm is trying to reach.
+
+        :return: Float estimate of the cost.
+        """
+
+    def estimate_many(
+            self,
+            states: Sequence[State],
+            goal_state: State
+    ) -> Sequence[float]:
+        """Estimates the costs of all the given states at once (e.g. a whole
+        layer of the states). By default, each state is estimated alone.
+
+        :return: Estimates in the order of the states.
+        """
+        return [self.estimate(state, goal_state) for state in states]
+
+
+class DistanceHeuristic(Heuristic):
+    """Heuristic estimating the cost by the distance of the states."""
+
+    def estimate(self, state: State, goal_state: State) -> float:
+        return state.distance_from(goal_state)
+
+    def estimate_many(
+            self,
+            states: Sequence[State],
+            goal_state: State
+    ) -> Sequence[float]:
+        return goal_state.distance_from_many(states, goal_state)
@@ -0,0 +1,181 @@
+"""This module contains the means for the perfect hashing of the states -
+mapping each state of the State Space onto a unique integer (rank) from
+a dense range `[0, size)` and back.
+
+Ranks enable using plain arrays instead of collections of states - e.g. for
+bit-array closed sets, tables of parents or precomputed distance tables.
+
+Most importantly, it declares the following:
+
+    - Ranking:
+        Abstract protocol of a ranking of states of a particular problem.
+
+    - ParentTable:
+        Array-indexed table of parents of the states by their ranks.
+
+    - Functions for ranking permutations (Lehmer code, Myrvold-Ruskey)
+      and base-k encodings.
+"""
+
+from abc import ABC, abstractmethod
+from array import array
+from math import factorial
+from typing import Sequence, Union
+
+from src.fw.state import State
+
+
+class Ranking(ABC):
+    """Abstract class declaring the protocol of a perfect hash of the states
+    of a particular problem.
+    """
+
+    @property
+    @abstractmethod
+    def size(self) -> int:
+        """Number of all the ranks (all the ranks are lower than it)."""
+
+    @abstractmethod
+    def rank(self, state: State) -> int:
+        """Maps the given state onto its unique rank."""
+
+    @abstractmethod
+    def unrank(self, rank: int) -> State:
+        """Creates the state of the given rank. The state has no parent."""
+
+
+class ParentTable:
+    """Table of parents indexed by the ranks of the states. For each state,
+    it remembers the rank of its parent and the index of the operator
+    applied to the parent.
+    """
+
+    # Marker of the state with no parent recorded
+    NO_PARENT = -1
+
+    def __init__(self, size: int):
+        self.__parents = array("q", [ParentTable.NO_PARENT]) * size
+        self.__operators = bytearray(size)
+
+    def set(self, rank: int, parent_rank: int, operator_index: int):
+        """Records the parent of the state with the given rank."""
+        self.__parents[rank] = parent_rank
+        self.__operators[rank] = operator_index
+
+    def parent(self, rank: int) -> int:
+        """Rank of the parent of the state with the given rank."""
+        return self.__parents[rank]
+
+    def operator_index(self, rank: int) -> int:
+        """Index of the operator applied to the parent of the state."""
+        return self.__operators[rank]
+
+    def operator_indexes(self, rank: int) -> tuple[int]:
+        """Indexes of all the operators applied on the way from the root
+        to the state of the given rank (in this order)."""
+        indexes = []
+
+        while self.__parents[rank] != ParentTable.NO_PARENT:
+            indexes.append(self.__operators[rank])
+            rank = self.__parents[rank]
+
+        return tuple(reversed(indexes))
+
+
+def lehmer_rank(permutation: Sequence[int]) -> int:
+    """Ranks the given permutation of numbers `0..n-1` in the lexicographic
+    order using its Lehmer code.
+    """
+    n = len(permutation)
+    rank = 0
+    used = 0
+
+    for index, value in enumerate(permutation):
+        # Number of smaller values not used yet
+        smaller = value - (used & ((1 << value) - 1)).bit_count()
+        rank += smaller * factorial(n - 1 - index)
+        used |= 1 << value
+
+    return rank
+
+
+def lehmer_unrank(rank: int, n: int) -> tuple[int]:
+    """Creates the permutation of numbers `0..n-1` of the given
+    lexicographic rank."""
+    available = list(range(n))
+    permutation = []
+
+    for index in range(n - 1, -1, -1):
+        digit, rank = divmod(rank, factorial(index))
+        permutation.append(available.pop(digit))
+
+    return tuple(permutation)
+
+
+def myrvold_ruskey_rank(permutation: Sequence[int]) -> int:
+    """Ranks the given permutation of numbers `0..n-1` in linear time using
+    the Myrvold-Ruskey algorithm. The order of the ranks is not
+    lexicographic."""
+    permutation = list(permutation)
+    inverse = [0] * len(permutation)
+
+    for index, value in enumerate(permutation):
+        inverse[value] = index
+
+    rank = 0
+    multiplier = 1
+
+    for n in range(len(permutation), 1, -1):
+        s = permutation[n - 1]
+        t = inverse[n - 1]
+
+        permutation[n - 1], permutation[t] = permutation[t], permutation[n - 1]
+        inverse[s], inverse[n - 1] = inverse[n - 1], inverse[s]
+
+        rank += s * multiplier
+        multiplier *= n
+
+    return rank
+
+
+def myrvold_ruskey_unrank(rank: int, n: int) -> tuple[int]:
+    """Creates the permutation of numbers `0..n-1` of the given
+    Myrvold-Ruskey rank."""
+    permutation = list(range(n))
+
+    for size in range(n, 0, -1):
+        rank, index = divmod(rank, size)
+        permutation[size - 1], permutation[index] = (
+            permutation[index], permutation[size - 1])
+
+    return tuple(permutation)
+
+
+def base_k_rank(digits: Sequence[int], k: int) -> int:
+    """Ranks the given digits (from the least significant one) of the base
+    `k` number."""
+    rank = 0
+
+    for digit in reversed(digits):
+        rank = rank * k + digit
+
+    return rank
+
+
+def base_k_unrank(rank: int, k: int, n: int) -> tuple[int]:
+    """Creates `n` digits (from the least significant one) of the given rank
+    in base `k`."""
+    digits = []
+
+    for _ in range(n):
+        rank, digit = divmod(rank, k)
+        digits.append(digit)
+
+    return tuple(digits)
+
+
+def permutation_size(n: int, k: Union[int, None] = None) -> int:
+    """Number of the permutations of `k` out of `n` elements (all of them
+    when `k` is not given)."""
+    k = n if k is None else k
+    return factorial(n) // factorial(n - k)
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Union
+from typing import Hashable, Sequence, Union
 
 
 class State(ABC):
@@ -18,6 +18,13 @@ class State(ABC):
         self.__parent = parent
         self.__applied_operator = applied_operator
 
+        # Cost of the whole path from the origin
+        self.__path_cost = 0.0
+
+        if parent and applied_operator:
+            self.__path_cost = (
+                parent.path_cost + applied_operator.cost(parent))
+
     @property
     def parent(self) -> "State":
         """Direct parent of this state."""
@@ -28,6 +35,24 @@ class State(ABC):
         """Operator applied to the parent to produce this state."""
         return self.__applied_operator
 
+    @property
+    def path_cost(self) -> float:
+        """Sum of the costs of all the operators applied on the way from the
+        origin to this state."""
+        return self.__path_cost
+
+    def detach(self) -> "State":
+        """Cuts this state off its parent, so it becomes a root of a new
+        tree. The applied operator is kept.
+
+        This is useful for memory-bounded algorithms not willing to keep
+        the whole searched tree alive just because of the parents chain.
+
+        :return: This very same state (for chaining).
+        """
+        self.__parent = None
+        return self
+
     def all_parents(
             self,
             include_self: bool = False,
@@ -98,6 +123,27 @@ class State(ABC):
         """
         return self == goal_state
 
+    def can_reach(self, goal_state: "State") -> bool:
+        """Returns if the given goal state can be reached from this state at
+        all. It's meant as a cheap check of an invariant of the problem
+        (e.g. a parity), so the hopeless searches are rejected at once.
+
+        By default, the goal is considered reachable.
+        """
+        return True
+
+    def canonical_key(self) -> Hashable:
+        """Returns a hashable key the algorithms use to recognize the already
+        searched states.
+
+        Equivalent states (e.g. the symmetric ones) can share the same key,
+        so only one of them is searched. Such states have to be equally far
+        from the terminal states.
+
+        By default, the state itself is the key (so it has to be hashable).
+        """
+        return self
+
     @abstractmethod
     def distance_from(self, state: "State") -> float:
         """Abstract method calculating a distance between this state and
@@ -108,6 +154,27 @@ class State(ABC):
         :return: Float representing the distance from the given state.
         """
 
+    @classmethod
+    def distance_from_many(
+            cls,
+            states: Sequence["State"],
+            state: "State"
+    ) -> Sequence[float]:
+        """Calculates the distances of all the given states from the given
+        one at once - as `distance_from` of each of them.
+
+        By default, the states are measured one by one. The problems with
+        many states in a layer can override it with a vectorized version
+        (typically returning a NumPy array).
+
+        :param states: States the distances are calculated for.
+
+        :param state: State this function calculates the distances from.
+
+        :return: Distances in the order of the states.
+        """
+        return [s.distance_from(state) for s in states]
+
     def __eq__(self, other: "State") -> bool:
         return self.distance_from(other) == 0
 
@@ -125,6 +192,29 @@ class Operator(ABC):
         """Name of the operator for easier readability."""
         return self.__name
 
+    @property
+    def inverse(self) -> Union["Operator", None]:
+        """Operator reverting the effect of this one - applied on a state
+        produced by this operator, it leads back to the parent state.
+
+        Algorithms use it to skip the useless steps back. When there's no
+        such operator declared (by default), None.
+        """
+        return None
+
+    def reverts(self, state: State) -> bool:
+        """Returns if this operator is the inverse of the one the given
+        state was produced by, so applying it would only lead back to the
+        parent of the state.
+        """
+        applied = state.applied_operator
+
+        if applied is None:
+            return False
+
+        inverse = applied.inverse
+        return inverse is not None and inverse == self
+
     @abstractmethod
     def can_be_applied(self, state: State) -> bool:
         """Returns if this operator can be applied on a given state."""
@@ -134,5 +224,11 @@ class Operator(ABC):
         """Method used to create a new state by application of this operator.
         """
 
+    def cost(self, state: State) -> float:
+        """Cost of applying this operator on the given state. By default,
+        each operator costs the same (1).
+        """
+        return 1
+
     def __repr__(self):
         return self.name
@@ -1,9 +1,12 @@
 from typing import Iterable
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Union
 
 from src.fw import State, Operator
 from src.fw.algorithms import Algorithm, find
+from src.fw.algorithms.base import SearchStatistics, NoSolutionFound
+from src.fw.heuristic import Heuristic
+from src.fw.ranking import Ranking
 
 
 @dataclass
@@ -23,20 +26,52 @@ class StateSpace:
 
         - `algorithm`: `Union[Algorithm, str]`
             Algorithm to be used to search in a graph
+
+        - `ranking`: `Union[Ranking, None]`
+            Optional perfect hash of the states. When given, the algorithm
+            with no closed set of its own uses a bit array indexed by the
+            ranks as its closed set
+
+        - `heuristic`: `Union[Heuristic, None]`
+            Optional estimate of the cost to the goal used by the informed
+            algorithms instead of the distance of the states
     """
 
     initial_state: State                # Root of the State Space Tree
     goal_state: State                   # Desired leaf of the State Space Tree
     operators: Iterable[Operator]       # Available operators to be used
     algorithm: Union[Algorithm, str]    # Algorithm to be used to search
+    ranking: Union[Ranking, None] = None  # Perfect hash of the states
+    heuristic: Union[Heuristic, None] = None  # Estimate of the cost to goal
+
+    # Algorithm instance used by the last solving
+    _used_algorithm: Union[Algorithm, None] = field(
+        default=None, init=False, repr=False)
+
+    @property
+    def statistics(self) -> Union[SearchStatistics, None]:
+        """Statistics of the last solving. When not solved yet, None."""
+        if self._used_algorithm:
+            return self._used_algorithm.statistics
 
     def solve(self) -> State:
         """Simple method scheduling the steps to find a solution.
         The received solution is based on a state equivalent with the goal
         with addition of the whole path from the initial state.
+
+        When the initial state cannot reach the goal at all (see
+        `State.can_reach`), it raises an error with no search.
         """
+        if not self.initial_state.can_reach(self.goal_state):
+            raise NoSolutionFound(
+                state=self.initial_state,
+                message="Goal cannot be reached from the initial state")
+
         algo = find(self.algorithm)
         algo.goal_state = self.goal_state
+        algo.ranking = self.ranking
+        algo.heuristic = self.heuristic
+        self._used_algorithm = algo
 
         return algo.solve(
             self.initial_state,
@@ -78,6 +78,8 @@ def countdown(
         except NoSolutionFound as err:
             print(err.message)
 
+        print(f"Statistics: {ss.statistics}")
+
 
 
 
@@ -18,6 +18,9 @@ class CountdownState(State):
         self.__goal_number = goal_number
         self.__stringified_operator = stringified_operator
 
+        # Order of the numbers doesn't matter - sorted just once
+        self.__sorted_numbers = tuple(sorted(available_numbers.numbers))
+
     @property
     def available_numbers(self) -> tuple[int]:
         return self.__available_numbers.numbers
@@ -39,10 +42,16 @@ class CountdownState(State):
         of the all available numbers."""
         return min([abs(n - self.goal_number) for n in self.available_numbers])
 
+    def canonical_key(self) -> tuple[int]:
+        """The states are equivalent when they have the same multiset of
+        the available numbers, no matter their order."""
+        return self.__sorted_numbers
+
     def __eq__(self, other: "CountdownState") -> bool:
-        return (
-            sorted(self.available_numbers) == sorted(other.available_numbers)
-        )
+        return self.canonical_key() == other.canonical_key()
+
+    def __hash__(self) -> int:
+        return hash(self.__sorted_numbers)
 
     def is_terminal_state(self, goal_state: "State") -> bool:
         """This method is overridden to enhance the ability to check the
@@ -3,7 +3,8 @@ known variations."""
 
 from .puzzle_starter import start_8_puzzle
 from .puzzle_generator import GeneratorVariant
-from .puzzle_state_space import GridState, GridOperator
+from .puzzle_state_space import GridState, GridOperator, GridRanking
 from .puzzle_definition import (
-    Move, Field, Grid, InconsistentGrid, IncomparableGrids, CannotSwitch
+    Move, Field, Grid, ManhattanTable, InconsistentGrid, IncomparableGrids,
+    CannotSwitch
 )
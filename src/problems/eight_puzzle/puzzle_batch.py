@@ -0,0 +1,87 @@
+"""This module contains the batched evaluation of the puzzle boards - the
+distances of a whole layer of the states are calculated at once instead of
+one state at a time.
+
+The packed boards of all the grids are unpacked into a single matrix (a row
+of the tiles for each grid) using NumPy. The Manhattan distances of all the
+grids are then looked up in the table of the goal (the distance of each
+tile from each field) by the whole matrix and summed up by the rows.
+
+Most importantly, it declares the following functions:
+
+    - tile_matrix:
+        Tiles of all the given grids as a matrix.
+
+    - manhattan_many:
+        Manhattan distances of all the given grids from the goal one.
+
+This module requires NumPy.
+"""
+
+from functools import lru_cache
+from typing import Sequence
+
+import numpy as np
+
+from .puzzle_definition import (
+    Grid, ManhattanTable, IncomparableGrids, _TILES, _TILE_BITS, _TILE_MASK
+)
+
+
+def tile_matrix(grids: Sequence[Grid], base_size: int) -> np.ndarray:
+    """Unpacks the boards of the given grids of the same size into a matrix
+    of their tiles (a row for each grid, a column for each field)."""
+    n = base_size ** 2
+    boards = [grid.board for grid in grids]
+
+    if not boards:
+        return np.zeros((0, n), dtype=np.uint8)
+
+    if isinstance(boards[0], bytes):
+        matrix = np.frombuffer(b"".join(boards), dtype=np.uint8)
+        return matrix.reshape(len(boards), n)
+
+    packed = np.array(boards, dtype=np.uint64)
+    shifts = np.arange(n, dtype=np.uint64) * np.uint64(_TILE_BITS)
+    tiles = (packed[:, None] >> shifts) & np.uint64(_TILE_MASK)
+
+    return tiles.astype(np.uint8)
+
+
+def manhattan_many(grids: Sequence[Grid], goal: Grid) -> np.ndarray:
+    """Manhattan distances of all the given grids (including the empty
+    fields) from the goal one - the same as `Grid.manhattan_distance` of
+    each of them."""
+    base = goal.base_size
+
+    for grid in grids:
+        if grid.base_size != base:
+            raise IncomparableGrids(
+                "Grids have different base size", grid, goal)
+
+    tiles = tile_matrix(grids, base)
+
+    # All the grids have to have the tiles of the goal
+    comparable = (np.sort(tiles, axis=1) == sorted(goal.tiles)).all(axis=1)
+
+    if not comparable.all():
+        grid = grids[int(np.argmin(comparable))]
+        raise IncomparableGrids(
+            "Grids have different values", grid, goal)
+
+    distances = _lookup(ManhattanTable.of(goal))
+    return distances[tiles, np.arange(base ** 2)].sum(axis=1)
+
+
+@lru_cache
+def _lookup(table: ManhattanTable) -> np.ndarray:
+    """Distances of the table as a matrix (a row for each tile, a column
+    for each field; zeros for the tiles missing at the goal)."""
+    n = table.goal.base_size ** 2
+    distances = np.zeros((len(_TILES), n), dtype=np.int64)
+
+    for tile, row in enumerate(table.distances):
+        if row:
+            distances[tile] = row
+
+    return distances
@@ -1,4 +1,5 @@
 from enum import Enum
+from functools import lru_cache
 from typing import Union, Iterable
 
 
@@ -163,6 +164,22 @@ class Move(Enum):
         return x + self.x_diff, y + self.y_diff
 
 
+# Indexes of the field values - the tiles of the packed boards
+_TILES: dict[str, int] = {
+    value: tile for tile, value in enumerate(Field.available_values())
+}
+
+# Tile of the empty field
+_EMPTY_TILE = _TILES[Field.empty_value()]
+
+# Bits of a single tile of the boards packed into an integer
+_TILE_BITS = 4
+_TILE_MASK = (1 << _TILE_BITS) - 1
+
+# Most tiles packed into an integer (boards up to 4x4)
+_MAX_PACKED_TILES = 16
+
+
 class Grid:
     """Instances of this class represent the current board.
 
@@ -174,21 +191,82 @@ class Grid:
 
     It also has to have an empty field - you wouldn't be able to perform
     any move otherwise. If it's not provided, it raises an error.
+
+    The board is kept packed - each field is represented by its tile (the
+    index of its value in `Field.available_values()`), ordered by the rows
+    from the lowest coordinates. Boards up to 4x4 are packed into a single
+    integer (4 bits per tile), the larger ones into bytes (a byte per tile).
+    Position of the empty field is cached, so a move is just a swap of two
+    tiles. Grids are therefore immutable - the `Field` instances are only
+    views of the board created on demand (changing them doesn't change the
+    grid).
     """
 
     def __init__(self, base_size: int, fields: Iterable[Field]):
-        self.__base_size = base_size
-        self.__fields = list(fields)
+        fields = list(fields)
 
-        if len(self.fields) != self.base_size ** 2:
+        if len(fields) != base_size ** 2:
             raise InconsistentGrid("Given grid is not of the given base")
 
-        if not self.empty_field:
+        x_min = min([field.x for field in fields], default=0)
+        y_min = min([field.y for field in fields], default=0)
+        tiles: list[Union[int, None]] = [None] * len(fields)
+
+        for field in fields:
+            x, y = field.x - x_min, field.y - y_min
+
+            if x >= base_size or y >= base_size:
+                raise InconsistentGrid(
+                    "Fields don't form a square of the given base")
+
+            if tiles[y * base_size + x] is not None:
+                raise InconsistentGrid(
+                    f"Cannot have two fields at {field.coordinates}")
+
+            tiles[y * base_size + x] = _TILES[field.value]
+
+        if _EMPTY_TILE not in tiles:
             raise InconsistentGrid("Grid doesn't have an empty field")
 
-        if len(self.fields) != len(set(self.fields)):
+        if len(tiles) != len(set(tiles)):
             raise InconsistentGrid("Cannot have duplicate values of fields")
 
+        self.__base_size = base_size
+        self.__origin = x_min, y_min
+        self.__board = _pack(tiles)
+        self.__empty = tiles.index(_EMPTY_TILE)
+        self.__fields: Union[tuple[Field], None] = None
+        self.__positions: Union[tuple[int], None] = None
+
+    @classmethod
+    def of_board(
+            cls,
+            base_size: int,
+            board: Union[int, bytes],
+            empty_index: Union[int, None] = None,
+            origin: tuple[int, int] = (0, 0)
+    ) -> "Grid":
+        """Creates the grid directly from the packed board (as provided by
+        the `board` property of another grid). The board is not validated.
+
+        :param base_size: Base size of the grid
+        :param board: The packed board
+        :param empty_index: Index of the empty field (when already known)
+        :param origin: Coordinates of the first field (x_min, y_min)
+        """
+        grid = cls.__new__(cls)
+        grid.__base_size = base_size
+        grid.__origin = origin
+        grid.__board = board
+        grid.__fields = None
+        grid.__positions = None
+
+        if empty_index is None:
+            empty_index = grid.tiles.index(_EMPTY_TILE)
+
+        grid.__empty = empty_index
+        return grid
+
     @property
     def base_size(self) -> int:
         """Base size of the grid - it represents the width of the board
@@ -197,35 +275,86 @@ class Grid:
         """
         return self.__base_size
 
+    @property
+    def board(self) -> Union[int, bytes]:
+        """The packed board - either an integer (4 bits per tile, the first
+        field in the lowest bits) or bytes (a byte per tile)."""
+        return self.__board
+
+    @property
+    def empty_index(self) -> int:
+        """Index of the empty field on the board."""
+        return self.__empty
+
+    @property
+    def tiles(self) -> tuple[int]:
+        """Tiles of all the fields (the indexes of their values in
+        `Field.available_values()`) ordered by the rows."""
+        board = self.__board
+
+        if isinstance(board, int):
+            return tuple([
+                (board >> (index * _TILE_BITS)) & _TILE_MASK
+                for index in range(self.base_size ** 2)
+            ])
+
+        return tuple(board)
+
+    def tile(self, index: int) -> int:
+        """Tile of the field at the given index of the board."""
+        board = self.__board
+
+        if isinstance(board, int):
+            return (board >> (index * _TILE_BITS)) & _TILE_MASK
+
+        return board[index]
+
+    @property
+    def positions(self) -> tuple[int]:
+        """Indexes of the fields on the board for all the tiles (-1 for the
+        tiles not on the board)."""
+        if self.__positions is None:
+            positions = [-1] * len(_TILES)
+
+            for index, tile in enumerate(self.tiles):
+                positions[tile] = index
+
+            self.__positions = tuple(positions)
+
+        return self.__positions
+
     @property
     def fields(self) -> tuple[Field]:
-        """All the fields the board consists of"""
-        return tuple(self.__fields)
+        """All the fields the board consists of (ordered by the rows)"""
+        if self.__fields is None:
+            x_min, y_min = self.__origin
+            values = Field.available_values()
+
+            self.__fields = tuple([
+                Field(x_min + index % self.base_size,
+                      y_min + index // self.base_size,
+                      values[tile])
+                for index, tile in enumerate(self.tiles)
+            ])
+
+        return self.__fields
 
     @property
     def values(self) -> tuple[str]:
         """All the values the board has"""
-        return tuple([f.value for f in self.fields])
+        values = Field.available_values()
+        return tuple([values[tile] for tile in self.tiles])
 
     @property
     def empty_field(self) -> Field:
-        """Tries to find the empty field. When there's no such field found,
-        it raises an error.
-        """
-        for field in self.fields:
-            if field.is_empty:
-                return field
-
-        # When not found
-        raise InconsistentGrid("Grid doesn't have an empty field")
+        """The empty field of the board."""
+        return self.fields[self.__empty]
 
     @property
     def empty_field_coords(self) -> tuple[int, int]:
-        """Returns the coordinates of the empty field. When there is no such
-        field found, it raises an error.
-        """
-        empty = self.empty_field
-        return empty.x, empty.y
+        """Returns the coordinates of the empty field."""
+        y, x = divmod(self.__empty, self.base_size)
+        return self.__origin[0] + x, self.__origin[1] + y
 
     def possible_movements(
             self,
@@ -244,37 +373,19 @@ class Grid:
             or if it should also contain the assigned direction you need to
             perform to get the neighbour field (`True`)
         """
-        empty = self.empty_field
-
-        # Initialize possible moves
-        dirs: list[Move] = [direction for direction in Move]
-
-        # Find potential neighbour coordinates by mapping each direction
-        # to a tuple like (direction, coordinates_in_direction)
-        move_coords = [(d, d.neighbour(empty.x, empty.y)) for d in dirs]
-
-        # Map Coordinates to Fields
-        move_fields = []
-
-        for move_coord in move_coords:
-            # Shorthand coordinates from he second index
-            coords = move_coord[1]
-
-            move_fields.append(
-                # Append tuple (move_direction, field), while
-                # field is mapped from the given coordinates
-                (move_coord[0], self.field(coords[0], coords[1]))
-            )
-
-        # Filter non-existing fields - when field is not found by coordinates
-        # (is None), then skip it. Otherwise, return the original tuple
-        neighbours = [mf for mf in move_fields if mf[1] is not None]
+        neighbours = _neighbours(self.base_size)[self.__empty]
 
-        # If should return fields only (filter fields only)
         if not include_directions:
-            neighbours = [neigh[1] for neigh in neighbours]
+            return tuple([self.fields[index] for index in neighbours.values()])
 
-        return tuple(neighbours)
+        return tuple([
+            (direction, self.fields[index])
+            for direction, index in neighbours.items()
+        ])
+
+    def can_move(self, direction: Move) -> bool:
+        """Returns if the empty field can be moved in the given direction."""
+        return direction in _neighbours(self.base_size)[self.__empty]
 
     @property
     def frame(self) -> tuple[int, int, int, int]:
@@ -284,75 +395,56 @@ class Grid:
         Board can technically have minimums as any numbers. Order of these
         values is (x_min, x_max, y_min, y_max).
         """
-
-        # Helper shorthand functions
-        def x(field: Field) -> int:
-            """Derive the x-axis coordinate from the given field."""
-            return field.x
-
-        def y(field: Field) -> int:
-            """Derive the y-axis coordinate from the given field."""
-            return field.y
-
-        # Take the minimum and maximum coordinates for both axes
-        x_min, x_max = min(self.fields, key=x).x, max(self.fields, key=x).x
-        y_min, y_max = min(self.fields, key=y).y, max(self.fields, key=y).y
-
-        # Return them as a tuple
-        return x_min, x_max, y_min, y_max
+        x_min, y_min = self.__origin
+        last = self.base_size - 1
+        return x_min, x_min + last, y_min, y_min + last
 
     @property
     def height(self) -> int:
-        """Height of the board, calculated as a difference between minimum and
-        maximum value in the y-axis."""
-        return self.frame[3] - self.frame[2] + 1
+        """Height of the board (the same as the width)."""
+        return self.base_size
 
     @property
     def width(self) -> int:
-        """Width of the board, calculated as a difference between minimum and
-        maximum value in the x-axis."""
-        return self.frame[1] - self.frame[0] + 1
+        """Width of the board (the same as the height)."""
+        return self.base_size
 
     @property
     def rows(self) -> tuple[tuple[Field]]:
         """Returns the fields of the board organized by rows."""
-        rows = []
-        for y in range(self.frame[2], self.frame[2] + self.height):
-            row = []
-            for x in range(self.frame[0], self.frame[0] + self.width):
-                row.append(self.field(x, y))
-            rows.append(tuple(row))
-        return tuple(rows)
+        base = self.base_size
+        return tuple([
+            self.fields[y * base:(y + 1) * base] for y in range(base)
+        ])
 
     @property
     def column(self) -> tuple[tuple[Field]]:
         """Returns the field of the board organized by columns."""
-        columns = []
-        for x in range(self.frame[0], self.frame[0] + self.width):
-            column = []
-            for y in range(self.frame[2], self.frame[2] + self.height):
-                column.append(self.field(x, y))
-            columns.append(tuple(column))
-        return tuple(columns)
+        base = self.base_size
+        return tuple([self.fields[x::base] for x in range(base)])
 
     @property
     def copy(self) -> "Grid":
-        """Creates a deep copy of this grid."""
-        return Grid(self.base_size, tuple([f.copy for f in self.fields]))
+        """Creates a copy of this grid. Since the grids are immutable, it
+        shares the packed board."""
+        return Grid.of_board(
+            self.base_size, self.__board, self.__empty, self.__origin)
 
     def field(self, x: int, y: int) -> Field:
         """Tries to find a field by the given coordinates. When no such field
         is found, it returns None."""
-        for field in self.fields:
-            if field.x == x and field.y == y:
-                return field
+        index = self._index(x, y)
+
+        if index is not None:
+            return self.fields[index]
 
     def field_by_value(self, value: str) -> Field:
         """Tries to find a field with the given value. When no such field is
         found, it returns None."""
-        for field in self.fields:
-            if field.value == value:
-                return field
+        tile = _TILES.get(value)
+
+        if tile is not None and self.positions[tile] >= 0:
+            return self.fields[self.positions[tile]]
 
     def switch_fields(self, x1: int, y1: int, x2: int, y2: int) -> "Grid":
         """Tries to switch the fields at given coordinates.
@@ -360,24 +452,24 @@ class Grid:
         When there is no field at the any of the two coordinates, it raises
         an error.
 
-        The output is a brand new instance (deep clone) of this grid.
+        The output is a brand new instance of this grid.
         """
-        field1 = self.field(x1, y1)
-        field2 = self.field(x2, y2)
+        index1 = self._index(x1, y1)
+        index2 = self._index(x2, y2)
 
         # If any of the fields is missing
-        if not field1 or not field2:
+        if index1 is None or index2 is None:
             raise CannotSwitch(
                 "One of the fields doesn't exist", (x1, y1), (x2, y2))
 
-        # Create deep clone of this grid
-        clone = self.copy
+        empty = self.__empty
 
-        # Switch values between those two fields of the cloned grid
-        clone.field(field1.x, field1.y).value = field2.value
-        clone.field(field2.x, field2.y).value = field1.value
+        if empty in (index1, index2):
+            empty = index1 + index2 - empty
 
-        return clone
+        return Grid.of_board(
+            self.base_size, self._swapped(index1, index2), empty,
+            self.__origin)
 
     def move(self, direction: Move) -> "Grid":
         """Tries to move a field on the grid board to the empty one. In other
@@ -389,26 +481,70 @@ class Grid:
         a neighbour on the right side of the empty field and tries to switch
         those two fields.
         """
-        empty = self.empty_field
-        movements = self.possible_movements(include_directions=True)
-        desired_field: Union[Field, None] = None
-
-        for movement in movements:
-            if movement[0] == direction:
-                desired_field = movement[1]
-                break
+        neighbour = _neighbours(self.base_size)[self.__empty].get(direction)
 
-        # If any of the fields is not present
-        if not desired_field:
+        # If the field is not present
+        if neighbour is None:
             raise CannotSwitch(f"The non-empty field doesn't exist")
 
-        # Try to switch those fields
-        return self.switch_fields(
-            empty.x,
-            empty.y,
-            desired_field.x,
-            desired_field.y
-        )
+        return Grid.of_board(
+            self.base_size, self._swapped(self.__empty, neighbour),
+            neighbour, self.__origin)
+
+    def can_reach(self, other: "Grid") -> bool:
+        """Returns if the given grid can be reached from this one by the
+        moves (in a linear time).
+
+        Each move swaps the empty field with a neighbour, so it changes both
+        the parity of the permutation of the fields and the parity of the
+        distance of the empty field. The other grid is reachable exactly
+        when both the parities are the same - the permutation taking this
+        grid to the other one is even just when the empty field is in an
+        even distance from its position at the other grid.
+        """
+        try:
+            self._check_comparable(other)
+        except IncomparableGrids:
+            return False
+
+        base = self.base_size
+        target = other.positions
+        destinations = [target[tile] for tile in self.tiles]
+
+        # Parity of the permutation by the number of its cycles
+        visited = [False] * len(destinations)
+        cycles = 0
+
+        for index in range(len(destinations)):
+            if not visited[index]:
+                cycles += 1
+
+                while not visited[index]:
+                    visited[index] = True
+                    index = destinations[index]
+
+        empty_y, empty_x = divmod(self.__empty, base)
+        other_y, other_x = divmod(other.empty_index, base)
+        empty_distance = abs(empty_x - other_x) + abs(empty_y - other_y)
+
+        return (len(destinations) - cycles) % 2 == empty_distance % 2
+
+    def inversions(self, other: "Grid") -> int:
+        """Counts the pairs of the tiles (the empty field not counted) placed
+        in the opposite order (reading the rows) than at the given grid."""
+        self._check_comparable(other)
+
+        order = other.positions
+        ranks = [
+            order[tile] for tile in self.tiles if tile != _EMPTY_TILE
+        ]
+
+        return sum([
+            1
+            for i, rank in enumerate(ranks)
+            for later in ranks[i + 1:]
+            if later < rank
+        ])
 
     def number_of_different_values(self, other: "Grid") -> int:
         """Counts the number of differently placed fields in between the given
@@ -421,58 +557,66 @@ class Grid:
 
         When any of these conditions is forced, then it raises an error.
         """
+        self._check_comparable(other)
 
-        if self.base_size != other.base_size:
-            raise IncomparableGrids(
-                "Grids have different base size", self, other)
-
-        if sorted(self.values) != sorted(other.values):
-            raise IncomparableGrids(
-                "Grids have different values", self, other)
-
-        # Differences accumulator
-        n_differences = 0
-
-        for field in self.fields:
-            other_field = other.field(field.x, field.y)
-
-            # Check existence
-            if not other_field:
-                raise IncomparableGrids(
-                    f"Field '{field}' doesn't exist in the other grid",
-                    self,
-                    other
-                )
-
-            # If the values of the fields are different, add 1, else 0
-            n_differences += 1 if field.value != other_field.value else 0
-
-        return n_differences
+        return sum([
+            1 if tile != other_tile else 0
+            for tile, other_tile in zip(self.tiles, other.tiles)
+        ])
 
     def manhattan_distance(self, other: "Grid") -> int:
         """Calculates the distance between two different grids by evaluating
         the manhattan distance between each misplaced fields (in terms of its
         value).
         """
+        return ManhattanTable.of(other).distance(self)
+
+    def _check_comparable(self, other: "Grid"):
+        """Raises an error when the given grid cannot be compared with this
+        one."""
         if self.base_size != other.base_size:
             raise IncomparableGrids(
                 "Grids have different base size", self, other)
 
-        if sorted(self.values) != sorted(other.values):
+        if sorted(self.tiles) != sorted(other.tiles):
             raise IncomparableGrids(
                 "Grids have different values", self, other)
 
-        total_manhattan_distance = 0
+        if self.__origin != other.__origin:
+            raise IncomparableGrids(
+                "Grids have different coordinates", self, other)
+
+    def _index(self, x: int, y: int) -> Union[int, None]:
+        """Index of the field at the given coordinates on the board (None
+        when there's no such field)."""
+        x, y = x - self.__origin[0], y - self.__origin[1]
 
-        for field in self.fields:
-            other_field = other.field_by_value(field.value)
+        if 0 <= x < self.base_size and 0 <= y < self.base_size:
+            return y * self.base_size + x
 
-            if field.x != other_field.x or field.y != other_field.y:
-                total_manhattan_distance += (
-                    field.manhattan_distance(other_field)
-                )
+    def _swapped(self, index1: int, index2: int) -> Union[int, bytes]:
+        """Packed board with the tiles at the given indexes swapped."""
+        board = self.__board
 
-        return total_manhattan_distance
+        if isinstance(board, int):
+            shift1, shift2 = index1 * _TILE_BITS, index2 * _TILE_BITS
+            diff = ((board >> shift1) ^ (board >> shift2)) & _TILE_MASK
+            return board ^ (diff << shift1) ^ (diff << shift2)
+
+        swapped = bytearray(board)
+        swapped[index1], swapped[index2] = board[index2], board[index1]
+        return bytes(swapped)
+
+    def __eq__(self, other: "Grid") -> bool:
+        return (
+            isinstance(other, Grid) and
+            self.base_size == other.base_size and
+            self.__origin == other.__origin and
+            self.__board == other.__board
+        )
+
+    def __hash__(self) -> int:
+        return hash(self.__board)
 
     @staticmethod
     def of(values: Union[Iterable[str], str], base_size: int = 3) -> "Grid":
@@ -517,6 +661,70 @@ class Grid:
         raise ValueError(f"Not available {base_size = }")
 
 
+class ManhattanTable:
+    """Precomputed Manhattan distances of all the tiles to their positions
+    at the given goal grid - for each tile, the distance from each field of
+    the board. The distance of a grid is then just a sum of the look-ups,
+    and after a move, it's updated by the only two tiles switched.
+
+    The tables are shared for the equal goals (see `of`).
+    """
+
+    def __init__(self, goal: Grid):
+        base = goal.base_size
+        distances: list[tuple[int]] = [()] * len(_TILES)
+
+        for goal_index, tile in enumerate(goal.tiles):
+            goal_y, goal_x = divmod(goal_index, base)
+            distances[tile] = tuple([
+                abs(index % base - goal_x) + abs(index // base - goal_y)
+                for index in range(base ** 2)
+            ])
+
+        self.__goal = goal
+        self.__distances = tuple(distances)
+
+    @classmethod
+    @lru_cache
+    def of(cls, goal: Grid) -> "ManhattanTable":
+        """Returns the (cached) table of the given goal grid."""
+        return cls(goal)
+
+    @property
+    def goal(self) -> Grid:
+        """Grid the distances are measured to."""
+        return self.__goal
+
+    @property
+    def distances(self) -> tuple[tuple[int]]:
+        """Distances of the tiles (indexed by the tiles) from each field of
+        the board. Tiles missing at the goal have no distances."""
+        return self.__distances
+
+    def distance(self, grid: Grid) -> int:
+        """Manhattan distance of all the fields of the given grid (including
+        the empty one) from their positions at the goal grid."""
+        grid._check_comparable(self.__goal)
+        distances = self.__distances
+
+        return sum([
+            distances[tile][index] for index, tile in enumerate(grid.tiles)
+        ])
+
+    def moved(self, distance: int, grid: Grid, moved_grid: Grid) -> int:
+        """Updates the distance of the given grid for the grid created by
+        a single move of its empty field in a constant time."""
+        before, after = grid.empty_index, moved_grid.empty_index
+        tile = grid.tile(after)
+        distances = self.__distances
+
+        return (
+            distance +
+            distances[tile][before] - distances[tile][after] +
+            distances[_EMPTY_TILE][after] - distances[_EMPTY_TILE][before]
+        )
+
+
 class InconsistentGrid(Exception):
     """This type of error is thrown when the grid is not consistent."""
 
@@ -580,3 +788,37 @@ class CannotSwitch(Exception):
         return self.__field2_coords
 
 
+@lru_cache
+def _neighbours(base_size: int) -> tuple[dict[Move, int]]:
+    """For each field index of the board of the given base size, indexes of
+    its neighbours by the directions of the moves."""
+    neighbours = []
+
+    for index in range(base_size ** 2):
+        y, x = divmod(index, base_size)
+        by_direction = {}
+
+        for direction in Move:
+            neighbour_x, neighbour_y = direction.neighbour(x, y)
+
+            if 0 <= neighbour_x < base_size and 0 <= neighbour_y < base_size:
+                by_direction[direction] = neighbour_y * base_size + neighbour_x
+
+        neighbours.append(by_direction)
+
+    return tuple(neighbours)
+
+
+def _pack(tiles: Iterable[int]) -> Union[int, bytes]:
+    """Packs the given tiles into a board - an integer when they fit in
+    4 bits each (and there are at most 16 of them), bytes otherwise."""
+    tiles = list(tiles)
+
+    if len(tiles) > _MAX_PACKED_TILES or max(tiles, default=0) > _TILE_MASK:
+        return bytes(tiles)
+
+    board = 0
+    for index, tile in enumerate(tiles):
+        board |= tile << (index * _TILE_BITS)
+
+    return board
@@ -0,0 +1,355 @@
+"""This module contains the complete table of the distances of the 8-Puzzle -
+the exact number of the moves needed to solve each of its boards.
+
+The 3x3 board has only 181,440 boards reachable from the goal, so all their
+distances can be found by a single breadth-first search from the goal
+(vectorized using NumPy - the whole layer of the boards is moved at once).
+The distances are stored as a `uint8` array indexed by the lexicographic
+rank of the boards (as ranked by the `GridRanking`), cached in a file and
+memory-mapped when loaded.
+
+With the table, the distance of a board is a single look-up. It's a perfect
+heuristic, and the optimal solution is found without any search at all -
+by always moving to the neighbour one move closer to the goal. It also
+provides the boards of any exact distance from the goal.
+
+Most importantly, it declares the following classes:
+
+    - DistanceTable:
+        Distances of all the boards from the goal one.
+
+    - DistanceTableHeuristic:
+        Exact heuristic looking the distances up in the table.
+
+    - DistanceTableSolver:
+        Algorithm following the table straight to the goal.
+
+This module requires NumPy.
+"""
+
+import os
+import random
+import struct
+from math import factorial
+from typing import Union
+
+import numpy as np
+
+from src.fw import State, Operator
+from src.fw.algorithms.base import Algorithm, NoSolutionFound
+from src.fw.algorithms.closed_set import ClosedSet
+from src.fw.heuristic import Heuristic
+from .puzzle_definition import Grid, Move, Field
+from .puzzle_state_space import GridState, GridOperator, GridRanking
+
+
+# Distance of the boards not reachable from the goal
+UNREACHABLE = 255
+
+
+class DistanceTable:
+    """Distances of all the boards (up to 3x3) from the given goal grid by
+    the lexicographic ranks of the boards."""
+
+    # Header of the file: magic, version, base size (followed by the tiles
+    # of the goal grid)
+    _FILE_HEADER = struct.Struct("<4sHB")
+    _FILE_MAGIC = b"SSDT"
+    _FILE_VERSION = 1
+
+    def __init__(self, goal: Grid, distances: Union[np.ndarray, None] = None):
+        if goal.base_size > 3:
+            raise ValueError(
+                f"Distance table is available up to 3x3: {goal.base_size = }")
+
+        self.__goal = goal
+        self.__ranking = GridRanking.of(goal, lexicographic=True)
+
+        if distances is None:
+            distances = self._search()
+        elif distances.shape != (self.__ranking.size,):
+            raise ValueError(
+                f"Distances of shape {distances.shape} don't fit the "
+                f"{goal.base_size}x{goal.base_size} boards")
+
+        self.__distances = distances
+
+    @classmethod
+    def of(
+            cls,
+            goal: Grid,
+            cache_dir: Union[str, None] = None
+    ) -> "DistanceTable":
+        """Returns the table of the given goal. The table is computed once -
+        it's kept in the memory and, when the directory is given, in a file
+        in it."""
+        key = goal, cache_dir
+
+        if key not in _TABLES:
+            path = cls.cache_path(goal, cache_dir)
+
+            if path and os.path.exists(path):
+                table = cls.load(path, goal)
+            else:
+                table = cls(goal)
+
+                if path:
+                    table.save(path)
+
+            _TABLES[key] = table
+
+        return _TABLES[key]
+
+    @staticmethod
+    def cache_path(
+            goal: Grid,
+            cache_dir: Union[str, None]
+    ) -> Union[str, None]:
+        """Path of the cache file of the table in the given directory. When
+        there's no directory, None."""
+        if cache_dir is None:
+            return None
+        return os.path.join(
+            cache_dir, f"distances_{''.join(goal.values)}.dt")
+
+    @classmethod
+    def load(cls, path: str, goal: Grid, mmap: bool = True
+             ) -> "DistanceTable":
+        """Loads the table of the given goal from the file created by `save`.
+        By default, the distances are memory-mapped (read-only)."""
+        header = cls._FILE_HEADER
+
+        with open(path, "rb") as file:
+            magic, version, base_size = header.unpack(file.read(header.size))
+
+            if magic != cls._FILE_MAGIC or version != cls._FILE_VERSION:
+                raise ValueError(f"Not a distance table file (version "
+                                 f"{cls._FILE_VERSION}): {path}")
+
+            if tuple(file.read(base_size ** 2)) != goal.tiles:
+                raise ValueError(
+                    f"Distance table was built for another goal: {path}")
+
+            offset = file.tell()
+
+            if not mmap:
+                distances = np.fromfile(file, dtype=np.uint8)
+
+        if mmap:
+            distances = np.memmap(
+                path, dtype=np.uint8, mode="r", offset=offset)
+
+        return cls(goal, distances)
+
+    def save(self, path: str):
+        """Saves the table into a binary file (a header followed by the
+        distances, a byte for each)."""
+        with open(path, "wb") as file:
+            file.write(self._FILE_HEADER.pack(
+                self._FILE_MAGIC, self._FILE_VERSION, self.__goal.base_size))
+            file.write(bytes(self.__goal.tiles))
+            file.write(np.ascontiguousarray(self.__distances).tobytes())
+
+    @property
+    def goal(self) -> Grid:
+        return self.__goal
+
+    @property
+    def ranking(self) -> GridRanking:
+        """Ranking of the boards indexing the table."""
+        return self.__ranking
+
+    @property
+    def distances(self) -> np.ndarray:
+        """Distances of all the boards by their ranks (`UNREACHABLE` for the
+        boards the goal cannot be reached from)."""
+        return self.__distances
+
+    @property
+    def depth(self) -> int:
+        """The largest distance of a board from the goal."""
+        return int(self.__distances[self.__distances != UNREACHABLE].max())
+
+    def distance(self, grid: Grid) -> int:
+        """Exact distance of the given grid from the goal (`UNREACHABLE` when
+        the goal cannot be reached from it)."""
+        return int(self.__distances[self.__ranking.rank(GridState(grid))])
+
+    def solution(self, grid: Grid) -> list[Move]:
+        """Moves of the shortest path from the given grid to the goal - in
+        each step, the move to a neighbour one move closer to the goal."""
+        distance = self.distance(grid)
+
+        if distance == UNREACHABLE:
+            raise ValueError("Goal cannot be reached from the grid")
+
+        moves = []
+
+        while distance:
+            for move in Move:
+                if grid.can_move(move):
+                    neighbour = grid.move(move)
+
+                    if self.distance(neighbour) == distance - 1:
+                        break
+
+            moves.append(move)
+            grid, distance = neighbour, distance - 1
+
+        return moves
+
+    def grids_at(self, distance: int) -> np.ndarray:
+        """Ranks of all the grids of the given distance from the goal."""
+        return np.flatnonzero(self.__distances == distance)
+
+    def random_grid(self, distance: int) -> Grid:
+        """Random grid with the given exact distance from the goal."""
+        ranks = self.grids_at(distance)
+
+        if not ranks.size:
+            raise ValueError(
+                f"No grid of {distance = } (the largest is {self.depth})")
+
+        return self.__ranking.unrank(int(random.choice(ranks))).grid
+
+    def _search(self) -> np.ndarray:
+        """Breadth-first search from the goal over all the boards - each
+        kept as the permutation of the value indexes (as the `GridRanking`
+        permutes them)."""
+        goal = self.__goal
+        base = goal.base_size
+        n = base ** 2
+
+        # Indexes of the tiles in the sorted values of the goal
+        values = Field.available_values()
+        order = sorted(goal.values)
+        indexes = {tile: order.index(values[tile]) for tile in goal.tiles}
+        empty = indexes[goal.tile(goal.empty_index)]
+
+        # Neighbours of all the fields by the directions
+        neighbours = np.full((n, len(Move)), -1, dtype=np.int64)
+        for index in range(n):
+            for direction, move in enumerate(Move):
+                x, y = move.neighbour(index % base, index // base)
+
+                if 0 <= x < base and 0 <= y < base:
+                    neighbours[index, direction] = y * base + x
+
+        weights = np.array([factorial(n - 1 - i) for i in range(n)])
+
+        def ranks(permutations: np.ndarray) -> np.ndarray:
+            """Lexicographic ranks of all the rows of the permutations."""
+            smaller = (
+                permutations[:, None, :] < permutations[:, :, None]
+            ) & np.triu(np.ones((n, n), dtype=bool), 1)
+            return smaller.sum(axis=2) @ weights
+
+        distances = np.full(self.__ranking.size, UNREACHABLE, dtype=np.uint8)
+
+        boards = np.array([[indexes[tile] for tile in goal.tiles]])
+        blanks = np.array([goal.empty_index])
+        distances[ranks(boards)] = 0
+        distance = 0
+
+        while len(boards):
+            distance += 1
+            moved_boards, moved_blanks = [], []
+
+            for direction in range(len(Move)):
+                targets = neighbours[blanks, direction]
+                valid = targets >= 0
+                moved = boards[valid].copy()
+                rows = np.arange(len(moved))
+
+                # The neighbour tile moves to the empty field
+                moved[rows, blanks[valid]] = moved[rows, targets[valid]]
+                moved[rows, targets[valid]] = empty
+
+                moved_boards.append(moved)
+                moved_blanks.append(targets[valid])
+
+            boards = np.concatenate(moved_boards)
+            blanks = np.concatenate(moved_blanks)
+
+            board_ranks, first = np.unique(ranks(boards), return_index=True)
+            unseen = distances[board_ranks] == UNREACHABLE
+
+            distances[board_ranks[unseen]] = distance
+            boards, blanks = boards[first[unseen]], blanks[first[unseen]]
+
+        return distances
+
+
+class DistanceTableHeuristic(Heuristic):
+    """Exact heuristic of the boards up to 3x3 - the distances looked up in
+    the table of the goal. Boards the goal cannot be reached from are
+    estimated as infinitely far.
+
+    :param cache_dir: Directory the tables are cached in
+    """
+
+    def __init__(self, cache_dir: Union[str, None] = None):
+        self.__cache_dir = cache_dir
+
+    @property
+    def cache_dir(self) -> Union[str, None]:
+        return self.__cache_dir
+
+    def estimate(self, state: GridState, goal_state: GridState) -> float:
+        table = DistanceTable.of(goal_state.grid, self.__cache_dir)
+        distance = table.distance(state.grid)
+        return float("inf") if distance == UNREACHABLE else float(distance)
+
+
+class DistanceTableSolver(Algorithm):
+    """Algorithm producing the optimal solution of the boards up to 3x3 with
+    no search - it follows the distance table of the goal, one move closer
+    to the goal in each step.
+
+    It expects the `GridState` states and the `GridOperator` operators.
+
+    :param cache_dir: Directory the tables are cached in
+    """
+
+    def __init__(
+            self,
+            cache_dir: Union[str, None] = None,
+            closed_set: Union[ClosedSet, None] = None
+    ):
+        super().__init__("DISTANCE_TABLE", closed_set)
+        self.__cache_dir = cache_dir
+
+    def next_state(self):
+        """Not used in this algorithm."""
+
+    def solve(
+            self,
+            initial_state: GridState,
+            goal_state: GridState,
+            operators: tuple[Operator]
+    ) -> State:
+        """Follows the table from the initial state to the goal."""
+        self.reset()
+
+        table = DistanceTable.of(goal_state.grid, self.__cache_dir)
+        operators_by_moves = {
+            op.direction: op for op in operators
+            if isinstance(op, GridOperator)
+        }
+
+        try:
+            moves = table.solution(initial_state.grid)
+        except ValueError as error:
+            raise NoSolutionFound(state=initial_state, message=str(error))
+
+        state = initial_state
+
+        for move in moves:
+            self.note_expansion(1)
+            state = operators_by_moves[move].apply(state)
+
+        return state
+
+
+# Distance tables by the goal and the cache directory
+_TABLES: dict[tuple[Grid, Union[str, None]], DistanceTable] = {}
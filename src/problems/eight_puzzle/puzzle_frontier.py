@@ -0,0 +1,318 @@
+"""This module contains the breadth-first search of the sliding puzzle
+expanding whole layers of the boards at once.
+
+The boards up to 4x4 are packed into 64-bit integers (4 bits per tile), so
+a whole layer of them is a single NumPy array. All the moves of the empty
+field are generated for the whole layer by the index arithmetic - the moved
+tile is shifted out of its field and into the empty one by XOR. The moves
+back to the parents are not generated at all. Duplicates are removed by
+sorting the packed boards (so each layer is kept sorted) and dropping all
+but the first of the equal ones.
+
+The board of the puzzle is a bipartite graph (each move changes the parity
+of the position of the empty field), so all the neighbours of a board lie
+in the previous or in the next layer. The new layer is thus cleared of the
+boards of the previous layer only.
+
+Each board of a layer remembers the index of its parent in the previous
+layer and the move it was created by, so the path to any board found is
+back-tracked through these arrays. All the layers are kept - 8 bytes of
+the board, 4 of the parent and 2 of the move and of the empty field per
+board - so the 15-Puzzle can be swept to the depths of tens of millions of
+boards.
+
+Most importantly, it declares the following classes:
+
+    - FrontierSearch:
+        Layers of all the boards reachable from the given start.
+
+    - FrontierSearchSolver:
+        Algorithm sweeping the layers from the initial grid to the goal.
+
+This module requires NumPy.
+"""
+
+from typing import Union
+
+import numpy as np
+
+from src.fw import State, Operator
+from src.fw.algorithms.base import Algorithm, NoSolutionFound
+from src.fw.algorithms.closed_set import ClosedSet
+from .puzzle_definition import (
+    Grid, Move, _neighbours, _EMPTY_TILE, _TILE_BITS, _TILE_MASK
+)
+from .puzzle_state_space import GridState, GridOperator
+
+
+# All the moves by their indexes in the layers
+_MOVES = tuple(Move)
+
+# Indexes of the opposite moves
+_INVERSES = tuple([_MOVES.index(move.opposite) for move in _MOVES])
+
+
+class FrontierSearch:
+    """Breadth-first search from the given start grid (up to 4x4) by whole
+    layers of the packed boards.
+
+    The layers are swept on demand (see `expand` and `sweep`), each one
+    sorted by the packed boards.
+    """
+
+    def __init__(self, start: Grid):
+        if not isinstance(start.board, int):
+            raise ValueError(
+                f"Frontier search needs the boards packed into integers "
+                f"(up to 4x4): {start.base_size = }")
+
+        base = start.base_size
+        self.__start = start
+
+        # Neighbours of all the fields by the moves (-1 when there's none)
+        self.__neighbours = np.array([
+            [by_direction.get(move, -1) for move in _MOVES]
+            for by_direction in _neighbours(base)
+        ], dtype=np.int64)
+
+        self.__boards = [np.array([start.board], dtype=np.uint64)]
+        self.__blanks = [np.array([start.empty_index], dtype=np.uint8)]
+        self.__parents = [np.array([-1], dtype=np.int32)]
+        self.__moves = [np.array([-1], dtype=np.int8)]
+        self.__generated = 0
+
+    @property
+    def start(self) -> Grid:
+        return self.__start
+
+    @property
+    def depth(self) -> int:
+        """Depth of the last layer swept."""
+        return len(self.__boards) - 1
+
+    @property
+    def sizes(self) -> tuple[int]:
+        """Numbers of the boards of all the layers swept."""
+        return tuple([len(boards) for boards in self.__boards])
+
+    @property
+    def size(self) -> int:
+        """Number of all the boards found."""
+        return sum(self.sizes)
+
+    @property
+    def generated(self) -> int:
+        """Number of all the boards generated (including the duplicates)."""
+        return self.__generated
+
+    @property
+    def exhausted(self) -> bool:
+        """Flag if all the boards reachable from the start were found."""
+        return not len(self.__boards[-1])
+
+    def layer(self, depth: int) -> np.ndarray:
+        """Sorted packed boards of the given distance from the start."""
+        return self.__boards[depth]
+
+    def expand(self) -> int:
+        """Sweeps the next layer of the boards.
+
+        :return: Number of the boards of the new layer.
+        """
+        boards, blanks = self.__boards[-1], self.__blanks[-1]
+        applied = self.__moves[-1]
+        tile_bits = np.uint64(_TILE_BITS)
+
+        moved_boards, moved_blanks, parents, moves = [], [], [], []
+
+        for index in range(len(_MOVES)):
+            targets = self.__neighbours[blanks, index]
+
+            # Skip the moves back to the parents
+            valid = np.flatnonzero(
+                (targets >= 0) & (applied != _INVERSES[index]))
+
+            source = boards[valid]
+            target_shifts = targets[valid].astype(np.uint64) * tile_bits
+            blank_shifts = blanks[valid].astype(np.uint64) * tile_bits
+
+            # The tile switches places with the empty field
+            tiles = (source >> target_shifts) & np.uint64(_TILE_MASK)
+            switched = tiles ^ np.uint64(_EMPTY_TILE)
+
+            moved_boards.append(
+                source ^ (switched << target_shifts) ^
+                (switched << blank_shifts))
+            moved_blanks.append(targets[valid].astype(np.uint8))
+            parents.append(valid.astype(np.int32))
+            moves.append(np.full(len(valid), index, dtype=np.int8))
+
+        moved = np.concatenate(moved_boards)
+        self.__generated += len(moved)
+
+        # Sorted boards with the first of the equal ones marked
+        order = np.argsort(moved)
+        moved = moved[order]
+        first = np.empty(len(moved), dtype=bool)
+        first[:1] = True
+        np.not_equal(moved[1:], moved[:-1], out=first[1:])
+
+        unique, first = moved[first], order[first]
+
+        # Neighbours of the previous layer are the only duplicates left
+        if len(self.__boards) > 1:
+            unseen = ~np.isin(unique, self.__boards[-2], assume_unique=True)
+            unique, first = unique[unseen], first[unseen]
+
+        self.__boards.append(unique)
+        self.__blanks.append(np.concatenate(moved_blanks)[first])
+        self.__parents.append(np.concatenate(parents)[first])
+        self.__moves.append(np.concatenate(moves)[first])
+
+        return len(unique)
+
+    def sweep(
+            self,
+            max_depth: Union[int, None] = None,
+            max_size: Union[int, None] = None
+    ) -> tuple[int]:
+        """Sweeps the layers until all the boards are found or one of the
+        limits is reached.
+
+        :param max_depth: Depth of the last layer to be swept.
+
+        :param max_size: Number of the boards found after which no more
+                         layers are swept.
+
+        :return: Numbers of the boards of all the layers swept.
+        """
+        size = self.size
+
+        while not self.exhausted:
+            if max_depth is not None and self.depth >= max_depth:
+                break
+
+            if max_size is not None and size >= max_size:
+                break
+
+            size += self.expand()
+
+        return self.sizes
+
+    def contains(self, grid: Grid, depth: int) -> bool:
+        """Returns if the given grid is in the layer of the given depth."""
+        board = np.array([grid.board], dtype=np.uint64)
+        return bool(self._contains(self.__boards[depth], board)[0])
+
+    def distance(self, grid: Grid) -> Union[int, None]:
+        """Distance of the given grid from the start (None when it wasn't
+        found by the layers swept)."""
+        for depth in range(len(self.__boards)):
+            if self.contains(grid, depth):
+                return depth
+
+        return None
+
+    def path(self, grid: Grid) -> list[Move]:
+        """Moves from the start to the given grid back-tracked through the
+        parents of the layers."""
+        depth = self.distance(grid)
+
+        if depth is None:
+            raise ValueError("Grid wasn't found by the layers swept")
+
+        index = int(np.searchsorted(
+            self.__boards[depth], np.uint64(grid.board)))
+        moves = []
+
+        for layer in range(depth, 0, -1):
+            moves.append(_MOVES[self.__moves[layer][index]])
+            index = int(self.__parents[layer][index])
+
+        return list(reversed(moves))
+
+    def grid(self, depth: int, index: int) -> Grid:
+        """Grid of the board at the given index of the layer."""
+        return Grid.of_board(
+            self.__start.base_size,
+            int(self.__boards[depth][index]),
+            int(self.__blanks[depth][index])
+        )
+
+    @staticmethod
+    def _contains(boards: np.ndarray, searched: np.ndarray) -> np.ndarray:
+        """Flags of the searched boards found in the sorted boards."""
+        if not len(boards):
+            return np.zeros(len(searched), dtype=bool)
+
+        positions = np.searchsorted(boards, searched)
+        positions[positions == len(boards)] = 0
+
+        return boards[positions] == searched
+
+
+class FrontierSearchSolver(Algorithm):
+    """Algorithm finding the optimal solution of the boards up to 4x4 by
+    the breadth-first search expanding the whole layers of the boards at
+    once (see `FrontierSearch`).
+
+    It expects the `GridState` states and the `GridOperator` operators.
+
+    :param max_depth: Depth the search gives up at (by default, it searches
+                      until all the boards are found)
+    """
+
+    def __init__(
+            self,
+            max_depth: Union[int, None] = None,
+            closed_set: Union[ClosedSet, None] = None
+    ):
+        super().__init__("FRONTIER_BFS", closed_set)
+        self.__max_depth = max_depth
+
+    @property
+    def max_depth(self) -> Union[int, None]:
+        return self.__max_depth
+
+    def next_state(self):
+        """Not used in this algorithm."""
+
+    def solve(
+            self,
+            initial_state: GridState,
+            goal_state: GridState,
+            operators: tuple[Operator]
+    ) -> State:
+        """Sweeps the layers from the initial grid until the goal one is
+        found and follows the path back-tracked to it."""
+        self.reset()
+
+        search = FrontierSearch(initial_state.grid)
+        operators_by_moves = {
+            op.direction: op for op in operators
+            if isinstance(op, GridOperator)
+        }
+
+        while not search.contains(goal_state.grid, search.depth):
+            if self.__max_depth is not None and (
+                    search.depth >= self.__max_depth):
+                raise NoSolutionFound(
+                    state=initial_state,
+                    message=f"Goal is farther than {self.__max_depth} moves")
+
+            expanded = len(search.layer(search.depth))
+            generated = search.generated
+
+            if not search.expand():
+                raise NoSolutionFound(
+                    state=initial_state,
+                    message="All the layers were searched")
+
+            self.note_expansions(expanded, search.generated - generated)
+
+        state = initial_state
+
+        for move in search.path(goal_state.grid):
+            state = operators_by_moves[move].apply(state)
+
+        return state
@@ -1,7 +1,13 @@
 import random
+from dataclasses import dataclass, field
 from enum import Enum
+from typing import Union
 
+from src.fw.heuristic import Heuristic
 from src.problems.eight_puzzle.puzzle_definition import Grid, Move
+from src.problems.eight_puzzle.puzzle_heuristics import (
+    LinearConflictHeuristic)
+from src.problems.eight_puzzle.puzzle_state_space import GridState
 
 
 class GeneratorVariant(Enum):
@@ -75,9 +81,29 @@ class GeneratorVariant(Enum):
     def generate(
             self,
             organized: Grid,
-            random_steps: int = 12
+            random_steps: int = 12,
+            exact: bool = False,
+            cache_dir: Union[str, None] = None,
+            solvable_only: bool = False
     ) -> Grid:
-        """Tries to generate a randomized grid."""
+        """Tries to generate a randomized grid.
+
+        :param exact: Flag if the grid should be exactly `random_steps`
+                      moves far from the organized one - picked from the
+                      distance table of the organized grid (only for the
+                      grids up to 3x3; requires NumPy).
+        :param cache_dir: Directory the distance tables are cached in
+        :param solvable_only: Flag if the fully randomized grids should be
+                              shuffled again until the organized grid can be
+                              reached from them
+        """
+        if exact:
+            # NumPy is needed only for the exact distances
+            from src.problems.eight_puzzle.puzzle_distance_table import (
+                DistanceTable)
+            table = DistanceTable.of(organized, cache_dir)
+            return table.random_grid(random_steps)
+
         if self.easy:
             current: Grid = organized
             applied = []
@@ -97,8 +123,18 @@ class GeneratorVariant(Enum):
             return current
         else:
             charset = list(self.charset)
-            random.shuffle(charset)
-            return Grid.of(values=''.join(charset), base_size=self.base)
+
+            if solvable_only and sorted(charset) != sorted(organized.values):
+                raise ValueError(
+                    "Organized grid has other values than the variant")
+
+            while True:
+                random.shuffle(charset)
+                grid = Grid.of(values=''.join(charset), base_size=self.base)
+
+                # Half of the shuffles cannot be solved
+                if not solvable_only or grid.can_reach(organized):
+                    return grid
 
     @staticmethod
     def find(base_size: int, easy: bool = True) -> "GeneratorVariant":
@@ -138,13 +174,47 @@ def prune_operators(operators: list[Move]):
 def generate(
         variant: GeneratorVariant = GeneratorVariant.EASY_9,
         organized: Grid = Grid.of(Grid.default_grid_values(), 3),
-        random_steps: int = 12
+        random_steps: int = 12,
+        exact: bool = False,
+        cache_dir: Union[str, None] = None,
+        solvable_only: bool = False
 ) -> tuple[Grid, Grid]:
     """This function generates the whole grid."""
     return (
         variant.generate(
             organized=organized,
-            random_steps=random_steps
+            random_steps=random_steps,
+            exact=exact,
+            cache_dir=cache_dir,
+            solvable_only=solvable_only
         ),
         organized
     )
+
+
+@dataclass(order=True)
+class Hardness:
+    """Estimate of how hard it is to solve a puzzle - useful to sort or
+    filter the generated puzzles. Unsolvable puzzles are the hardest (their
+    estimate is infinite)."""
+
+    estimate: float     # Heuristic estimate of the number of moves
+    inversions: int     # Pairs of the tiles in the opposite order
+    solvable: bool = field(default=True, compare=False)  # Goal reachable
+
+
+def hardness(
+        grid: Grid,
+        goal: Grid,
+        heuristic: Union[Heuristic, None] = None
+) -> Hardness:
+    """Estimates how hard it is to get from the grid to the goal one - by
+    the given heuristic (by default, the linear conflict) and the number of
+    the inverted pairs of the tiles."""
+    if not grid.can_reach(goal):
+        return Hardness(float("inf"), grid.inversions(goal), False)
+
+    heuristic = heuristic or LinearConflictHeuristic()
+    estimate = heuristic.estimate(GridState(grid), GridState(goal))
+
+    return Hardness(estimate, grid.inversions(goal))
@@ -0,0 +1,463 @@
+"""This module contains the stronger heuristics of the sliding puzzles - both
+admissible, so the A* algorithm still finds the optimal solutions, while
+expanding much fewer states than with the plain Manhattan distance.
+
+    - Linear conflict:
+        When two tiles are in their goal row (column), but in the reversed
+        order, one of them has to leave the row and come back - two moves
+        more than the Manhattan distance counts. The numbers of the tiles to
+        be removed from a line are precomputed for all the possible lines.
+
+    - Walking distance:
+        Numbers of the moves needed to bring all the tiles to their goal
+        rows (and columns) when only counting how many tiles of each goal
+        row are in each row. These distances are found by a breadth-first
+        search over all such configurations once and cached in a file.
+
+Most importantly, it declares the following:
+
+    - LinearConflictHeuristic:
+        Manhattan distance with the linear conflicts.
+
+    - WalkingDistanceHeuristic:
+        Walking distance of the rows and the columns.
+
+    - WalkingDistanceTable:
+        Distances of all the configurations of the tile counts.
+
+    - BoardHeuristic:
+        Base of the heuristics evaluating each board just once.
+
+    - heuristics, find_heuristic:
+        Functions providing the heuristics by their names.
+"""
+
+import os
+import struct
+from abc import abstractmethod
+from array import array
+from collections import deque
+from functools import lru_cache
+from itertools import product
+from typing import Union
+
+from src.fw.heuristic import Heuristic, DistanceHeuristic
+from .puzzle_definition import Grid, Field
+from .puzzle_state_space import GridState
+
+
+class BoardHeuristic(Heuristic):
+    """Heuristic remembering the estimates of the boards for the last goal,
+    so each board is evaluated only once (the informed algorithms estimate
+    the states of the fringe repeatedly)."""
+
+    def __init__(self):
+        self.__goal: Union[Grid, None] = None
+        self.__estimates: dict[Union[int, bytes], int] = {}
+
+    def estimate(self, state: GridState, goal_state: GridState) -> float:
+        if goal_state.grid != self.__goal:
+            self.__goal = goal_state.grid
+            self.__estimates = {}
+
+        board = state.grid.board
+        estimate = self.__estimates.get(board)
+
+        if estimate is None:
+            estimate = self.__estimates[board] = self._evaluate(
+                state, goal_state)
+
+        return estimate
+
+    @abstractmethod
+    def _evaluate(self, state: GridState, goal_state: GridState) -> int:
+        """Calculates the estimate of the given state."""
+
+
+class LinearConflictHeuristic(BoardHeuristic):
+    """Manhattan distance of the tiles (the empty field not counted) with two
+    more moves for each tile that has to leave its goal row or column to let
+    another tile of the line pass.
+
+    The Manhattan distance is taken from the state (updated with each move),
+    the conflicts are looked up for each row and column from a table of all
+    the possible lines.
+    """
+
+    def _evaluate(self, state: GridState, goal_state: GridState) -> int:
+        goal = goal_state.grid
+        grid = state.grid
+        base = goal.base_size
+
+        # Manhattan distance of the tiles only
+        distance = state.distance_from(goal_state)
+        empty_y, empty_x = divmod(grid.empty_index, base)
+        goal_y, goal_x = divmod(goal.empty_index, base)
+        distance -= abs(empty_x - goal_x) + abs(empty_y - goal_y)
+
+        conflicts = _line_conflicts(base)
+        row_digits, column_digits = _line_digits(goal)
+        tiles = grid.tiles
+
+        for line in range(base):
+            row = tiles[line * base:(line + 1) * base]
+            column = tiles[line::base]
+
+            distance += 2 * conflicts[sum([
+                row_digits[line][position][tile]
+                for position, tile in enumerate(row)
+            ])]
+            distance += 2 * conflicts[sum([
+                column_digits[line][position][tile]
+                for position, tile in enumerate(column)
+            ])]
+
+        return distance
+
+
+class WalkingDistanceTable:
+    """Distances of all the configurations of the tile counts of a board of
+    the given base size from the goal one.
+
+    A configuration is a matrix of the numbers of the tiles in each row
+    (first index) having their goal in each row (second index), and the row
+    of the empty field. A move of the empty field into a neighbouring row
+    moves a single tile of that row the other way. In the goal one, all the
+    tiles are in their goal rows and the empty field is in the given row.
+
+    The same table serves the columns (by the symmetry of the board).
+    """
+
+    # Header of the file: magic, version, base size, goal line, count
+    _FILE_HEADER = struct.Struct("<4sHBBI")
+    _FILE_MAGIC = b"SSWD"
+    _FILE_VERSION = 1
+
+    # Bits of a single count in the encoded configuration
+    COUNT_BITS = 3
+
+    def __init__(
+            self,
+            base_size: int,
+            goal_line: int,
+            distances: Union[dict[int, int], None] = None
+    ):
+        if not 2 <= base_size <= 4:
+            raise ValueError(
+                f"Walking distance is available up to 4x4: {base_size = }")
+
+        self.__base_size = base_size
+        self.__goal_line = goal_line
+        self.__distances = (
+            distances if distances is not None else self._search())
+
+    @classmethod
+    def of(
+            cls,
+            base_size: int,
+            goal_line: int,
+            cache_dir: Union[str, None] = None
+    ) -> "WalkingDistanceTable":
+        """Returns the table for the given base size and the line of the
+        empty field at the goal. The table is computed once - it's kept in
+        the memory and, when the directory is given, in a file in it."""
+        key = base_size, goal_line, cache_dir
+
+        if key not in _TABLES:
+            path = cls.cache_path(base_size, goal_line, cache_dir)
+
+            if path and os.path.exists(path):
+                table = cls.load(path)
+            else:
+                table = cls(base_size, goal_line)
+
+                if path:
+                    table.save(path)
+
+            _TABLES[key] = table
+
+        return _TABLES[key]
+
+    @staticmethod
+    def cache_path(
+            base_size: int,
+            goal_line: int,
+            cache_dir: Union[str, None]
+    ) -> Union[str, None]:
+        """Path of the cache file of the table in the given directory. When
+        there's no directory, None."""
+        if cache_dir is None:
+            return None
+        return os.path.join(
+            cache_dir, f"walking_distance_{base_size}_{goal_line}.wd")
+
+    @classmethod
+    def load(cls, path: str) -> "WalkingDistanceTable":
+        """Loads the table from the file created by `save`."""
+        header = cls._FILE_HEADER
+
+        with open(path, "rb") as file:
+            magic, version, base_size, goal_line, count = header.unpack(
+                file.read(header.size))
+
+            if magic != cls._FILE_MAGIC or version != cls._FILE_VERSION:
+                raise ValueError(f"Not a walking distance file (version "
+                                 f"{cls._FILE_VERSION}): {path}")
+
+            configurations = array("Q")
+            configurations.fromfile(file, count)
+            distances = array("B")
+            distances.fromfile(file, count)
+
+        return cls(base_size, goal_line,
+                   dict(zip(configurations, distances)))
+
+    def save(self, path: str):
+        """Saves the table into a binary file (a header followed by all the
+        encoded configurations and their distances)."""
+        with open(path, "wb") as file:
+            file.write(self._FILE_HEADER.pack(
+                self._FILE_MAGIC, self._FILE_VERSION, self.__base_size,
+                self.__goal_line, len(self.__distances)))
+            array("Q", self.__distances.keys()).tofile(file)
+            array("B", self.__distances.values()).tofile(file)
+
+    @property
+    def base_size(self) -> int:
+        return self.__base_size
+
+    @property
+    def goal_line(self) -> int:
+        """Line of the empty field at the goal."""
+        return self.__goal_line
+
+    def __len__(self) -> int:
+        return len(self.__distances)
+
+    def distance(self, configuration: int) -> int:
+        """Distance of the given encoded configuration from the goal one.
+
+        The configuration is encoded as an integer - the count of the tiles
+        in the row `r` with the goal row `g` is at the bits starting at
+        `COUNT_BITS * (r * base_size + g + 1)`, the row of the empty field
+        is at the lowest bits.
+        """
+        return self.__distances[configuration]
+
+    def _search(self) -> dict[int, int]:
+        """Breadth-first search over all the configurations from the goal
+        one."""
+        base = self.__base_size
+        bits = self.COUNT_BITS
+        mask = (1 << bits) - 1
+
+        def count_shift(row: int, goal_row: int) -> int:
+            """Position of the count in the encoded configuration."""
+            return bits * (row * base + goal_row + 1)
+
+        goal = self.__goal_line
+        for line in range(base):
+            goal += (base - (line == self.__goal_line)) << count_shift(
+                line, line)
+
+        distances = {goal: 0}
+        queue = deque([goal])
+
+        while queue:
+            configuration = queue.popleft()
+            distance = distances[configuration] + 1
+            empty = configuration & mask
+
+            for neighbour in (empty - 1, empty + 1):
+                if not 0 <= neighbour < base:
+                    continue
+
+                for goal_row in range(base):
+                    shift = count_shift(neighbour, goal_row)
+
+                    if not (configuration >> shift) & mask:
+                        continue
+
+                    # The tile moves from the neighbouring row to the empty
+                    moved = (
+                        configuration - (1 << shift)
+                        + (1 << count_shift(empty, goal_row))
+                        - empty + neighbour
+                    )
+
+                    if moved not in distances:
+                        distances[moved] = distance
+                        queue.append(moved)
+
+        return distances
+
+
+class WalkingDistanceHeuristic(BoardHeuristic):
+    """Sum of the walking distances of the rows and the columns (available
+    for the boards up to 4x4).
+
+    :param cache_dir: Directory the tables are cached in (when None, they
+                      are kept in the memory only)
+    """
+
+    def __init__(self, cache_dir: Union[str, None] = None):
+        super().__init__()
+        self.__cache_dir = cache_dir
+
+    @property
+    def cache_dir(self) -> Union[str, None]:
+        return self.__cache_dir
+
+    def _evaluate(self, state: GridState, goal_state: GridState) -> int:
+        goal = goal_state.grid
+        base = goal.base_size
+        goal_y, goal_x = divmod(goal.empty_index, base)
+        empty_y, empty_x = divmod(state.grid.empty_index, base)
+
+        rows = WalkingDistanceTable.of(base, goal_y, self.__cache_dir)
+        columns = WalkingDistanceTable.of(base, goal_x, self.__cache_dir)
+        row_counts, column_counts = _count_shifts(goal)
+
+        row_configuration, column_configuration = empty_y, empty_x
+
+        for index, tile in enumerate(state.grid.tiles):
+            row_configuration += row_counts[index][tile]
+            column_configuration += column_counts[index][tile]
+
+        return (
+            rows.distance(row_configuration) +
+            columns.distance(column_configuration)
+        )
+
+
+def heuristics(
+        cache_dir: Union[str, None] = None
+) -> dict[str, Heuristic]:
+    """Returns all the heuristics of the sliding puzzles by their names.
+
+    :param cache_dir: Directory the precomputed tables are cached in
+    """
+    return {
+        "MANHATTAN": DistanceHeuristic(),
+        "LINEAR_CONFLICT": LinearConflictHeuristic(),
+        "WALKING_DISTANCE": WalkingDistanceHeuristic(cache_dir),
+    }
+
+
+def find_heuristic(
+        heuristic: Union[Heuristic, str],
+        cache_dir: Union[str, None] = None
+) -> Heuristic:
+    """Tries to find a heuristic. The input can be either a string (name of
+    the heuristic; case-insensitive) or the heuristic itself. When there is
+    no such heuristic, it raises an error."""
+    if isinstance(heuristic, Heuristic):
+        return heuristic
+
+    if heuristic.upper() == "PATTERN_DATABASE":
+        # NumPy is needed only for this heuristic
+        from .puzzle_pattern_database import PatternDatabaseHeuristic
+        return PatternDatabaseHeuristic(cache_dir=cache_dir)
+
+    if heuristic.upper() == "DISTANCE_TABLE":
+        # NumPy is needed only for this heuristic
+        from .puzzle_distance_table import DistanceTableHeuristic
+        return DistanceTableHeuristic(cache_dir=cache_dir)
+
+    found = heuristics(cache_dir).get(heuristic.upper())
+
+    if found is None:
+        raise ValueError(f"No heuristic '{heuristic}' found")
+
+    return found
+
+
+# Walking distance tables by the base size, goal line and cache directory
+_TABLES: dict[tuple[int, int, Union[str, None]], WalkingDistanceTable] = {}
+
+
+@lru_cache
+def _line_conflicts(base_size: int) -> tuple[int]:
+    """For each line encoded as the digits of the tiles (0 for the tiles
+    with the goal in another line, otherwise their goal position in the
+    line plus one; the first tile is the lowest digit of the base of
+    `base_size + 1`), the number of the tiles to be removed from the line
+    so the others are in their goal order."""
+    conflicts = []
+
+    for digits in product(range(base_size + 1), repeat=base_size):
+        # Digits are generated from the highest one
+        positions = [digit for digit in reversed(digits) if digit]
+        conflicts.append(len(positions) - _longest_increasing(positions))
+
+    return tuple(conflicts)
+
+
+@lru_cache
+def _line_digits(
+        goal: Grid
+) -> tuple[tuple[tuple[tuple[int]]], tuple[tuple[tuple[int]]]]:
+    """For each row (column) of the given goal grid, for each position in
+    the line, for each tile, the value of its digit in the encoded line."""
+    base = goal.base_size
+    tiles = len(Field.available_values())
+    rows = [[[0] * tiles for _ in range(base)] for _ in range(base)]
+    columns = [[[0] * tiles for _ in range(base)] for _ in range(base)]
+
+    for index, tile in enumerate(goal.tiles):
+        if index == goal.empty_index:
+            continue
+
+        goal_y, goal_x = divmod(index, base)
+
+        for position in range(base):
+            weight = (base + 1) ** position
+            rows[goal_y][position][tile] = (goal_x + 1) * weight
+            columns[goal_x][position][tile] = (goal_y + 1) * weight
+
+    return _freeze(rows), _freeze(columns)
+
+
+@lru_cache
+def _count_shifts(goal: Grid) -> tuple[tuple[tuple[int]], ...]:
+    """For each field index, for each tile, the value added to the encoded
+    walking distance configuration of the rows (columns) by the tile being
+    at the field."""
+    base = goal.base_size
+    bits = WalkingDistanceTable.COUNT_BITS
+    tiles = len(Field.available_values())
+    rows = [[0] * tiles for _ in range(base ** 2)]
+    columns = [[0] * tiles for _ in range(base ** 2)]
+
+    for goal_index, tile in enumerate(goal.tiles):
+        if goal_index == goal.empty_index:
+            continue
+
+        goal_y, goal_x = divmod(goal_index, base)
+
+        for index in range(base ** 2):
+            y, x = divmod(index, base)
+            rows[index][tile] = 1 << bits * (y * base + goal_y + 1)
+            columns[index][tile] = 1 << bits * (x * base + goal_x + 1)
+
+    return _freeze(rows), _freeze(columns)
+
+
+def _freeze(nested: list) -> tuple:
+    """Converts the nested lists into the nested tuples."""
+    if isinstance(nested, list):
+        return tuple([_freeze(item) for item in nested])
+    return nested
+
+
+def _longest_increasing(values: list[int]) -> int:
+    """Length of the longest increasing subsequence of the given values."""
+    lengths = []
+
+    for index, value in enumerate(values):
+        lengths.append(1 + max(
+            [lengths[i] for i in range(index) if values[i] < value],
+            default=0
+        ))
+
+    return max(lengths, default=0)
@@ -0,0 +1,474 @@
+"""This module contains the additive disjoint pattern databases - the
+heuristic making the 15-Puzzle (and with enough memory even the 24-Puzzle)
+solvable optimally.
+
+The tiles are divided into disjoint patterns. For each pattern, a database
+holds the minimal number of moves of the pattern tiles needed to bring them
+from any positions to their goal ones (the other tiles are not told apart,
+their moves are free). Since no move is counted in two databases, the sum
+of the distances of all the patterns is still a lower bound.
+
+Each database is found by a single breadth-first search from the goal over
+all the positions of its tiles and the empty field (vectorized using NumPy;
+the free moves are expanded first within each layer). The distances are
+stored as a compact `uint8` array indexed by the rank of the positions of
+the pattern tiles. The databases are saved into files and memory-mapped
+when loaded, so they are built just once.
+
+When the empty field is at the main diagonal at the goal, the board can be
+reflected by this diagonal (with the tiles relabeled so the goal maps onto
+itself). The reflected board is as far from the goal as the original one,
+so the maximum of the both sums is used.
+
+Most importantly, it declares the following:
+
+    - PatternDatabase:
+        Distances of all the positions of a single pattern.
+
+    - PatternDatabaseHeuristic:
+        Heuristic summing up the distances of the disjoint patterns.
+
+    - default_partition:
+        Function dividing the tiles of the common boards into patterns.
+
+This module requires NumPy.
+"""
+
+import os
+import struct
+from typing import Iterable, Union
+
+import numpy as np
+
+from .puzzle_definition import Grid, Field
+from .puzzle_heuristics import BoardHeuristic
+from .puzzle_state_space import GridState
+
+
+# Distance of the positions not searched yet
+_UNKNOWN = 255
+
+# Number of the states expanded at once while building the database
+_CHUNK_SIZE = 1 << 21
+
+
+class PatternDatabase:
+    """Distances of all the positions of the given pattern tiles from their
+    positions at the goal grid (counting the moves of the pattern tiles
+    only).
+
+    The positions of the tiles (field indexes in the order of the pattern)
+    are ranked as a partial permutation - the rank of the positions
+    `p_0, ..., p_{k-1}` of `k` tiles on `n` fields is the sum of
+    `c_i * (n-1-i)! / (n-k)!`, where `c_i` is the number of the fields not
+    taken by the previous tiles lower than `p_i`.
+    """
+
+    # Header of the file: magic, version, base size, number of the pattern
+    # tiles (followed by the pattern tiles and the tiles of the goal grid)
+    _FILE_HEADER = struct.Struct("<4sHBB")
+    _FILE_MAGIC = b"SSPD"
+    _FILE_VERSION = 1
+
+    def __init__(
+            self,
+            goal: Grid,
+            tiles: Iterable[int],
+            distances: Union[np.ndarray, None] = None
+    ):
+        self.__goal = goal
+        self.__tiles = tuple(tiles)
+
+        n, k = goal.base_size ** 2, len(self.__tiles)
+
+        empty_tile = goal.tile(goal.empty_index)
+
+        if not set(self.__tiles) <= set(goal.tiles) - {empty_tile}:
+            raise ValueError(
+                f"Pattern tiles {self.__tiles} are not the tiles of the goal")
+
+        # Multipliers of the digits of the ranks
+        self.__weights = tuple([
+            _permutations(n - 1 - i, k - 1 - i) for i in range(k)
+        ])
+
+        if distances is None:
+            distances = self._search()
+        elif distances.shape != (_permutations(n, k),):
+            raise ValueError(
+                f"Distances of shape {distances.shape} don't fit the "
+                f"pattern of {k} tiles on {n} fields")
+
+        self.__distances = distances
+
+    @classmethod
+    def of(
+            cls,
+            goal: Grid,
+            tiles: Iterable[int],
+            cache_dir: Union[str, None] = None
+    ) -> "PatternDatabase":
+        """Returns the database of the given pattern. When the directory is
+        given, the database is loaded from the file in it (when it exists)
+        or saved there after it's built."""
+        tiles = tuple(tiles)
+        path = cls.cache_path(goal, tiles, cache_dir)
+
+        if path and os.path.exists(path):
+            return cls.load(path, goal)
+
+        database = cls(goal, tiles)
+
+        if path:
+            database.save(path)
+
+        return database
+
+    @staticmethod
+    def cache_path(
+            goal: Grid,
+            tiles: Iterable[int],
+            cache_dir: Union[str, None]
+    ) -> Union[str, None]:
+        """Path of the cache file of the database in the given directory.
+        When there's no directory, None."""
+        if cache_dir is None:
+            return None
+
+        values = Field.available_values()
+        pattern = "".join([values[tile] for tile in tiles])
+        return os.path.join(
+            cache_dir, f"pattern_{''.join(goal.values)}_{pattern}.pdb")
+
+    @classmethod
+    def load(cls, path: str, goal: Grid, mmap: bool = True
+             ) -> "PatternDatabase":
+        """Loads the database of the given goal from the file created by
+        `save`. By default, the distances are memory-mapped (read-only)."""
+        header = cls._FILE_HEADER
+
+        with open(path, "rb") as file:
+            magic, version, base_size, k = header.unpack(
+                file.read(header.size))
+
+            if magic != cls._FILE_MAGIC or version != cls._FILE_VERSION:
+                raise ValueError(f"Not a pattern database file (version "
+                                 f"{cls._FILE_VERSION}): {path}")
+
+            tiles = tuple(file.read(k))
+            goal_tiles = tuple(file.read(base_size ** 2))
+
+            if goal_tiles != goal.tiles:
+                raise ValueError(
+                    f"Pattern database was built for another goal: {path}")
+
+            offset = file.tell()
+
+            if not mmap:
+                distances = np.fromfile(file, dtype=np.uint8)
+
+        if mmap:
+            distances = np.memmap(
+                path, dtype=np.uint8, mode="r", offset=offset)
+
+        return cls(goal, tiles, distances)
+
+    def save(self, path: str):
+        """Saves the database into a binary file (a header followed by the
+        distances, a byte for each)."""
+        with open(path, "wb") as file:
+            file.write(self._FILE_HEADER.pack(
+                self._FILE_MAGIC, self._FILE_VERSION, self.__goal.base_size,
+                len(self.__tiles)))
+            file.write(bytes(self.__tiles))
+            file.write(bytes(self.__goal.tiles))
+            file.write(np.ascontiguousarray(self.__distances).tobytes())
+
+    @property
+    def goal(self) -> Grid:
+        return self.__goal
+
+    @property
+    def tiles(self) -> tuple[int]:
+        """Tiles of the pattern."""
+        return self.__tiles
+
+    @property
+    def distances(self) -> np.ndarray:
+        """Distances of all the positions of the pattern by their ranks."""
+        return self.__distances
+
+    def rank(self, positions: Iterable[int]) -> int:
+        """Rank of the given positions of the pattern tiles."""
+        rank, previous = 0, []
+
+        for weight, position in zip(self.__weights, positions):
+            digit = position - sum([1 for p in previous if p < position])
+            rank += digit * weight
+            previous.append(position)
+
+        return rank
+
+    def distance(self, positions: Iterable[int]) -> int:
+        """Distance of the given positions of the pattern tiles (the field
+        indexes in the order of the pattern)."""
+        return int(self.__distances[self.rank(positions)])
+
+    def _ranks(self, positions: np.ndarray) -> np.ndarray:
+        """Ranks of all the rows of positions (vectorized `rank`)."""
+        ranks = np.zeros(len(positions), dtype=np.int64)
+
+        for i, weight in enumerate(self.__weights):
+            lower = (positions[:, :i] < positions[:, i:i + 1]).sum(axis=1)
+            ranks += (positions[:, i].astype(np.int64) - lower) * weight
+
+        return ranks
+
+    def _search(self) -> np.ndarray:
+        """Breadth-first search from the goal over all the positions of the
+        pattern tiles and the empty field. The moves of the empty field to
+        the fields of the other tiles are free, so each layer is completed
+        by them before the pattern tiles are moved."""
+        goal = self.__goal
+        n = goal.base_size ** 2
+        size = _permutations(n, len(self.__tiles))
+        neighbours = _neighbour_array(goal.base_size)
+
+        # Distances of the states - the ranks of the positions of the tiles
+        # combined with the position of the empty field
+        distances = np.full(size * n, _UNKNOWN, dtype=np.uint8)
+
+        goal_positions = goal.positions
+        positions = np.array(
+            [[goal_positions[tile] for tile in self.__tiles]], dtype=np.int8)
+        empty = np.array([goal.empty_index], dtype=np.int8)
+        states = self._ranks(positions) * n + empty
+        distances[states] = 0
+
+        distance = 0
+
+        while states.size:
+            moved = []
+
+            # Free moves (within the current layer)
+            while states.size:
+                free, paid = self._expand(positions, empty, neighbours)
+                moved.append(paid)
+                states, positions, empty = self._unseen(distances, *free)
+                distances[states] = distance
+
+            if distance + 1 == _UNKNOWN:
+                raise ValueError("Distances don't fit the database")
+
+            # Moves of the pattern tiles (into the next layer)
+            states, positions, empty = self._unseen(distances, *[
+                np.concatenate(parts) for parts in zip(*moved)])
+            distance += 1
+            distances[states] = distance
+
+        return distances.reshape(size, n).min(axis=1)
+
+    def _expand(
+            self,
+            positions: np.ndarray,
+            empty: np.ndarray,
+            neighbours: np.ndarray
+    ) -> tuple[tuple[np.ndarray, ...], tuple[np.ndarray, ...]]:
+        """Moves the empty field of all the given states to all its
+        neighbours. Returns the states (combined ranks, positions of the
+        tiles and of the empty field) reached by the free moves and those
+        reached by the moves of the pattern tiles."""
+        n = len(neighbours)
+        free_parts, paid_parts = [], []
+
+        for start in range(0, len(empty), _CHUNK_SIZE):
+            chunk_positions = positions[start:start + _CHUNK_SIZE]
+            chunk_empty = empty[start:start + _CHUNK_SIZE]
+            ranks = self._ranks(chunk_positions)
+
+            for direction in range(neighbours.shape[1]):
+                target = neighbours[chunk_empty, direction]
+                valid = target >= 0
+                occupied = chunk_positions == target[:, None]
+                hits = occupied.any(axis=1)
+
+                free = valid & ~hits
+                free_parts.append((
+                    ranks[free] * n + target[free],
+                    chunk_positions[free],
+                    target[free]
+                ))
+
+                # The pattern tile moves to the field of the empty one
+                paid = valid & hits
+                paid_positions = np.where(
+                    occupied[paid], chunk_empty[paid, None],
+                    chunk_positions[paid])
+                paid_parts.append((
+                    self._ranks(paid_positions) * n + target[paid],
+                    paid_positions,
+                    target[paid]
+                ))
+
+        return (
+            tuple([np.concatenate(parts) for parts in zip(*free_parts)]),
+            tuple([np.concatenate(parts) for parts in zip(*paid_parts)])
+        )
+
+    @staticmethod
+    def _unseen(
+            distances: np.ndarray,
+            states: np.ndarray,
+            positions: np.ndarray,
+            empty: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Removes the duplicates and the already reached states."""
+        states, first = np.unique(states, return_index=True)
+        unseen = distances[states] == _UNKNOWN
+        first = first[unseen]
+        return states[unseen], positions[first], empty[first]
+
+
+class PatternDatabaseHeuristic(BoardHeuristic):
+    """Sum of the distances of the disjoint patterns (maximized with the
+    sum of the reflected board, when possible).
+
+    The databases are built (or loaded from the cache directory) for each
+    goal the first time they are needed.
+
+    :param partition: Disjoint patterns as the field indexes of their tiles
+                      at the goal grid (by default, `default_partition`)
+    :param cache_dir: Directory the databases are cached in
+    :param reflect: Flag if the reflected boards should be looked up too
+    """
+
+    def __init__(
+            self,
+            partition: Union[Iterable[Iterable[int]], None] = None,
+            cache_dir: Union[str, None] = None,
+            reflect: bool = True
+    ):
+        super().__init__()
+        self.__partition = (
+            None if partition is None else
+            tuple([tuple(pattern) for pattern in partition]))
+        self.__cache_dir = cache_dir
+        self.__reflect = reflect
+        self.__databases: dict[Grid, tuple[PatternDatabase]] = {}
+
+    @property
+    def cache_dir(self) -> Union[str, None]:
+        return self.__cache_dir
+
+    def databases(self, goal: Grid) -> tuple[PatternDatabase]:
+        """Databases of all the patterns of the given goal grid."""
+        if goal not in self.__databases:
+            partition = self.__partition or default_partition(
+                goal.base_size)
+
+            if sorted(sum(partition, ())) != sorted(
+                    set(range(goal.base_size ** 2)) - {goal.empty_index}):
+                raise ValueError(
+                    f"Patterns {partition} don't divide all the tiles")
+
+            self.__databases[goal] = tuple([
+                PatternDatabase.of(
+                    goal, [goal.tile(index) for index in pattern],
+                    self.__cache_dir)
+                for pattern in partition
+            ])
+
+        return self.__databases[goal]
+
+    def _evaluate(self, state: GridState, goal_state: GridState) -> int:
+        goal = goal_state.grid
+        positions = state.grid.positions
+        estimate = self._sum(goal, positions)
+
+        if self.__reflect:
+            reflection = _reflection(goal)
+
+            if reflection is not None:
+                fields, sources = reflection
+                reflected = [
+                    fields[positions[source]] if source >= 0 else -1
+                    for source in sources
+                ]
+                estimate = max(estimate, self._sum(goal, reflected))
+
+        return estimate
+
+    def _sum(self, goal: Grid, positions: Iterable[int]) -> int:
+        """Sum of the distances of all the patterns for the given positions
+        of the tiles."""
+        return sum([
+            database.distance([positions[tile] for tile in database.tiles])
+            for database in self.databases(goal)
+        ])
+
+
+def default_partition(base_size: int) -> tuple[tuple[int]]:
+    """Division of the tiles of the board of the given base size into the
+    patterns (as the field indexes of the tiles at the goal grid) - 4-4 for
+    the 3x3 board, 6-6-3 for the 4x4 one and 6-6-6-6 for the 5x5 one. It
+    expects the empty field of the goal at the same field as the default
+    grids have."""
+    if base_size == 3:
+        return (0, 1, 2, 3), (5, 6, 7, 8)
+
+    if base_size == 4:
+        return (4, 5, 8, 9, 12, 13), (6, 7, 10, 11, 14, 15), (1, 2, 3)
+
+    if base_size == 5:
+        return (
+            (0, 1, 2, 5, 6, 7), (3, 4, 8, 9, 13, 14),
+            (17, 18, 19, 22, 23, 24), (10, 11, 15, 16, 20, 21)
+        )
+
+    raise ValueError(f"No default partition for {base_size = }")
+
+
+def _permutations(n: int, k: int) -> int:
+    """Number of the ordered selections of k of the n items."""
+    count = 1
+
+    for i in range(n - k + 1, n + 1):
+        count *= i
+
+    return count
+
+
+def _neighbour_array(base_size: int) -> np.ndarray:
+    """Indexes of the neighbours of all the fields (-1 where there's none) in
+    the order of the directions of the moves."""
+    neighbours = np.full((base_size ** 2, 4), -1, dtype=np.int8)
+
+    for index in range(base_size ** 2):
+        y, x = divmod(index, base_size)
+
+        for direction, (dx, dy) in enumerate(((1, 0), (0, 1), (-1, 0),
+                                              (0, -1))):
+            if 0 <= x + dx < base_size and 0 <= y + dy < base_size:
+                neighbours[index, direction] = (y + dy) * base_size + x + dx
+
+    return neighbours
+
+
+def _reflection(goal: Grid) -> Union[tuple[list[int], list[int]], None]:
+    """Reflection of the boards by the main diagonal for the given goal -
+    the reflected field index for each field index and for each tile the
+    tile it's relabeled from (-1 for the tiles not on the board). When the
+    empty field of the goal is not at the diagonal, None."""
+    base = goal.base_size
+    fields = [(index % base) * base + index // base
+              for index in range(base ** 2)]
+
+    if fields[goal.empty_index] != goal.empty_index:
+        return None
+
+    sources = [-1] * len(Field.available_values())
+    for index, tile in enumerate(goal.tiles):
+        # Tile at the reflected field comes from the tile of this one
+        sources[goal.tile(fields[index])] = tile
+
+    return fields, sources
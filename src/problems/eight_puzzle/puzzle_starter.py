@@ -3,9 +3,11 @@ from typing import Union, Iterable
 
 from src.fw import Algorithm, algorithms, StateSpace
 from src.fw.algorithms.base import NoSolutionFound
+from src.fw.heuristic import Heuristic
 from src.problems.eight_puzzle.puzzle_definition import Grid, Move
 from src.problems.eight_puzzle.puzzle_generator import generate, \
-    GeneratorVariant
+    GeneratorVariant, hardness
+from src.problems.eight_puzzle.puzzle_heuristics import find_heuristic
 from src.problems.eight_puzzle.puzzle_state_space import GridState, \
     GridOperator
 
@@ -14,8 +16,33 @@ def start_8_puzzle(
         steps: int,
         easy: bool = True,
         base_size: int = 3,
-        algos: Union[Iterable[Algorithm], Iterable[str]] = algorithms()
+        algos: Union[Iterable[Algorithm], Iterable[str]] = algorithms(),
+        heuristics: Iterable[Union[Heuristic, str]] = ("MANHATTAN",),
+        cache_dir: Union[str, None] = None,
+        exact: bool = False,
+        solvable_only: bool = False
 ):
+    """Generates a puzzle and tries to solve it by all the given algorithms
+    with all the given heuristics. At the end, it prints the comparison of
+    the numbers of the expanded states.
+
+    :param heuristics:
+        Heuristics (or their names - `MANHATTAN`, `LINEAR_CONFLICT`,
+        `WALKING_DISTANCE`, `PATTERN_DATABASE`, `DISTANCE_TABLE`) used by
+        the informed algorithms.
+
+    :param cache_dir:
+        Directory the precomputed tables of the heuristics are cached in.
+
+    :param exact:
+        Flag if the generated puzzle should need exactly the given number of
+        steps (for the grids up to 3x3; requires NumPy).
+
+    :param solvable_only:
+        Flag if the fully randomized puzzles should always be solvable.
+    """
+    heuristics = [find_heuristic(h, cache_dir) for h in heuristics]
+    results = []
 
     # Get the organized grid
     organized = Grid.default_grid_values(base_size)
@@ -24,7 +51,10 @@ def start_8_puzzle(
     initial_grid, goal_grid = generate(
         variant=GeneratorVariant.find(base_size, easy),
         organized=Grid.of(organized, base_size),
-        random_steps=steps
+        random_steps=steps,
+        exact=exact,
+        cache_dir=cache_dir,
+        solvable_only=solvable_only
     )
 
     # Create the states of them
@@ -38,27 +68,46 @@ def start_8_puzzle(
     print(initial_state.stringify())
     print()
     print(goal_state.stringify())
+    print(hardness(initial_grid, goal_grid))
 
     for algo in algos:
-        print("\n")
-        print(100 * "=")
-
-        ss = StateSpace(
-            initial_state=initial_state,
-            goal_state=goal_state,
-            operators=operators,
-            algorithm=algo
-        )
-
-        print(f"Trying algorithm: '{algo}'")
-
-        try:
-            start = time()
-            solution = ss.solve()
-            end = time()
-            applied_operators = solution.all_applied_operators()
-            print(f"{len(applied_operators)}: {applied_operators}")
-            print(f"Solution found in {end - start} seconds")
-
-        except NoSolutionFound as err:
-            print(err.message)
+        for heuristic in heuristics:
+            print("\n")
+            print(100 * "=")
+
+            ss = StateSpace(
+                initial_state=initial_state,
+                goal_state=goal_state,
+                operators=operators,
+                algorithm=algo,
+                heuristic=heuristic
+            )
+
+            heuristic_name = type(heuristic).__name__
+            print(f"Trying algorithm: '{algo}' ({heuristic_name})")
+
+            try:
+                start = time()
+                solution = ss.solve()
+                end = time()
+                applied_operators = solution.all_applied_operators()
+                print(f"{len(applied_operators)}: {applied_operators}")
+                print(f"Solution found in {end - start} seconds")
+                print(f"Statistics: {ss.statistics}")
+
+                results.append((
+                    str(algo), heuristic_name, len(applied_operators),
+                    ss.statistics.expanded, end - start
+                ))
+
+            except NoSolutionFound as err:
+                print(err.message)
+
+    # Compare the work done with the different heuristics
+    print("\n")
+    print(f"{'Algorithm':<16} {'Heuristic':<28} {'Length':>7} "
+          f"{'Expanded':>10} {'Seconds':>9}")
+
+    for algo, heuristic_name, length, expanded, seconds in results:
+        print(f"{algo:<16} {heuristic_name:<28} {length:>7} "
+              f"{expanded:>10} {seconds:>9.3f}")
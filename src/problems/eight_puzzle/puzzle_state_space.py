@@ -1,30 +1,80 @@
-from typing import Union
+from typing import Iterable, Sequence, Union
 
 from src.fw import State, Operator
-from .puzzle_definition import Grid, Move
+from src.fw.ranking import (
+    Ranking, lehmer_rank, lehmer_unrank, myrvold_ruskey_rank,
+    myrvold_ruskey_unrank, permutation_size
+)
+from .puzzle_definition import Grid, Move, ManhattanTable
 
 
 class GridState(State):
-    """State represented as a current Grid with fields positioned."""
+    """State represented as a current Grid with fields positioned.
+
+    It remembers its Manhattan distance from the last goal it was measured
+    from (together with the table of the goal), so the children created by
+    the `GridOperator` get their distances updated in a constant time.
+    """
 
     def __init__(
             self,
             grid: Grid,
             parent: Union["GridState", None] = None,
-            applied_operator: Union["GridOperator", None] = None
+            applied_operator: Union["GridOperator", None] = None,
+            manhattan: Union[tuple[ManhattanTable, int], None] = None
     ):
         super().__init__(parent, applied_operator)
         self.__grid = grid
+        self.__manhattan = manhattan
 
     @property
     def grid(self) -> Grid:
         """The actual grid"""
         return self.__grid
 
+    @property
+    def manhattan(self) -> Union[tuple[ManhattanTable, int], None]:
+        """The table of the last goal the state was measured from together
+        with the distance (when already known)."""
+        return self.__manhattan
+
     def distance_from(self, state: "GridState") -> float:
         """Calculates the distance between misplaced fields using manhattan
         distance."""
-        return self.grid.manhattan_distance(state.grid)
+        table = ManhattanTable.of(state.grid)
+
+        if self.__manhattan is None or self.__manhattan[0] is not table:
+            self.__manhattan = table, table.distance(self.grid)
+
+        return self.__manhattan[1]
+
+    @classmethod
+    def distance_from_many(
+            cls,
+            states: Sequence["GridState"],
+            state: "GridState"
+    ) -> Sequence[float]:
+        """Calculates the Manhattan distances of all the given states at once
+        - vectorized over the matrix of their tiles (see `puzzle_batch`).
+        Without NumPy, the states are measured one by one."""
+        try:
+            # NumPy is needed only for the batched distances
+            from .puzzle_batch import manhattan_many
+        except ImportError:
+            return super().distance_from_many(states, state)
+
+        return manhattan_many([s.grid for s in states], state.grid)
+
+    def can_reach(self, goal_state: "GridState") -> bool:
+        """Only the grids of the same parity can be reached (see
+        `Grid.can_reach`)."""
+        return self.grid.can_reach(goal_state.grid)
+
+    def __eq__(self, other: "GridState") -> bool:
+        return isinstance(other, GridState) and self.grid == other.grid
+
+    def __hash__(self) -> int:
+        return hash(self.grid)
 
     def stringify(self) -> str:
         """Tries to stringify the grid"""
@@ -49,16 +99,90 @@ class GridOperator(Operator):
         """Direction it can move to."""
         return self.__direction
 
+    @property
+    def inverse(self) -> "GridOperator":
+        """Move in the opposite direction."""
+        return GridOperator(self.direction.opposite)
+
     def can_be_applied(self, state: GridState) -> bool:
-        possibles = state.grid.possible_movements(include_directions=True)
-        directions = [possible[0] for possible in possibles]
-        return self.direction in directions
+        return state.grid.can_move(self.direction)
 
     def apply(self, state: GridState) -> GridState:
         new_grid = state.grid.move(self.direction)
+        manhattan = state.manhattan
+
+        # Update the distance by the moved tile only
+        if manhattan is not None:
+            table, distance = manhattan
+            manhattan = table, table.moved(distance, state.grid, new_grid)
 
         return GridState(
             grid=new_grid,
             parent=state,
-            applied_operator=self
+            applied_operator=self,
+            manhattan=manhattan
+        )
+
+    def __eq__(self, other: Operator) -> bool:
+        return (
+            isinstance(other, GridOperator) and
+            self.direction == other.direction
         )
+
+    def __hash__(self) -> int:
+        return hash(self.direction)
+
+
+class GridRanking(Ranking):
+    """Perfect hash of the grid states. Each grid is a permutation of the
+    given values, which is ranked either by the Myrvold-Ruskey algorithm
+    (linear time) or by its Lehmer code (lexicographic order).
+    """
+
+    def __init__(
+            self,
+            values: Iterable[str],
+            base_size: int = 3,
+            lexicographic: bool = False
+    ):
+        self.__values = tuple(values)
+        self.__base_size = base_size
+        self.__lexicographic = lexicographic
+        self.__indexes = {value: i for i, value in enumerate(self.__values)}
+
+        if len(self.__values) != base_size ** 2:
+            raise ValueError(
+                f"Number of values doesn't match the base size: "
+                f"{base_size = }, number of values = {len(self.__values)}")
+
+    @property
+    def size(self) -> int:
+        return permutation_size(len(self.__values))
+
+    def permutation(self, grid: Grid) -> tuple[int]:
+        """Maps the given grid onto the permutation of the value indexes."""
+        return tuple([self.__indexes[value] for value in grid.values])
+
+    def rank(self, state: GridState) -> int:
+        permutation = self.permutation(state.grid)
+
+        if self.__lexicographic:
+            return lehmer_rank(permutation)
+        return myrvold_ruskey_rank(permutation)
+
+    def unrank(self, rank: int) -> GridState:
+        n = len(self.__values)
+
+        if self.__lexicographic:
+            permutation = lehmer_unrank(rank, n)
+        else:
+            permutation = myrvold_ruskey_unrank(rank, n)
+
+        values = [self.__values[index] for index in permutation]
+        return GridState(Grid.of(values, self.__base_size))
+
+    @staticmethod
+    def of(grid: Grid, lexicographic: bool = False) -> "GridRanking":
+        """Creates the ranking for the values of the given grid."""
+        return GridRanking(
+            sorted(grid.values), grid.base_size, lexicographic)
@@ -0,0 +1,6 @@
+"""This package contains a definition of the Tower of Hanoi problem - moving
+all the disks from the first stick to the last one, while never putting
+a larger disk on top of a smaller one.
+"""
+
+from .hanoi_starter import start_hanoi
@@ -0,0 +1,68 @@
+from time import time
+from typing import Iterable, Union
+
+from src.fw import Algorithm, StateSpace
+from src.fw.algorithms.base import NoSolutionFound
+from src.problems.hanoi.hanoi_definition import initialize_hanoi_sticks
+from src.problems.hanoi.hanoi_state_space import (
+    HanoiState, MoveOperator, HanoiRanking)
+
+
+def start_hanoi(
+        n_sticks: int = 4,
+        n_disks: int = 5,
+        algos: Union[Iterable[Algorithm], Iterable[str]] = (
+            "DFS", "BFS", "GREEDY", "A_STAR", "GRADIENT"),
+        use_ranking: bool = False
+):
+    """Facade function to schedule solution of the Tower of Hanoi.
+
+    :param n_sticks: Number of sticks the disks can be put on.
+
+    :param n_disks: Number of disks to be moved.
+
+    :param algos: An iterable collection of algorithms to be used.
+
+    :param use_ranking: Flag if the states should be perfectly hashed, so the
+                        algorithms can use array-indexed tables.
+    """
+    init, goal = initialize_hanoi_sticks(n_sticks, n_disks)
+
+    operators = []
+
+    for from_stick in init.sticks:
+        for to_stick in init.sticks:
+            if from_stick.index != to_stick.index:
+                operators.append(
+                    MoveOperator(from_stick.index, to_stick.index))
+
+    init_state, goal_state = HanoiState(init), HanoiState(goal)
+    ranking = HanoiRanking.of(init) if use_ranking else None
+
+    print(init.sticks)
+
+    for algo in algos:
+        print(100 * "=")
+        print("Trying algorithm:", algo)
+
+        ss = StateSpace(
+            initial_state=init_state,
+            goal_state=goal_state,
+            operators=operators,
+            algorithm=algo,
+            ranking=ranking
+        )
+
+        try:
+            start = time()
+            solved = ss.solve()
+            end = time()
+
+            applied = solved.all_applied_operators(reverse_operators=True)
+            print(len(applied), applied)
+            print(end - start, "seconds")
+
+        except NoSolutionFound as err:
+            print(err.message)
+
+        print(f"Statistics: {ss.statistics}")
@@ -1,9 +1,8 @@
-import time
-from typing import Union
+from typing import Iterable, Union
 
-from src.fw import State, Operator, StateSpace
-from src.problems.hanoi.hanoi_definition import (
-    HanoiSticks, Stick, initialize_hanoi_sticks)
+from src.fw import State, Operator
+from src.fw.ranking import Ranking, base_k_rank, base_k_unrank
+from src.problems.hanoi.hanoi_definition import HanoiSticks, Stick, Disk
 
 
 class HanoiState(State):
@@ -39,6 +38,19 @@ class HanoiState(State):
 
         return self_disk_distribution == other_disk_distribution
 
+    def canonical_key(self) -> tuple:
+        """The sticks in between the start and the goal one are
+        interchangeable - permuting them leads to a state equally far from
+        the goal. The key is therefore made of the disks on the start and the
+        goal stick and the sorted disks of the sticks in between."""
+        sticks = self.hanoi_sticks.sticks
+        between = sorted([s.sizes for s in sticks[1:-1]])
+
+        return sticks[0].sizes, tuple(between), sticks[-1].sizes
+
+    def __hash__(self) -> int:
+        return hash(tuple([s.sizes for s in self.hanoi_sticks.sticks]))
+
     def __repr__(self):
         return f"{self.hanoi_sticks}"
 
@@ -58,6 +70,11 @@ class MoveOperator(Operator):
     def to_stick(self) -> int:
         return self.__to_stick
 
+    @property
+    def inverse(self) -> "MoveOperator":
+        """Moving the disk back."""
+        return MoveOperator(self.to_stick, self.from_stick)
+
     def can_be_applied(self, state: HanoiState) -> bool:
         f_stick = state.stick(self.from_stick)
         t_stick = state.stick(self.to_stick)
@@ -89,42 +106,70 @@ class MoveOperator(Operator):
             applied_operator=self
         )
 
+    def __eq__(self, other: Operator) -> bool:
+        return (
+            isinstance(other, MoveOperator) and
+            self.from_stick == other.from_stick and
+            self.to_stick == other.to_stick
+        )
 
-n_sticks = 4
-n_disks = 5
-
-operators = []
+    def __hash__(self) -> int:
+        return hash((self.from_stick, self.to_stick))
 
-init, goal = initialize_hanoi_sticks(n_sticks, n_disks)
 
-for idx, from_stick in enumerate(init.sticks):
-    for to_stick in init.sticks:
-        if from_stick != to_stick:
-            operators.append(MoveOperator(from_stick.index, to_stick.index))
+class HanoiRanking(Ranking):
+    """Perfect hash of the Hanoi states. Each disk lies on one of the `k`
+    sticks, so the whole state is encoded as a base-k number with a digit
+    (position of the stick) for each of the disks.
+    """
 
-init_state, goal_state = HanoiState(init), HanoiState(goal)
+    def __init__(
+            self,
+            stick_indexes: Iterable[int],
+            disk_sizes: Iterable[int]
+    ):
+        self.__stick_indexes = tuple(stick_indexes)
+        self.__disk_sizes = tuple(sorted(disk_sizes))
+
+        # Lookups of the stick positions and the digits of the disks
+        self.__positions = {
+            index: position
+            for position, index in enumerate(self.__stick_indexes)
+        }
+        self.__digits = {
+            size: digit for digit, size in enumerate(self.__disk_sizes)
+        }
 
-print(init.sticks)
+    @property
+    def size(self) -> int:
+        return len(self.__stick_indexes) ** len(self.__disk_sizes)
 
-for algo in ["DFS", "BFS", "GREEDY", "A_STAR", "GRADIENT"]:
+    def rank(self, state: HanoiState) -> int:
+        digits = [0] * len(self.__disk_sizes)
 
-    print(100 * "=")
-    print("Trying algorithm:", algo)
+        for stick in state.hanoi_sticks.sticks:
+            position = self.__positions[stick.index]
+            for size in stick.sizes:
+                digits[self.__digits[size]] = position
 
-    ss = StateSpace(
-        initial_state=init_state,
-        goal_state=goal_state,
-        operators=operators,
-        algorithm=algo
-    )
+        return base_k_rank(digits, len(self.__stick_indexes))
 
-    start = time.time()
+    def unrank(self, rank: int) -> HanoiState:
+        digits = base_k_unrank(
+            rank, len(self.__stick_indexes), len(self.__disk_sizes))
 
-    solved = ss.solve()
+        sticks = [Stick(index) for index in self.__stick_indexes]
 
-    end = time.time()
+        for size, position in zip(self.__disk_sizes, digits):
+            sticks[position].disks = [*sticks[position].disks, Disk(size)]
 
-    applied = solved.all_applied_operators(reverse_operators=True)
-    print(len(applied), applied)
-    print(end - start, "seconds")
+        return HanoiState(HanoiSticks(sticks))
 
+    @staticmethod
+    def of(hanoi_sticks: HanoiSticks) -> "HanoiRanking":
+        """Creates the ranking for the sticks and disks of the given
+        Hanoi."""
+        return HanoiRanking(
+            [stick.index for stick in hanoi_sticks.sticks],
+            [disk.size for disk in hanoi_sticks.disks]
+        )
@@ -0,0 +1,184 @@
+"""This module contains the batch routing in a maze - answering many queries
+(pairs of the start and the goal) at once.
+
+The queries are grouped by their shared starts (or by their shared goals,
+when there are fewer of them - moves in the maze are reversible). A single
+breadth-first search is run from each of the shared fields until all the
+fields of its group are reached, so the work grows with the number of the
+distinct starts (goals), not with the number of the queries.
+
+Most importantly, it declares the following classes:
+
+    - MazeRouter:
+        Router answering the batches of queries in a single maze.
+"""
+
+from collections import deque
+from typing import Iterable, Union
+
+from src.problems.maze import Maze
+
+
+# Path as the coordinates of all its fields (from the start to the goal)
+Route = list[tuple[int, int]]
+
+
+class MazeRouter:
+    """Router answering the batches of the queries in the given maze.
+
+    The passability of all the fields is unpacked from the bit array of the
+    maze into a flat array just once (and again after the maze changes), so
+    the searches just index it.
+    """
+
+    def __init__(self, maze: Maze):
+        self.__maze = maze
+        self.__passable = bytearray()
+        self.__version: Union[int, None] = None
+        self.__searches = 0
+
+        # Row length of the flat array (the maze is surrounded by walls)
+        self.__stride = maze.dimensions[0] + 2
+
+    @property
+    def maze(self) -> Maze:
+        return self.__maze
+
+    @property
+    def searches(self) -> int:
+        """Number of the searches run for the last batch."""
+        return self.__searches
+
+    def route(
+            self,
+            queries: Iterable[tuple[tuple[int, int], tuple[int, int]]]
+    ) -> list[Union[Route, None]]:
+        """Finds the shortest paths for all the given pairs of the start and
+        the goal coordinates. The paths are returned in the order of the
+        queries - each as the coordinates of all its fields (including both
+        the start and the goal). When there's no path, None.
+        """
+        queries = list(queries)
+        self._unpack()
+
+        starts = {start for start, _ in queries}
+        goals = {goal for _, goal in queries}
+
+        # Search from the goals when there are fewer of them
+        backwards = len(goals) < len(starts)
+
+        groups: dict[tuple[int, int], set[tuple[int, int]]] = {}
+
+        for start, goal in queries:
+            root, other = (goal, start) if backwards else (start, goal)
+            groups.setdefault(root, set()).add(other)
+
+        routes: dict[tuple[tuple[int, int], tuple[int, int]], Route] = {}
+        self.__searches = 0
+
+        for root, others in groups.items():
+            parents = self._search(root, others)
+            self.__searches += 1
+
+            for other in others:
+                route = self._backtrack(parents, other)
+
+                if route is not None and not backwards:
+                    route.reverse()
+
+                key = (other, root) if backwards else (root, other)
+                routes[key] = route
+
+        return [routes[query] for query in queries]
+
+    def _unpack(self):
+        """Unpacks the bit array of the maze into the flat array of the
+        passable fields (when it changed since the last time)."""
+        if self.__version == self.__maze.version:
+            return
+
+        width, height = self.__maze.dimensions
+        row_bytes = self.__maze.row_bytes
+        bitmap = self.__maze.bitmap
+        stride = self.__stride
+
+        passable = bytearray(stride * (height + 2))
+
+        for y in range(height):
+            row = bitmap[y * row_bytes:(y + 1) * row_bytes]
+            fields = b"".join([_PASSABLE_BITS[byte] for byte in row])
+            start = (y + 1) * stride + 1
+            passable[start:start + width] = fields[:width]
+
+        self.__passable = passable
+        self.__version = self.__maze.version
+
+    def _index(self, field: tuple[int, int]) -> int:
+        """Index of the given field in the flat array."""
+        x_min, _, y_min, _ = self.__maze.frame
+        return (field[1] - y_min + 1) * self.__stride + field[0] - x_min + 1
+
+    def _search(
+            self,
+            root: tuple[int, int],
+            targets: set[tuple[int, int]]
+    ) -> dict[int, int]:
+        """Breadth-first search from the root until all the targets are
+        reached. Returns the parents of all the reached fields (by their
+        indexes)."""
+        passable = self.__passable
+        origin = self._index(root)
+
+        if not self.__maze.contains(*root) or not passable[origin]:
+            return {}
+
+        remaining = {
+            self._index(target) for target in targets
+            if self.__maze.contains(*target)
+        }
+        remaining.discard(origin)
+
+        steps = (1, -1, self.__stride, -self.__stride)
+        parents = {origin: -1}
+        queue = deque([origin])
+
+        while queue and remaining:
+            current = queue.popleft()
+
+            for step in steps:
+                neighbour = current + step
+
+                if passable[neighbour] and neighbour not in parents:
+                    parents[neighbour] = current
+                    remaining.discard(neighbour)
+                    queue.append(neighbour)
+
+        return parents
+
+    def _backtrack(
+            self,
+            parents: dict[int, int],
+            field: tuple[int, int]
+    ) -> Union[Route, None]:
+        """Route from the given field to the root of the search."""
+        index = self._index(field)
+
+        if not self.__maze.contains(*field) or index not in parents:
+            return None
+
+        x_min, _, y_min, _ = self.__maze.frame
+        route = []
+
+        while index != -1:
+            y, x = divmod(index, self.__stride)
+            route.append((x - 1 + x_min, y - 1 + y_min))
+            index = parents[index]
+
+        return route
+
+
+# For each byte of the bit array, the passability of its 8 fields
+_PASSABLE_BITS = [
+    bytes([0 if byte & (1 << bit) else 1 for bit in range(8)])
+    for byte in range(256)
+]
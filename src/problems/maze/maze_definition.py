@@ -17,11 +17,14 @@ Most importantly, it declares the following classes:
         Field you can step on.
 
     - Maze:
-        A collection of fields the Maze is made of.
+        A collection of fields the Maze is made of (stored as a bit array).
 """
 
+import mmap as _mmap
+import os
+import struct
 from abc import ABC, abstractmethod
-from typing import Iterable, Union
+from typing import Callable, Iterable, Iterator, TextIO, Union
 
 
 class Direction:
@@ -48,6 +51,16 @@ class Direction:
         """Movement in the y-axis"""
         return self.__y_diff
 
+    @property
+    def opposite(self) -> "Direction":
+        """Opposite direction to this one (e.g. opposite of East is West)."""
+        for direction in _DIRECTIONS:
+            x_match = direction.x_diff == -self.x_diff
+            y_match = direction.y_diff == -self.y_diff
+
+            if x_match and y_match:
+                return direction
+
     def __repr__(self) -> str:
         return self.name
 
@@ -108,51 +121,294 @@ class Path(Field):
 
 class Maze:
     """Representation of the maze that is meant to be searched in.
+
+    The maze is stored as a compact bit array covering its whole rectangular
+    frame - one bit for each field (set for a wall). Each row of the maze
+    starts at a new byte. Thanks to that, the fields are found in a constant
+    time.
+
+    The actual `Field` objects are created only when asked for - and then
+    they are cached, so each of them exists just once.
+
+    Any field missing in the frame of the given fields is considered a wall.
+
+    The maze can be saved into a compact binary file (a header followed by
+    the bit array) and loaded back - by default memory-mapped, so loading
+    takes a constant time and the processes loading the same file share its
+    pages. It can also be exchanged in the text form of `stringify_maze`.
+
+    Walls can be changed on the fly. Each change increments the version of
+    the maze and it's announced to all the registered listeners.
     """
 
+    # Header of the binary file: magic, version, width, height, x_min, y_min
+    _FILE_HEADER = struct.Struct("<4sHxxIIii")
+    _FILE_MAGIC = b"SSMZ"
+    _FILE_VERSION = 1
+
+    # Character of the walls in the text form
+    _WALL_CHAR = "▒"
+
     def __init__(self, fields: Iterable[Field]):
-        self.__fields = list(fields)
+        fields = list(fields)
+
+        x_min, x_max = min(f.x for f in fields), max(f.x for f in fields)
+        y_min, y_max = min(f.y for f in fields), max(f.y for f in fields)
+        width, height = x_max - x_min + 1, y_max - y_min + 1
+        row_bytes = (width + 7) // 8
+
+        # Start with walls only and clear the bits of the paths
+        bitmap = bytearray(b"\xff" * (row_bytes * height))
+
+        for field in fields:
+            if not field.is_wall:
+                x, y = field.x - x_min, field.y - y_min
+                bitmap[y * row_bytes + (x >> 3)] &= ~(1 << (x & 7))
+
+        self.__setup(bitmap, width, height, x_min, y_min)
+
+    def __setup(
+            self,
+            bitmap: Union[bytearray, memoryview],
+            width: int,
+            height: int,
+            x_min: int,
+            y_min: int
+    ):
+        """Initializes the maze from the given bit array."""
+        self.__bitmap = bitmap
+        self.__width = width
+        self.__height = height
+        self.__x_min = x_min
+        self.__y_min = y_min
+        self.__row_bytes = (width + 7) // 8
+        self.__field_cache: dict[tuple[int, int], Field] = {}
+        self.__source_path: Union[str, None] = None
+        self.__version = 0
+        self.__listeners: list[Callable[[int, int, bool], None]] = []
+
+        if len(bitmap) < self.__row_bytes * height:
+            raise ValueError(
+                f"Bit array is too short for the maze: {width = }, "
+                f"{height = }, bytes = {len(bitmap)}")
+
+    @classmethod
+    def of_bitmap(
+            cls,
+            bitmap: Union[bytearray, memoryview],
+            width: int,
+            height: int,
+            x_min: int = 0,
+            y_min: int = 0
+    ) -> "Maze":
+        """Creates the maze directly from the given bit array (one bit for
+        each field, set for a wall) with each row starting at a new byte.
+        No fields are created.
+        """
+        maze = cls.__new__(cls)
+        maze.__setup(bitmap, width, height, x_min, y_min)
+        return maze
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> "Maze":
+        """Loads the maze from the binary file created by `save`.
+
+        When `mmap` is set, the file is memory-mapped instead of read - the
+        bit array is paged in lazily and shared with other processes mapping
+        the same file. Changes of such maze are private to this process and
+        never written back to the file.
+        """
+        header = cls._FILE_HEADER
+
+        with open(path, "rb") as file:
+            magic, version, width, height, x_min, y_min = header.unpack(
+                file.read(header.size))
+
+            if magic != cls._FILE_MAGIC or version != cls._FILE_VERSION:
+                raise ValueError(f"Not a maze file (version "
+                                 f"{cls._FILE_VERSION}): {path}")
+
+            if mmap:
+                mapped = _mmap.mmap(
+                    file.fileno(), 0, access=_mmap.ACCESS_COPY)
+                bitmap = memoryview(mapped)[header.size:]
+            else:
+                bitmap = bytearray(file.read())
+
+        maze = cls.of_bitmap(bitmap, width, height, x_min, y_min)
+        maze.__source_path = os.path.abspath(path)
+        return maze
+
+    @classmethod
+    def of_string(cls, text: str, x_min: int = 0, y_min: int = 0) -> "Maze":
+        """Creates the maze from its text form produced by `stringify_maze`.
+        Any character other than the wall (like the replaced path fields)
+        is considered a path. Missing fields of shorter rows are walls.
+        """
+        rows = [row[::2] for row in text.splitlines() if row.strip()]
+
+        if not rows:
+            raise ValueError("Cannot create a maze from an empty text")
+
+        width, height = max(len(row) for row in rows), len(rows)
+        row_bytes = (width + 7) // 8
+        bitmap = bytearray(b"\xff" * (row_bytes * height))
+
+        # The first row of the text is the top one
+        for y, row in enumerate(reversed(rows)):
+            for x, char in enumerate(row):
+                if char != cls._WALL_CHAR:
+                    bitmap[y * row_bytes + (x >> 3)] &= ~(1 << (x & 7))
+
+        return cls.of_bitmap(bitmap, width, height, x_min, y_min)
+
+    @classmethod
+    def load_text(cls, path: str) -> "Maze":
+        """Loads the maze from the text file created by `save_text`."""
+        with open(path, "r", encoding="utf-8") as file:
+            maze = cls.of_string(file.read())
+
+        maze.__source_path = os.path.abspath(path)
+        return maze
+
+    @property
+    def source_path(self) -> Union[str, None]:
+        """Absolute path of the file this maze was loaded from (or saved to
+        the last time). None for the mazes never stored in a file."""
+        return self.__source_path
+
+    @property
+    def version(self) -> int:
+        """Number of the changes of the walls made so far."""
+        return self.__version
+
+    def add_listener(self, listener: Callable[[int, int, bool], None]):
+        """Registers the function called after each change of a wall with
+        its coordinates and if there's a wall now."""
+        self.__listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[int, int, bool], None]):
+        """Unregisters the given listener of the changes of the walls."""
+        if listener in self.__listeners:
+            self.__listeners.remove(listener)
+
+    def set_wall(self, x: int, y: int, wall: bool = True):
+        """Puts a wall to the given coordinates (or removes it). When it
+        changes the maze, the listeners are notified.
+
+        Structures precomputed from the maze (like its graph, landmarks or
+        hierarchy) are not updated - they have to be built again.
+        """
+        if not self.contains(x, y):
+            raise ValueError(f"Coordinates out of the maze: [{x}, {y}]")
+
+        if self.is_wall(x, y) == wall:
+            return
+
+        x_diff, y_diff = x - self.__x_min, y - self.__y_min
+        index = y_diff * self.__row_bytes + (x_diff >> 3)
+        mask = 1 << (x_diff & 7)
+
+        if wall:
+            self.__bitmap[index] = self.__bitmap[index] | mask
+        else:
+            self.__bitmap[index] = self.__bitmap[index] & ~mask
+
+        self.__field_cache.pop((x, y), None)
+        self.__version += 1
+
+        for listener in tuple(self.__listeners):
+            listener(x, y, wall)
+
+    def save(self, path: str):
+        """Saves the maze into a compact binary file - a header followed by
+        the bit array (1 bit per field)."""
+        size = self.__row_bytes * self.__height
+
+        with open(path, "wb") as file:
+            file.write(self._FILE_HEADER.pack(
+                self._FILE_MAGIC, self._FILE_VERSION, self.__width,
+                self.__height, self.__x_min, self.__y_min))
+            file.write(self.__bitmap[:size])
+
+        self.__source_path = os.path.abspath(path)
+
+    def save_text(self, path: str):
+        """Saves the maze into a text file in the form of `stringify_maze`.
+        """
+        with open(path, "w", encoding="utf-8") as file:
+            self.write_text(file)
+
+        self.__source_path = os.path.abspath(path)
+
+    @property
+    def bitmap(self) -> Union[bytearray, memoryview]:
+        """Bit array of the walls (row by row from the lowest y-axis
+        coordinate, each row starting at a new byte)."""
+        return self.__bitmap
+
+    @property
+    def row_bytes(self) -> int:
+        """Number of bytes each row of the bit array takes."""
+        return self.__row_bytes
 
     @property
     def fields(self) -> tuple[Field]:
         """Tuple of fields this maze is made of."""
-        return tuple(self.__fields)
+        x_min, x_max, y_min, y_max = self.frame
+
+        return tuple([
+            self.field_at(x, y)
+            for y in range(y_min, y_max + 1)
+            for x in range(x_min, x_max + 1)
+        ])
 
     @property
     def dimensions(self) -> tuple[int, int]:
         """Returns maximum width and maximum height of the maze.
         """
-        x_min, x_max, y_min, y_max = self.frame
-
-        return (x_max - x_min + 1), (y_max - y_min + 1)
+        return self.__width, self.__height
 
     @property
     def frame(self) -> tuple[int, int, int, int]:
-        """Finds the minimums and maximums coordinates in both x and y axis.
+        """Returns the minimums and maximums coordinates in both x and y axis.
         """
+        return (
+            self.__x_min, self.__x_min + self.__width - 1,
+            self.__y_min, self.__y_min + self.__height - 1
+        )
 
-        # Function helpers
-        def x(field: Field) -> int:
-            """Derive the x-coordinate from the field"""
-            return field.x
+    def contains(self, x: int, y: int) -> bool:
+        """Returns if the given coordinates lie within the frame of the
+        maze."""
+        return (
+            0 <= x - self.__x_min < self.__width and
+            0 <= y - self.__y_min < self.__height
+        )
 
-        def y(field: Field) -> int:
-            """Derive the y-coordinate from the field"""
-            return field.y
+    def is_wall(self, x: int, y: int) -> bool:
+        """Returns if there's a wall at the given coordinates. Coordinates
+        outside the maze are considered walls as well.
+        """
+        x, y = x - self.__x_min, y - self.__y_min
 
-        # Limits of the maze
-        x_min, x_max = [min(self.fields, key=x).x, max(self.fields, key=x).x]
-        y_min, y_max = [min(self.fields, key=y).y, max(self.fields, key=y).y]
+        if not (0 <= x < self.__width and 0 <= y < self.__height):
+            return True
 
-        return x_min, x_max, y_min, y_max
+        byte = self.__bitmap[y * self.__row_bytes + (x >> 3)]
+        return bool(byte & (1 << (x & 7)))
 
     def field_at(self, x: int, y: int) -> Union[Field, None]:
         """Tries to find a field with given coordinates. When there is no such
         field found, it returns None.
         """
-        for field in self.fields:
-            if field.x == x and field.y == y:
-                return field
+        field = self.__field_cache.get((x, y))
+
+        if field is None and self.contains(x, y):
+            field = Wall(x, y) if self.is_wall(x, y) else Path(x, y)
+            self.__field_cache[(x, y)] = field
+
+        return field
 
     def neighbours(
             self,
@@ -195,26 +451,59 @@ class Maze:
             field.y + direction.y_diff
         )
 
-    def stringify_maze(
+    def render_rows(
             self,
             fields_to_replace: Iterable[tuple[int, int]] = (),
             replace_char: str = "*"
-    ) -> str:
-        """Tries to print this maze."""
+    ) -> Iterator[str]:
+        """Renders the rows of the maze (from the top one) as the text of
+        `stringify_maze`. The rows are built directly from the bit array -
+        8 fields at once - and the replaced fields are overlaid on them.
+        """
         x_min, x_max, y_min, y_max = self.frame
+        width, row_bytes = self.__width, self.__row_bytes
+
+        # Replaced fields by the rows
+        overlay: dict[int, list[int]] = {}
 
-        rows = []
+        for x, y in set(fields_to_replace):
+            if self.contains(x, y):
+                overlay.setdefault(y, []).append(x - x_min)
 
         for y in range(y_max, y_min - 1, -1):
-            row = []
-            for x in range(x_min, x_max + 1):
-                field = self.field_at(x, y)
-                if (x, y) in fields_to_replace:
-                    row.append(replace_char)
-                else:
-                    row.append("▒" if field.is_wall else " ")
-            rows.append(" ".join(row))
-        return "\n".join(rows)
+            start = (y - y_min) * row_bytes
+            row = "".join([
+                _FIELD_CHARS[byte]
+                for byte in self.__bitmap[start:start + row_bytes]
+            ])[:width]
+
+            if y in overlay:
+                row = list(row)
+                for x in overlay[y]:
+                    row[x] = replace_char
+
+            yield " ".join(row)
+
+    def write_text(
+            self,
+            file: TextIO,
+            fields_to_replace: Iterable[tuple[int, int]] = (),
+            replace_char: str = "*"
+    ):
+        """Writes the maze into the given text file-like object row by row
+        (in the form of `stringify_maze`), so the whole text never has to be
+        kept in the memory."""
+        for row in self.render_rows(fields_to_replace, replace_char):
+            file.write(row)
+            file.write("\n")
+
+    def stringify_maze(
+            self,
+            fields_to_replace: Iterable[tuple[int, int]] = (),
+            replace_char: str = "*"
+    ) -> str:
+        """Tries to print this maze."""
+        return "\n".join(self.render_rows(fields_to_replace, replace_char))
 
 
 _DIRECTIONS = [
@@ -228,3 +517,11 @@ _DIRECTIONS = [
 def directions() -> tuple["Direction"]:
     """Returns all the available orthogonal directions."""
     return tuple(_DIRECTIONS)
+
+
+# For each byte of the bit array, the characters of its 8 fields
+_FIELD_CHARS = [
+    "".join([Maze._WALL_CHAR if byte & (1 << bit) else " "
+             for bit in range(8)])
+    for byte in range(256)
+]
@@ -0,0 +1,136 @@
+"""This module contains the exact heuristic for the Maze Solving - the field
+of the real distances of all the fields to the goal one.
+
+The distance field is computed by a breadth-first flood fill from the goal
+over the whole bit array of the maze at once (vectorized using NumPy). Each
+field is then estimated in a constant time by a simple look-up, and since
+the estimate is exact, the informed algorithms go straight to the goal.
+
+The fields are cached for each maze and goal, so the repeated searches
+towards the same goal cost a single flood fill. When the walls of the maze
+change, the field is computed again.
+
+Most importantly, it declares the following:
+
+    - DistanceFieldHeuristic:
+        Heuristic reading the distances from the precomputed field.
+
+    - distance_field:
+        Function providing the (cached) distance field of a maze and goal.
+
+    - flood_fill:
+        Function computing a new (not cached) distance field.
+
+    - wall_grid:
+        Function unpacking the bit array of a maze into a NumPy array.
+
+This module requires NumPy.
+"""
+
+from weakref import WeakKeyDictionary
+
+import numpy as np
+
+from src.fw import State
+from src.fw.heuristic import Heuristic
+from src.problems.maze import Maze
+
+
+# Distance of the fields the goal cannot be reached from
+UNREACHABLE = -1
+
+# Cached distance fields - for each maze, by the coordinates of the goal
+# (together with the version of the maze they were computed for)
+_DISTANCE_FIELDS: WeakKeyDictionary = WeakKeyDictionary()
+
+
+def wall_grid(maze: Maze) -> np.ndarray:
+    """Unpacks the bit array of the maze into a 2D boolean array (true for
+    the walls) indexed by `[y - y_min, x - x_min]`."""
+    width, height = maze.dimensions
+    packed = np.frombuffer(
+        maze.bitmap, dtype=np.uint8, count=maze.row_bytes * height
+    ).reshape(height, maze.row_bytes)
+
+    unpacked = np.unpackbits(packed, axis=1, bitorder="little")
+    return unpacked[:, :width].astype(bool)
+
+
+def distance_field(maze: Maze, goal: tuple[int, int]) -> np.ndarray:
+    """Returns the field of the lengths of the shortest paths from all the
+    fields of the maze to the given goal coordinates - as a 2D array indexed
+    by `[y - y_min, x - x_min]`. Walls and the fields the goal cannot be
+    reached from are `UNREACHABLE`.
+
+    The field is computed once for each maze (version) and goal. It must not
+    be modified.
+    """
+    fields = _DISTANCE_FIELDS.setdefault(maze, {})
+    version, field = fields.get(goal, (None, None))
+
+    if version != maze.version:
+        field = flood_fill(maze, goal)
+        field.flags.writeable = False
+        fields[goal] = (maze.version, field)
+
+    return field
+
+
+def flood_fill(maze: Maze, goal: tuple[int, int]) -> np.ndarray:
+    """Computes the distance field (as `distance_field` does, but with no
+    caching) by a breadth-first flood fill from the goal. The frontier is
+    kept as an array of flat indexes of the fields, so each layer is
+    expanded by a few vectorized operations."""
+    width, height = maze.dimensions
+    x_min, _, y_min, _ = maze.frame
+
+    # Surround the maze by walls, so no step ever leaves the array
+    stride = width + 2
+    passable = np.zeros((height + 2, stride), dtype=bool)
+    passable[1:-1, 1:-1] = ~wall_grid(maze)
+    passable = passable.ravel()
+
+    distances = np.full(passable.size, UNREACHABLE, dtype=np.int32)
+    steps = np.array([1, -1, stride, -stride])
+
+    origin = (goal[1] - y_min + 1) * stride + (goal[0] - x_min + 1)
+
+    if maze.contains(*goal) and passable[origin]:
+        distances[origin] = 0
+        frontier = np.array([origin])
+        distance = 0
+
+        while frontier.size:
+            distance += 1
+            candidates = (frontier[:, None] + steps).ravel()
+            candidates = candidates[
+                passable[candidates] & (distances[candidates] < 0)]
+
+            frontier = np.unique(candidates)
+            distances[frontier] = distance
+
+    return distances.reshape(height + 2, stride)[1:-1, 1:-1].copy()
+
+
+class DistanceFieldHeuristic(Heuristic):
+    """Exact heuristic of the Maze Solving reading the lengths of the
+    shortest paths from the distance field of the goal.
+
+    It works with any state having the `x` and `y` coordinates in the maze
+    (like `Position` or `Junction`). States the goal cannot be reached from
+    are estimated as infinitely far.
+    """
+
+    def __init__(self, maze: Maze):
+        self.__maze = maze
+
+    @property
+    def maze(self) -> Maze:
+        return self.__maze
+
+    def estimate(self, state: State, goal_state: State) -> float:
+        field = distance_field(self.maze, (goal_state.x, goal_state.y))
+        x_min, _, y_min, _ = self.maze.frame
+
+        distance = field[state.y - y_min, state.x - x_min]
+        return float("inf") if distance < 0 else float(distance)
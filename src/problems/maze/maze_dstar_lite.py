@@ -0,0 +1,287 @@
+"""This module contains the incremental replanning for the mazes with the
+changing walls - the D* Lite algorithm.
+
+D* Lite searches backwards - from the goal to the start - and keeps all its
+search state (the distances and the priority queue) between the queries.
+When a wall appears or disappears, only the distances affected by the change
+are repaired, so the next query is usually much cheaper than a new search
+from scratch. The start may move between the queries as well (e.g. as the
+agent follows the path).
+
+Most importantly, it declares the following classes:
+
+    - DStarLite:
+        Planner of the paths to a fixed goal in a changing maze.
+
+    - DStarLiteSearch:
+        Algorithm keeping the planner across the solved State Spaces.
+"""
+
+import heapq
+from typing import Callable, Union
+
+from src.fw import State, Operator
+from src.fw.algorithms.base import Algorithm, NoSolutionFound
+from src.fw.algorithms.closed_set import ClosedSet
+from src.problems.maze import Maze
+from src.problems.maze.maze_state_space import Position, DirectionOperator
+
+
+# Distance of the fields with no known path to the goal
+_INFINITY = float("inf")
+
+# Steps to all the orthogonal neighbours
+_STEPS = ((1, 0), (-1, 0), (0, 1), (0, -1))
+
+
+class DStarLite:
+    """Planner of the shortest paths to the given goal in the given maze.
+
+    It listens to the changes of the walls of the maze and repairs the
+    affected distances at the next planning. When not needed anymore, it
+    should be closed, so the maze stops notifying it.
+    """
+
+    def __init__(self, maze: Maze, start: tuple[int, int],
+                 goal: tuple[int, int]):
+        self.__maze = maze
+        self.__start = start
+        self.__goal = goal
+
+        # Distances to the goal (g) and their one-step look-ahead (rhs)
+        self.__g: dict[tuple[int, int], float] = {}
+        self.__rhs: dict[tuple[int, int], float] = {goal: 0}
+
+        # Priority queue of the inconsistent fields with lazy deletion
+        self.__keys: dict[tuple[int, int], tuple[float, float]] = {}
+        self.__queue: list[tuple[tuple[float, float], tuple[int, int]]] = []
+
+        # Correction of the keys after the start moved
+        self.__k_m = 0
+
+        # Fields changed since the last planning
+        self.__changed: list[tuple[int, int]] = []
+
+        self._push(goal)
+        maze.add_listener(self._on_change)
+
+    @property
+    def maze(self) -> Maze:
+        return self.__maze
+
+    @property
+    def start(self) -> tuple[int, int]:
+        return self.__start
+
+    @property
+    def goal(self) -> tuple[int, int]:
+        return self.__goal
+
+    def close(self):
+        """Stops listening to the changes of the maze."""
+        self.__maze.remove_listener(self._on_change)
+
+    def move_to(self, start: tuple[int, int]):
+        """Moves the start to the given coordinates. The already computed
+        distances are kept."""
+        self.__k_m += _manhattan(self.__start, start)
+        self.__start = start
+
+    def distance(self, field: tuple[int, int]) -> float:
+        """Currently known distance of the given field to the goal."""
+        return self.__g.get(field, _INFINITY)
+
+    def plan(
+            self,
+            on_expansion: Union[Callable[[int], None], None] = None
+    ) -> Union[list[tuple[int, int]], None]:
+        """Repairs the distances affected by the changes of the maze and
+        returns the coordinates of the fields of the shortest path from the
+        start to the goal (both included). When there's no path, None.
+
+        :param on_expansion: Function called for each expanded field with
+                             the number of its updated neighbours.
+        """
+        for field in self.__changed:
+            self._update(field)
+            for neighbour in self._neighbours(field, open_only=False):
+                self._update(neighbour)
+
+        self.__changed.clear()
+        self._compute(on_expansion)
+
+        if self.distance(self.__start) == _INFINITY:
+            return None
+
+        path = [self.__start]
+
+        while path[-1] != self.__goal:
+            path.append(min(
+                self._neighbours(path[-1]),
+                key=lambda neighbour: self.distance(neighbour)
+            ))
+
+        return path
+
+    def _on_change(self, x: int, y: int, wall: bool):
+        """Remembers the changed field for the next planning."""
+        self.__changed.append((x, y))
+
+    def _neighbours(
+            self,
+            field: tuple[int, int],
+            open_only: bool = True
+    ) -> list[tuple[int, int]]:
+        """Neighbouring fields of the given one (only the paths, unless
+        stated otherwise)."""
+        x, y = field
+        neighbours = [(x + dx, y + dy) for dx, dy in _STEPS]
+
+        if open_only:
+            return [n for n in neighbours if not self.__maze.is_wall(*n)]
+
+        return [n for n in neighbours if self.__maze.contains(*n)]
+
+    def _key(self, field: tuple[int, int]) -> tuple[float, float]:
+        """Priority of the given field in the queue."""
+        best = min(self.distance(field), self.__rhs.get(field, _INFINITY))
+        h = _manhattan(self.__start, field)
+        return best + h + self.__k_m, best
+
+    def _push(self, field: tuple[int, int]):
+        """Puts the given field into the queue (or updates its priority)."""
+        key = self._key(field)
+        self.__keys[field] = key
+        heapq.heappush(self.__queue, (key, field))
+
+    def _top(self) -> tuple[tuple[float, float], Union[tuple[int, int], None]]:
+        """Priority and the field at the top of the queue."""
+        while self.__queue:
+            key, field = self.__queue[0]
+
+            if self.__keys.get(field) == key:
+                return key, field
+
+            heapq.heappop(self.__queue)
+
+        return (_INFINITY, _INFINITY), None
+
+    def _update(self, field: tuple[int, int]):
+        """Recalculates the look-ahead distance of the given field and puts
+        it into the queue when it's inconsistent."""
+        if field != self.__goal:
+            if self.__maze.is_wall(*field):
+                rhs = _INFINITY
+            else:
+                rhs = min(
+                    [self.distance(n) + 1 for n in self._neighbours(field)],
+                    default=_INFINITY
+                )
+            self.__rhs[field] = rhs
+
+        self.__keys.pop(field, None)
+
+        if self.distance(field) != self.__rhs.get(field, _INFINITY):
+            self._push(field)
+
+    def _compute(self, on_expansion: Union[Callable[[int], None], None]):
+        """Expands the inconsistent fields until the distance of the start
+        is known."""
+        while True:
+            top_key, field = self._top()
+            start_rhs = self.__rhs.get(self.__start, _INFINITY)
+
+            if field is None or (top_key >= self._key(self.__start) and
+                                 start_rhs == self.distance(self.__start)):
+                return
+
+            new_key = self._key(field)
+
+            if top_key < new_key:
+                self._push(field)
+                continue
+
+            rhs = self.__rhs.get(field, _INFINITY)
+            neighbours = self._neighbours(field, open_only=False)
+
+            if self.distance(field) > rhs:
+                # The field got closer to the goal
+                self.__g[field] = rhs
+                self.__keys.pop(field)
+            else:
+                # The field got farther - recalculate it as well
+                self.__g[field] = _INFINITY
+                neighbours.append(field)
+
+            for neighbour in neighbours:
+                self._update(neighbour)
+
+            if on_expansion:
+                on_expansion(len(neighbours))
+
+
+class DStarLiteSearch(Algorithm):
+    """Algorithm keeping the D* Lite planner across the solved State Spaces.
+    When asked for another path to the same goal in the same maze, it only
+    repairs the planner (after the changes of the walls or the moves of the
+    start) instead of searching from scratch.
+
+    It expects the `Position` states and the `DirectionOperator` operators.
+    """
+
+    def __init__(self, closed_set: Union[ClosedSet, None] = None):
+        super().__init__("D_STAR_LITE", closed_set)
+        self.__planner: Union[DStarLite, None] = None
+
+    @property
+    def planner(self) -> Union[DStarLite, None]:
+        """Planner of the last solving."""
+        return self.__planner
+
+    def next_state(self):
+        """Not used in this algorithm."""
+
+    def solve(
+            self,
+            initial_state: Position,
+            goal_state: Position,
+            operators: tuple[Operator]
+    ) -> State:
+        """Plans the path (reusing the previous planning if possible) and
+        produces it as the chain of positions."""
+        self.reset()
+
+        operators_by_diffs = {
+            (op.direction.x_diff, op.direction.y_diff): op
+            for op in operators if isinstance(op, DirectionOperator)
+        }
+
+        maze = next(iter(operators_by_diffs.values())).maze
+        start = (initial_state.x, initial_state.y)
+        goal = (goal_state.x, goal_state.y)
+
+        planner = self.__planner
+
+        if planner and planner.maze is maze and planner.goal == goal:
+            planner.move_to(start)
+        else:
+            if planner:
+                planner.close()
+            planner = self.__planner = DStarLite(maze, start, goal)
+
+        path = planner.plan(self.note_expansion)
+
+        if path is None:
+            raise NoSolutionFound(state=initial_state)
+
+        state = initial_state
+
+        for (x, y), (next_x, next_y) in zip(path, path[1:]):
+            state = operators_by_diffs[(next_x - x, next_y - y)].apply(state)
+
+        return state
+
+
+def _manhattan(a: tuple[int, int], b: tuple[int, int]) -> int:
+    """Manhattan distance of the given coordinates."""
+    return abs(a[0] - b[0]) + abs(a[1] - b[1])
@@ -1,6 +1,6 @@
 import random
 
-from src.problems.maze import Maze, Path, Wall
+from src.problems.maze import Maze
 
 
 def generate_maze(base: int) -> Maze:
@@ -51,12 +51,14 @@ def generate_maze(base: int) -> Maze:
         row.insert(0, 1)
         row.append(1)
 
-    fields = []
+    # Write the walls straight into the bit array of the maze
+    size = base + 2
+    row_bytes = (size + 7) // 8
+    bitmap = bytearray(row_bytes * size)
 
-    for row_idx, row in enumerate(proto_fields):
-        for field_idx, field in enumerate(row):
-            is_wall = proto_fields[row_idx][field_idx] == 1
-            x, y = field_idx, row_idx
-            fields.append(Wall(x, y) if is_wall else Path(x, y))
+    for y, row in enumerate(proto_fields):
+        for x, field in enumerate(row):
+            if field == 1:
+                bitmap[y * row_bytes + (x >> 3)] |= 1 << (x & 7)
 
-    return Maze(fields)
+    return Maze.of_bitmap(bitmap, size, size)
@@ -0,0 +1,225 @@
+"""This module contains a compressed representation of the maze - a sparse
+graph of its junctions and dead ends with weighted edges (corridors).
+
+Mazes are mostly made of one-field-wide corridors and searching them field
+by field is wasteful - there's no decision to be made inside a corridor.
+The graph keeps only the fields where a decision can be made, so the search
+touches the junctions only. Found paths can be expanded back to the
+per-field directions.
+
+Most importantly, it declares the following classes:
+
+    - Corridor:
+        Weighted edge of the graph with all the per-field directions.
+
+    - MazeGraph:
+        The graph of junctions built from a maze.
+
+    - Junction:
+        State of being at a node of the graph.
+
+    - CorridorOperator:
+        Operator of going through a corridor starting in a direction.
+"""
+
+from dataclasses import dataclass
+from typing import Iterable, Union
+
+from src.fw import State, Operator
+from src.problems.maze import Maze, Direction, directions
+
+
+@dataclass(frozen=True)
+class Corridor:
+    """One-field-wide path connecting two nodes of the graph."""
+
+    start: tuple[int, int]              # Coordinates of the starting node
+    end: tuple[int, int]                # Coordinates of the ending node
+    directions: tuple[Direction]        # Steps from the start to the end
+
+    @property
+    def length(self) -> int:
+        """Number of steps through the corridor."""
+        return len(self.directions)
+
+    @property
+    def first_direction(self) -> Direction:
+        """Direction the corridor leaves the starting node in."""
+        return self.directions[0]
+
+
+class MazeGraph:
+    """Sparse graph of the maze. Its nodes are the junctions, the dead ends
+    and any other fields requested to be kept (like the start and the goal
+    of the search). All the fields in between are collapsed into corridors.
+
+    Corridors forming a loop with no node on them are unreachable from the
+    nodes, so they are left out.
+    """
+
+    def __init__(self, maze: Maze, keep: Iterable[tuple[int, int]] = ()):
+        self.__maze = maze
+        self.__corridors: dict[tuple[int, int], dict[str, Corridor]] = {}
+
+        keep = set(keep)
+        x_min, x_max, y_min, y_max = maze.frame
+
+        for y in range(y_min, y_max + 1):
+            for x in range(x_min, x_max + 1):
+                if maze.is_wall(x, y):
+                    continue
+
+                if (x, y) in keep or len(self._open_directions(x, y)) != 2:
+                    self.__corridors[(x, y)] = {}
+
+        for node, corridors in self.__corridors.items():
+            for direction in self._open_directions(*node):
+                corridor = self._walk(node, direction)
+
+                if corridor.end != node:
+                    corridors[direction.name] = corridor
+
+    @property
+    def maze(self) -> Maze:
+        """Maze the graph was built from."""
+        return self.__maze
+
+    @property
+    def nodes(self) -> tuple[tuple[int, int]]:
+        """Coordinates of all the nodes of the graph."""
+        return tuple(self.__corridors.keys())
+
+    def is_node(self, x: int, y: int) -> bool:
+        """Returns if the given coordinates are a node of the graph."""
+        return (x, y) in self.__corridors
+
+    def corridors(self, x: int, y: int) -> tuple[Corridor]:
+        """All the corridors leaving the node at the given coordinates."""
+        return tuple(self.__corridors.get((x, y), {}).values())
+
+    def corridor(
+            self,
+            x: int,
+            y: int,
+            direction: Direction
+    ) -> Union[Corridor, None]:
+        """Corridor leaving the node at the given coordinates in the given
+        direction. When there's no such corridor, None."""
+        return self.__corridors.get((x, y), {}).get(direction.name)
+
+    def operators(self) -> tuple["CorridorOperator"]:
+        """Operators of going through the corridors of this graph."""
+        return tuple([CorridorOperator(d, self) for d in directions()])
+
+    def expand(self, state: "Junction") -> tuple[Direction]:
+        """Expands the path to the given state to the per-field directions
+        from the origin."""
+        expanded = []
+
+        for parent in state.all_parents(include_self=True)[1:]:
+            corridor = self.corridor(
+                parent.parent.x,
+                parent.parent.y,
+                parent.applied_operator.direction
+            )
+            expanded.extend(corridor.directions)
+
+        return tuple(expanded)
+
+    def expand_fields(self, state: "Junction") -> tuple[tuple[int, int]]:
+        """Expands the path to the given state to the coordinates of all the
+        fields visited on the way from the origin."""
+        origin = state.all_parents(include_self=True)[0]
+        x, y = origin.x, origin.y
+        visited = [(x, y)]
+
+        for direction in self.expand(state):
+            x, y = x + direction.x_diff, y + direction.y_diff
+            visited.append((x, y))
+
+        return tuple(visited)
+
+    def _open_directions(self, x: int, y: int) -> tuple[Direction]:
+        """Directions from the given coordinates not leading into a wall."""
+        return tuple([
+            d for d in directions()
+            if not self.maze.is_wall(x + d.x_diff, y + d.y_diff)
+        ])
+
+    def _walk(self, node: tuple[int, int], direction: Direction) -> Corridor:
+        """Follows the corridor from the given node in the given direction
+        until the next node is reached."""
+        x, y = node[0] + direction.x_diff, node[1] + direction.y_diff
+        steps = [direction]
+
+        while (x, y) not in self.__corridors:
+            # Inside a corridor, there's exactly one way forward
+            came_from = steps[-1].opposite
+            direction = [
+                d for d in self._open_directions(x, y) if d != came_from
+            ][0]
+
+            x, y = x + direction.x_diff, y + direction.y_diff
+            steps.append(direction)
+
+        return Corridor(node, (x, y), tuple(steps))
+
+
+class Junction(State):
+    """This class defines states as 'being at a node of the maze graph'.
+    """
+
+    def __init__(
+            self,
+            x: int,
+            y: int,
+            parent: Union["Junction", None] = None,
+            applied_operator: Union["CorridorOperator", None] = None
+    ):
+        super().__init__(parent, applied_operator)
+        self.x = x
+        self.y = y
+
+    def distance_from(self, state: "Junction") -> float:
+        """Euclidean distance - a lower bound of the length of any path."""
+        return (((self.x - state.x) ** 2) + (self.y - state.y) ** 2) ** 0.5
+
+    def __eq__(self, other: "Junction") -> bool:
+        return self.x == other.x and self.y == other.y
+
+    def __hash__(self) -> int:
+        return hash((self.x, self.y))
+
+    def __repr__(self):
+        return f"Junction([{self.x}, {self.y}])"
+
+
+class CorridorOperator(Operator):
+    """This class defines operators as going through the whole corridor
+    leaving the node in a specific direction. The cost of the operator is
+    the length of the corridor.
+    """
+
+    def __init__(self, direction: Direction, graph: MazeGraph):
+        super().__init__(direction.name)
+        self.__direction = direction
+        self.__graph = graph
+
+    @property
+    def direction(self) -> Direction:
+        return self.__direction
+
+    @property
+    def graph(self) -> MazeGraph:
+        return self.__graph
+
+    def can_be_applied(self, state: Junction) -> bool:
+        corridor = self.graph.corridor(state.x, state.y, self.direction)
+        return corridor is not None
+
+    def apply(self, state: Junction) -> Junction:
+        corridor = self.graph.corridor(state.x, state.y, self.direction)
+        return Junction(*corridor.end, state, self)
+
+    def cost(self, state: Junction) -> float:
+        return self.graph.corridor(state.x, state.y, self.direction).length
@@ -0,0 +1,542 @@
+"""This module contains the hierarchical path-finding (HPA*) for very large
+mazes.
+
+The maze is partitioned into square clusters. Neighbouring clusters are
+connected by entrances - pairs of adjacent path fields on their common
+border. Entrance fields are the nodes of a small abstract graph with two
+kinds of edges - single steps between the clusters and the precomputed
+distances of the nodes within the same cluster.
+
+A query searches the abstract graph only (after connecting the start and the
+goal to the nodes of their clusters) and the found abstract path is refined
+into the fields lazily - segment by segment, each searched within a single
+cluster. The found paths are nearly, but not always, the shortest ones.
+
+The abstraction is cached in a binary file next to the file the maze was
+loaded from, so it's built just once for each maze.
+
+Most importantly, it declares the following classes:
+
+    - HierarchicalMaze:
+        The abstract graph of the clusters of a maze.
+
+    - HierarchicalSearch:
+        Algorithm searching the maze using the abstract graph.
+"""
+
+import heapq
+import os
+import struct
+import zlib
+from array import array
+from collections import deque
+from typing import Callable, Iterator, Union
+
+from src.fw import State, Operator
+from src.fw.algorithms.base import Algorithm, NoSolutionFound
+from src.fw.algorithms.closed_set import ClosedSet
+from src.problems.maze import Maze
+from src.problems.maze.maze_state_space import Position, DirectionOperator
+
+
+# Bounds of a cluster - minimal and maximal coordinates in both axes
+_Bounds = tuple[int, int, int, int]
+
+# Steps to all the orthogonal neighbours
+_STEPS = ((1, 0), (-1, 0), (0, 1), (0, -1))
+
+
+class HierarchicalMaze:
+    """Abstract graph of a maze partitioned into square clusters of the
+    given size.
+
+    The nodes are the path fields on the borders of the clusters forming
+    entrances. Short entrances (a run of the adjacent path fields on the
+    border) get a single pair of nodes in their middle, longer ones a pair
+    at each end.
+    """
+
+    # Entrances at least this long get the nodes at both ends
+    LONG_ENTRANCE = 6
+
+    # Header of the cache file: magic, version, cluster size, width, height,
+    # checksum of the maze, checksum of the graph, number of nodes and edges
+    _FILE_HEADER = struct.Struct("<4sHHIIIIII")
+    _FILE_MAGIC = b"SSHP"
+    _FILE_VERSION = 1
+
+    def __init__(
+            self,
+            maze: Maze,
+            cluster_size: int = 16,
+            nodes: Union[list[tuple[int, int]], None] = None,
+            edges: Union[list[tuple[int, int, int]], None] = None
+    ):
+        if cluster_size < 2:
+            raise ValueError(f"Cluster is too small: {cluster_size = }")
+
+        self.__maze = maze
+        self.__cluster_size = cluster_size
+        self.__nodes: list[tuple[int, int]] = []
+        self.__indexes: dict[tuple[int, int], int] = {}
+        self.__edges: list[dict[int, int]] = []
+        self.__cluster_nodes: dict[tuple[int, int], list[int]] = {}
+
+        if nodes is None or edges is None:
+            nodes, edges = self._abstract()
+
+        for node in nodes:
+            self._add_node(node)
+
+        for a, b, cost in edges:
+            self.__edges[a][b] = cost
+            self.__edges[b][a] = cost
+
+    @classmethod
+    def of_maze(
+            cls,
+            maze: Maze,
+            cluster_size: int = 16,
+            use_cache: bool = True
+    ) -> "HierarchicalMaze":
+        """Creates the abstract graph of the given maze. When the maze was
+        loaded from a file, the graph is cached in a file next to it and
+        loaded from it the next time (unless the maze changed since)."""
+        path = cls.cache_path(maze, cluster_size) if use_cache else None
+
+        if path and os.path.exists(path):
+            hierarchy = cls.load(path, maze)
+
+            if hierarchy is not None:
+                return hierarchy
+
+        hierarchy = cls(maze, cluster_size)
+
+        if path:
+            hierarchy.save(path)
+
+        return hierarchy
+
+    @staticmethod
+    def cache_path(maze: Maze, cluster_size: int) -> Union[str, None]:
+        """Path of the cache file of the abstract graph of the given maze.
+        When the maze was never stored in a file, None."""
+        if maze.source_path is None:
+            return None
+        return f"{maze.source_path}.hpa{cluster_size}"
+
+    @classmethod
+    def load(cls, path: str, maze: Maze) -> Union["HierarchicalMaze", None]:
+        """Loads the abstract graph of the given maze from the file created
+        by `save`. When the file was created for another maze (or it's
+        damaged), None."""
+        header = cls._FILE_HEADER
+
+        with open(path, "rb") as file:
+            data = file.read()
+
+        if len(data) < header.size:
+            return None
+
+        (magic, version, cluster_size, width, height, maze_checksum,
+         checksum, n_nodes, n_edges) = header.unpack_from(data)
+
+        payload = data[header.size:]
+
+        if (magic != cls._FILE_MAGIC or version != cls._FILE_VERSION or
+                (width, height) != maze.dimensions or
+                maze_checksum != _checksum(maze) or
+                checksum != zlib.crc32(payload)):
+            return None
+
+        numbers = array("i")
+        numbers.frombytes(payload)
+
+        coordinates = numbers[:2 * n_nodes]
+        triples = numbers[2 * n_nodes:]
+
+        nodes = list(zip(coordinates[0::2], coordinates[1::2]))
+        edges = list(zip(triples[0::3], triples[1::3], triples[2::3]))
+
+        if len(edges) != n_edges:
+            return None
+
+        return cls(maze, cluster_size, nodes, edges)
+
+    def save(self, path: str):
+        """Saves the abstract graph into a binary file."""
+        numbers = array("i")
+
+        for x, y in self.__nodes:
+            numbers.extend((x, y))
+
+        n_edges = 0
+
+        for a, neighbours in enumerate(self.__edges):
+            for b, cost in neighbours.items():
+                if a < b:
+                    numbers.extend((a, b, cost))
+                    n_edges += 1
+
+        payload = numbers.tobytes()
+
+        with open(path, "wb") as file:
+            file.write(self._FILE_HEADER.pack(
+                self._FILE_MAGIC, self._FILE_VERSION, self.__cluster_size,
+                *self.__maze.dimensions, _checksum(self.__maze),
+                zlib.crc32(payload), len(self.__nodes), n_edges))
+            file.write(payload)
+
+    @property
+    def maze(self) -> Maze:
+        return self.__maze
+
+    @property
+    def cluster_size(self) -> int:
+        return self.__cluster_size
+
+    @property
+    def nodes(self) -> tuple[tuple[int, int]]:
+        """Coordinates of all the nodes of the abstract graph."""
+        return tuple(self.__nodes)
+
+    def cluster_of(self, x: int, y: int) -> tuple[int, int]:
+        """Indexes of the cluster the given field lies in."""
+        x_min, _, y_min, _ = self.__maze.frame
+        size = self.__cluster_size
+        return (x - x_min) // size, (y - y_min) // size
+
+    def bounds_of(self, cluster: tuple[int, int]) -> _Bounds:
+        """Minimal and maximal coordinates of the fields of the cluster."""
+        x_min, x_max, y_min, y_max = self.__maze.frame
+        size = self.__cluster_size
+        left, bottom = x_min + cluster[0] * size, y_min + cluster[1] * size
+
+        return (
+            left, min(left + size - 1, x_max),
+            bottom, min(bottom + size - 1, y_max)
+        )
+
+    def abstract_path(
+            self,
+            start: tuple[int, int],
+            goal: tuple[int, int],
+            on_expansion: Union[Callable[[int], None], None] = None
+    ) -> Union[list[tuple[int, int]], None]:
+        """Searches the abstract graph (by the A* algorithm) for the path
+        from the start to the goal. Returns the coordinates of the start,
+        the visited nodes and the goal. When there's no path, None.
+
+        :param on_expansion: Function called for each expanded node with the
+                             number of its neighbours.
+        """
+        if self.__maze.is_wall(*start) or self.__maze.is_wall(*goal):
+            return None
+
+        if start == goal:
+            return [start]
+
+        # The start and the goal are temporarily connected to their clusters
+        from_start = self._connect(start)
+        to_goal = self._connect(goal)
+
+        if self.cluster_of(*start) == self.cluster_of(*goal):
+            bounds = self.bounds_of(self.cluster_of(*start))
+            distances, _ = _search_cluster(
+                self.__maze, start, bounds, {goal})
+
+            if goal in distances:
+                from_start[goal] = distances[goal]
+
+        costs = {start: 0}
+        parents = {start: None}
+        expanded = set()
+        fringe = [(_manhattan(start, goal), 0, start)]
+        inserted = 1
+
+        while fringe:
+            _, _, point = heapq.heappop(fringe)
+
+            if point in expanded:
+                continue
+
+            if point == goal:
+                path = [point]
+                while parents[path[-1]] is not None:
+                    path.append(parents[path[-1]])
+                return list(reversed(path))
+
+            expanded.add(point)
+
+            neighbours = {}
+
+            if point in self.__indexes:
+                index = self.__indexes[point]
+                neighbours = {
+                    self.__nodes[i]: cost
+                    for i, cost in self.__edges[index].items()
+                }
+
+            if point == start:
+                neighbours.update(from_start)
+
+            if point in to_goal:
+                neighbours[goal] = to_goal[point]
+
+            for neighbour, cost in neighbours.items():
+                cost += costs[point]
+
+                if cost < costs.get(neighbour, cost + 1):
+                    costs[neighbour] = cost
+                    parents[neighbour] = point
+                    f = cost + _manhattan(neighbour, goal)
+                    heapq.heappush(fringe, (f, inserted, neighbour))
+                    inserted += 1
+
+            if on_expansion:
+                on_expansion(len(neighbours))
+
+        return None
+
+    def refine(
+            self,
+            path: list[tuple[int, int]]
+    ) -> Iterator[tuple[int, int]]:
+        """Refines the given abstract path into the coordinates of all the
+        visited fields (excluding the start). The segments are refined
+        lazily - only when the iteration gets to them."""
+        for start, end in zip(path, path[1:]):
+            if _manhattan(start, end) == 1:
+                yield end
+                continue
+
+            # Segments of more steps lie within a single cluster
+            bounds = self.bounds_of(self.cluster_of(*start))
+            _, parents = _search_cluster(self.__maze, start, bounds, {end})
+
+            segment = [end]
+            while parents[segment[-1]] != start:
+                segment.append(parents[segment[-1]])
+
+            yield from reversed(segment)
+
+    def _add_node(self, node: tuple[int, int]) -> int:
+        """Adds the given node (when not present yet) and returns its index.
+        """
+        if node not in self.__indexes:
+            self.__indexes[node] = len(self.__nodes)
+            self.__nodes.append(node)
+            self.__edges.append({})
+            self.__cluster_nodes.setdefault(
+                self.cluster_of(*node), []).append(self.__indexes[node])
+
+        return self.__indexes[node]
+
+    def _connect(self, point: tuple[int, int]) -> dict[tuple[int, int], int]:
+        """Distances from the given field to the nodes of its cluster."""
+        cluster = self.cluster_of(*point)
+        targets = {
+            self.__nodes[i] for i in self.__cluster_nodes.get(cluster, [])}
+
+        distances, _ = _search_cluster(
+            self.__maze, point, self.bounds_of(cluster), targets)
+        return {node: distances[node] for node in targets if node in distances}
+
+    def _abstract(self) -> tuple[list[tuple[int, int]],
+                                 list[tuple[int, int, int]]]:
+        """Finds all the entrances of the clusters and the distances of their
+        nodes within the clusters."""
+        x_min, x_max, y_min, y_max = self.__maze.frame
+        size = self.__cluster_size
+        n_x = (x_max - x_min) // size + 1
+        n_y = (y_max - y_min) // size + 1
+
+        nodes: dict[tuple[int, int], None] = {}
+        edges: list[tuple[tuple[int, int], tuple[int, int], int]] = []
+
+        for cx in range(n_x):
+            for cy in range(n_y):
+                left, right, bottom, top = self.bounds_of((cx, cy))
+
+                # Entrances to the cluster on the right
+                if cx + 1 < n_x:
+                    border = [(right, y) for y in range(bottom, top + 1)]
+                    edges.extend(self._entrances(border, (1, 0)))
+
+                # Entrances to the cluster above
+                if cy + 1 < n_y:
+                    border = [(x, top) for x in range(left, right + 1)]
+                    edges.extend(self._entrances(border, (0, 1)))
+
+        for a, b, _ in edges:
+            nodes[a] = nodes[b] = None
+
+        # Group the nodes by the clusters
+        clusters: dict[tuple[int, int], list[tuple[int, int]]] = {}
+
+        for node in nodes:
+            clusters.setdefault(self.cluster_of(*node), []).append(node)
+
+        # Distances of the nodes within each cluster
+        for cluster, members in clusters.items():
+            bounds = self.bounds_of(cluster)
+
+            for i, node in enumerate(members):
+                targets = set(members[i + 1:])
+                distances, _ = _search_cluster(
+                    self.__maze, node, bounds, targets)
+
+                for other in targets:
+                    if other in distances:
+                        edges.append((node, other, distances[other]))
+
+        indexes = {node: index for index, node in enumerate(nodes)}
+        return list(nodes), [(indexes[a], indexes[b], c) for a, b, c in edges]
+
+    def _entrances(
+            self,
+            border: list[tuple[int, int]],
+            step: tuple[int, int]
+    ) -> list[tuple[tuple[int, int], tuple[int, int], int]]:
+        """Finds the entrances on the given border fields of a cluster to
+        the neighbouring cluster in the given direction. Returns the edges
+        (of a single step) between the pairs of the nodes."""
+        is_wall = self.__maze.is_wall
+        edges = []
+        run = []
+
+        # The trailing None closes the last run
+        for field in border + [None]:
+            if field is not None:
+                x, y = field
+                opened = (not is_wall(x, y) and
+                          not is_wall(x + step[0], y + step[1]))
+
+                if opened:
+                    run.append(field)
+                    continue
+
+            if run:
+                if len(run) < self.LONG_ENTRANCE:
+                    chosen = [run[len(run) // 2]]
+                else:
+                    chosen = [run[0], run[-1]]
+
+                for x, y in chosen:
+                    edges.append(((x, y), (x + step[0], y + step[1]), 1))
+
+                run = []
+
+        return edges
+
+
+class HierarchicalSearch(Algorithm):
+    """Algorithm searching the maze by the abstract graph of its clusters
+    and refining the found path into a chain of positions produced by the
+    direction operators.
+
+    It expects the `Position` states and the `DirectionOperator` operators
+    of the maze the abstract graph was built for.
+    """
+
+    def __init__(
+            self,
+            hierarchy: HierarchicalMaze,
+            closed_set: Union[ClosedSet, None] = None
+    ):
+        super().__init__("HPA_STAR", closed_set)
+        self.__hierarchy = hierarchy
+
+    @property
+    def hierarchy(self) -> HierarchicalMaze:
+        return self.__hierarchy
+
+    def next_state(self):
+        """Not used in this algorithm."""
+
+    def solve(
+            self,
+            initial_state: Position,
+            goal_state: Position,
+            operators: tuple[Operator]
+    ) -> State:
+        """Finds the abstract path and refines it into the positions."""
+        self.reset()
+
+        operators_by_diffs = {
+            (op.direction.x_diff, op.direction.y_diff): op
+            for op in operators if isinstance(op, DirectionOperator)
+        }
+
+        start = (initial_state.x, initial_state.y)
+        path = self.hierarchy.abstract_path(
+            start, (goal_state.x, goal_state.y), self.note_expansion)
+
+        if path is None:
+            raise NoSolutionFound(state=initial_state)
+
+        state, (x, y) = initial_state, start
+
+        for next_x, next_y in self.hierarchy.refine(path):
+            state = operators_by_diffs[(next_x - x, next_y - y)].apply(state)
+            x, y = next_x, next_y
+
+        return state
+
+
+def _search_cluster(
+        maze: Maze,
+        origin: tuple[int, int],
+        bounds: _Bounds,
+        targets: set[tuple[int, int]]
+) -> tuple[dict[tuple[int, int], int],
+           dict[tuple[int, int], tuple[int, int]]]:
+    """Breadth-first search from the origin not leaving the given bounds.
+    It stops once all the targets are found. Returns the distances and the
+    parents of all the reached fields."""
+    left, right, bottom, top = bounds
+    distances = {origin: 0}
+    parents = {}
+    remaining = set(targets) - {origin}
+    queue = deque([origin])
+
+    while queue and remaining:
+        x, y = queue.popleft()
+
+        for dx, dy in _STEPS:
+            field = (x + dx, y + dy)
+
+            if field in distances or maze.is_wall(*field):
+                continue
+
+            if not (left <= field[0] <= right and bottom <= field[1] <= top):
+                continue
+
+            distances[field] = distances[(x, y)] + 1
+            parents[field] = (x, y)
+            remaining.discard(field)
+            queue.append(field)
+
+    return distances, parents
+
+
+def _checksum(maze: Maze) -> int:
+    """Checksum of the fields of the maze (padding bits excluded)."""
+    width, height = maze.dimensions
+    row_bytes = maze.row_bytes
+    checksum = 0
+
+    # Mask of the used bits of the last byte of each row
+    last_mask = (1 << (width - (row_bytes - 1) * 8)) - 1
+
+    for y in range(height):
+        row = bytearray(maze.bitmap[y * row_bytes:(y + 1) * row_bytes])
+        row[-1] &= last_mask
+        checksum = zlib.crc32(row, checksum)
+
+    return checksum
+
+
+def _manhattan(a: tuple[int, int], b: tuple[int, int]) -> int:
+    """Manhattan distance of the given coordinates."""
+    return abs(a[0] - b[0]) + abs(a[1] - b[1])
@@ -0,0 +1,121 @@
+"""This module contains the rendering of the mazes into grayscale images -
+useful for the mazes too huge to be printed as a text.
+
+Both the supported formats (PGM and PNG) are written by the standard library
+only. The images are streamed row by row into the given binary file-like
+object, so the whole image never has to be kept in the memory.
+
+Walls are black, paths are white and the highlighted fields (e.g. a found
+path) are gray. Each field can be scaled up to a square of pixels.
+"""
+
+import struct
+import zlib
+from typing import BinaryIO, Iterable, Iterator
+
+from src.problems.maze import Maze
+
+
+# Shades of the fields
+WALL_SHADE = 0
+PATH_SHADE = 255
+HIGHLIGHT_SHADE = 128
+
+# Size of the compressed data written in a single PNG chunk
+_PNG_CHUNK_SIZE = 1 << 16
+
+
+def write_pgm(
+        maze: Maze,
+        file: BinaryIO,
+        highlighted: Iterable[tuple[int, int]] = (),
+        scale: int = 1
+):
+    """Writes the maze as a binary PGM (portable graymap) image."""
+    width, height = maze.dimensions
+    file.write(f"P5 {width * scale} {height * scale} 255\n".encode("ascii"))
+
+    for row in _pixel_rows(maze, highlighted, scale):
+        file.write(row)
+
+
+def write_png(
+        maze: Maze,
+        file: BinaryIO,
+        highlighted: Iterable[tuple[int, int]] = (),
+        scale: int = 1
+):
+    """Writes the maze as a PNG image (8-bit grayscale). The pixels are
+    compressed on the fly and written in chunks of a limited size."""
+    width, height = maze.dimensions
+
+    file.write(b"\x89PNG\r\n\x1a\n")
+    _write_chunk(file, b"IHDR", struct.pack(
+        ">IIBBBBB", width * scale, height * scale, 8, 0, 0, 0, 0))
+
+    compressor = zlib.compressobj()
+    pending = bytearray()
+
+    for row in _pixel_rows(maze, highlighted, scale):
+        # Each row starts with the type of its filter (none)
+        pending += compressor.compress(b"\x00" + row)
+
+        if len(pending) >= _PNG_CHUNK_SIZE:
+            _write_chunk(file, b"IDAT", bytes(pending))
+            pending.clear()
+
+    pending += compressor.flush()
+    _write_chunk(file, b"IDAT", bytes(pending))
+    _write_chunk(file, b"IEND", b"")
+
+
+def _pixel_rows(
+        maze: Maze,
+        highlighted: Iterable[tuple[int, int]],
+        scale: int
+) -> Iterator[bytes]:
+    """Renders the rows of the pixels of the maze (from the top one)."""
+    if scale < 1:
+        raise ValueError(f"Scale has to be positive: {scale = }")
+
+    x_min, _, y_min, y_max = maze.frame
+    width, height = maze.dimensions
+    row_bytes = maze.row_bytes
+
+    # Highlighted fields by the rows
+    overlay: dict[int, list[int]] = {}
+
+    for x, y in set(highlighted):
+        if maze.contains(x, y):
+            overlay.setdefault(y, []).append(x - x_min)
+
+    for y in range(y_max, y_min - 1, -1):
+        start = (y - y_min) * row_bytes
+        row = bytearray(b"".join([
+            _PIXELS[byte] for byte in maze.bitmap[start:start + row_bytes]
+        ])[:width])
+
+        for x in overlay.get(y, ()):
+            row[x] = HIGHLIGHT_SHADE
+
+        if scale > 1:
+            row = bytes(pixel for pixel in row for _ in range(scale))
+
+        for _ in range(scale):
+            yield bytes(row)
+
+
+def _write_chunk(file: BinaryIO, kind: bytes, data: bytes):
+    """Writes a single PNG chunk - its length, kind, data and checksum."""
+    file.write(struct.pack(">I", len(data)))
+    file.write(kind)
+    file.write(data)
+    file.write(struct.pack(">I", zlib.crc32(kind + data)))
+
+
+# For each byte of the bit array, the pixels of its 8 fields
+_PIXELS = [
+    bytes([WALL_SHADE if byte & (1 << bit) else PATH_SHADE
+           for bit in range(8)])
+    for byte in range(256)
+]
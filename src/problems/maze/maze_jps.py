@@ -0,0 +1,208 @@
+"""This module contains the Jump Point Search - an algorithm specialized for
+the Maze Solving.
+
+Moves in the maze are uniform-cost and 4-connected, so there are usually
+many equally long paths differing just in the order of the moves (they are
+symmetric). Jump Point Search breaks these symmetries - instead of adding
+each neighbour of a field to the fringe, it "jumps" straight in a direction
+until it reaches a field where the path might need to turn (a jump point).
+Only the jump points are ever expanded, which is a small fraction of all
+the fields on open areas and in long corridors.
+
+The found path of the jump points is expanded back to a chain of positions
+produced by the direction operators, so it's equivalent to the one found by
+the A* algorithm.
+"""
+
+import heapq
+from typing import Union
+
+from src.fw import State, Operator
+from src.fw.algorithms.base import Algorithm, NoSolutionFound
+from src.fw.algorithms.closed_set import ClosedSet
+from src.problems.maze import Maze
+from src.problems.maze.maze_state_space import Position, DirectionOperator
+
+
+class JumpPointSearch(Algorithm):
+    """Jump Point Search (the 4-connected variant) of the A* algorithm over
+    the bit array of the maze.
+
+    Horizontal jumps stop at the fields with a forced neighbour (a field up
+    or down, which was blocked right behind). Vertical jumps stop at such
+    fields as well, and also at the fields where any horizontal jump would
+    stop. The jump points are searched by the A* with the Manhattan distance
+    (a lower bound of any 4-connected path).
+
+    It expects the `Position` states and the `DirectionOperator` operators
+    of a single maze.
+    """
+
+    def __init__(self, closed_set: Union[ClosedSet, None] = None):
+        super().__init__("JPS", closed_set)
+        self.__maze: Union[Maze, None] = None
+
+    def next_state(self):
+        """Not used in this algorithm."""
+
+    def solve(
+            self,
+            initial_state: Position,
+            goal_state: Position,
+            operators: tuple[Operator]
+    ) -> State:
+        """Finds the jump points leading to the goal and expands them into
+        the chain of positions."""
+        self.reset()
+
+        operators_by_diffs = {
+            (op.direction.x_diff, op.direction.y_diff): op
+            for op in operators if isinstance(op, DirectionOperator)
+        }
+
+        if len(operators_by_diffs) != 4:
+            raise ValueError("All four direction operators are needed")
+
+        self.__maze = next(iter(operators_by_diffs.values())).maze
+
+        start = (initial_state.x, initial_state.y)
+        goal = (goal_state.x, goal_state.y)
+
+        parents: dict[tuple[int, int], Union[tuple[int, int], None]] = {
+            start: None}
+        costs = {start: 0}
+        expanded = set()
+
+        # Fringe ordered by `g + h` (and then by the order of insertion)
+        fringe = [(_manhattan(start, goal), 0, start)]
+        inserted = 1
+
+        while fringe:
+            _, _, point = heapq.heappop(fringe)
+
+            if point in expanded:
+                continue
+
+            if point == goal:
+                return self._expand_path(
+                    initial_state, point, parents, operators_by_diffs)
+
+            expanded.add(point)
+            successors = []
+
+            for direction in self._pruned_directions(point, parents[point]):
+                jump_point = self._jump(point, direction, goal)
+
+                if jump_point is not None:
+                    successors.append(jump_point)
+
+            for successor in successors:
+                cost = costs[point] + _manhattan(point, successor)
+
+                if cost < costs.get(successor, cost + 1):
+                    costs[successor] = cost
+                    parents[successor] = point
+                    f = cost + _manhattan(successor, goal)
+                    heapq.heappush(fringe, (f, inserted, successor))
+                    inserted += 1
+
+            self.add_to_closed(Position(self.__maze.field_at(*point)))
+            self.note_expansion(len(successors))
+
+        # There's no jump point to be searched in and still no solution found
+        raise NoSolutionFound(state=initial_state)
+
+    def _pruned_directions(
+            self,
+            point: tuple[int, int],
+            parent: Union[tuple[int, int], None]
+    ) -> tuple[tuple[int, int]]:
+        """Directions worth jumping to from the given point, considering the
+        direction it was reached in."""
+        if parent is None:
+            candidates = ((1, 0), (-1, 0), (0, 1), (0, -1))
+        else:
+            dx = _sign(point[0] - parent[0])
+            dy = _sign(point[1] - parent[1])
+
+            if dx:
+                candidates = ((dx, 0), (0, 1), (0, -1))
+            else:
+                candidates = ((0, dy), (1, 0), (-1, 0))
+
+        x, y = point
+        return tuple([
+            (dx, dy) for dx, dy in candidates
+            if not self.__maze.is_wall(x + dx, y + dy)
+        ])
+
+    def _jump(
+            self,
+            point: tuple[int, int],
+            direction: tuple[int, int],
+            goal: tuple[int, int]
+    ) -> Union[tuple[int, int], None]:
+        """Goes straight from the given point in the given direction until
+        a jump point is reached. When it hits a wall first, None."""
+        is_wall = self.__maze.is_wall
+        (x, y), (dx, dy) = point, direction
+
+        while True:
+            x, y = x + dx, y + dy
+
+            if is_wall(x, y):
+                return None
+
+            if (x, y) == goal:
+                return x, y
+
+            if dx:
+                # Forced neighbour up or down
+                if ((not is_wall(x, y + 1) and is_wall(x - dx, y + 1)) or
+                        (not is_wall(x, y - 1) and is_wall(x - dx, y - 1))):
+                    return x, y
+            else:
+                # Forced neighbour to the left or to the right
+                if ((not is_wall(x + 1, y) and is_wall(x + 1, y - dy)) or
+                        (not is_wall(x - 1, y) and is_wall(x - 1, y - dy))):
+                    return x, y
+
+                # Any horizontal jump point makes this one a jump point
+                if (self._jump((x, y), (1, 0), goal) is not None or
+                        self._jump((x, y), (-1, 0), goal) is not None):
+                    return x, y
+
+    @staticmethod
+    def _expand_path(
+            initial_state: Position,
+            point: tuple[int, int],
+            parents: dict[tuple[int, int], Union[tuple[int, int], None]],
+            operators_by_diffs: dict[tuple[int, int], DirectionOperator]
+    ) -> Position:
+        """Expands the path of the jump points ending in the given one into
+        the chain of positions starting in the initial state."""
+        points = [point]
+
+        while parents[points[-1]] is not None:
+            points.append(parents[points[-1]])
+
+        state = initial_state
+
+        for start, end in zip(reversed(points), reversed(points[:-1])):
+            diffs = (_sign(end[0] - start[0]), _sign(end[1] - start[1]))
+            operator = operators_by_diffs[diffs]
+
+            for _ in range(_manhattan(start, end)):
+                state = operator.apply(state)
+
+        return state
+
+
+def _sign(value: int) -> int:
+    """Sign of the given number (-1, 0 or 1)."""
+    return (value > 0) - (value < 0)
+
+
+def _manhattan(a: tuple[int, int], b: tuple[int, int]) -> int:
+    """Manhattan distance of the given coordinates."""
+    return abs(a[0] - b[0]) + abs(a[1] - b[1])
@@ -0,0 +1,199 @@
+"""This module contains the landmark (ALT) heuristic for the Maze Solving -
+a lower bound of the distance of any two fields derived from their exact
+distances to a few selected fields (landmarks).
+
+For any landmark `L` and fields `a` and `b`, the triangle inequality gives
+`dist(a, b) >= |dist(L, a) - dist(L, b)|`. The distances from the landmarks
+are precomputed once for the whole maze, so unlike the distance field of
+a particular goal, the heuristic serves any start and goal.
+
+The landmarks are selected by the farthest-point strategy - each next one
+is the field farthest from all the already selected ones - so they lie on
+the periphery of the maze, "behind" most of the queries.
+
+Most importantly, it declares the following classes:
+
+    - Landmarks:
+        Selected landmarks of a maze with their distance fields.
+
+    - LandmarkHeuristic:
+        Heuristic estimating the distance by the triangle inequality.
+
+This module requires NumPy.
+"""
+
+from typing import Union
+
+import numpy as np
+
+from src.fw import State
+from src.fw.heuristic import Heuristic
+from src.problems.maze import Maze
+from src.problems.maze.maze_distance_field import (
+    flood_fill, wall_grid, UNREACHABLE)
+
+
+class Landmarks:
+    """Landmarks of a maze with the distance fields of all of them - stacked
+    into a single 3D array indexed by `[landmark, y - y_min, x - x_min]`.
+
+    The array can be saved into a file and loaded back memory-mapped, so the
+    preprocessing is done just once for a maze and its pages are shared by
+    all the processes using it.
+    """
+
+    def __init__(self, maze: Maze, distances: np.ndarray):
+        width, height = maze.dimensions
+
+        if distances.ndim != 3 or distances.shape[1:] != (height, width):
+            raise ValueError(
+                f"Distances of shape {distances.shape} don't fit the maze: "
+                f"{width = }, {height = }")
+
+        self.__maze = maze
+        self.__distances = distances
+
+    @classmethod
+    def select(
+            cls,
+            maze: Maze,
+            k: int = 8,
+            first: Union[tuple[int, int], None] = None
+    ) -> "Landmarks":
+        """Selects `k` landmarks of the given maze by the farthest-point
+        strategy and computes their distance fields.
+
+        :param maze: Maze the landmarks are selected in.
+
+        :param k: Number of the landmarks.
+
+        :param first: Field the selection starts from - the first landmark
+                      is the field farthest from it. By default, the first
+                      path field of the maze.
+        """
+        if k < 1:
+            raise ValueError(f"Needs at least one landmark: {k = }")
+
+        x_min, _, y_min, _ = maze.frame
+
+        if first is None:
+            y, x = np.argwhere(~wall_grid(maze))[0]
+            first = (int(x) + x_min, int(y) + y_min)
+
+        # Distance of each field to the nearest landmark (or the first field)
+        nearest = flood_fill(maze, first)
+        distances = []
+
+        for _ in range(k):
+            y, x = np.unravel_index(np.argmax(nearest), nearest.shape)
+            field = flood_fill(maze, (int(x) + x_min, int(y) + y_min))
+            distances.append(field)
+
+            nearest = np.where(
+                field == UNREACHABLE, nearest, np.minimum(nearest, field))
+
+        return cls(maze, np.stack(distances))
+
+    @classmethod
+    def load(cls, path: str, maze: Maze, mmap: bool = True) -> "Landmarks":
+        """Loads the distance fields of the landmarks of the given maze from
+        the file created by `save`. When `mmap` is set, the file is
+        memory-mapped (read-only) instead of read."""
+        distances = np.load(path, mmap_mode="r" if mmap else None)
+        return cls(maze, distances)
+
+    def save(self, path: str):
+        """Saves the distance fields of the landmarks into a file (NumPy
+        `.npy` format)."""
+        np.save(path, self.__distances)
+
+    @property
+    def maze(self) -> Maze:
+        return self.__maze
+
+    @property
+    def distances(self) -> np.ndarray:
+        """Distance fields of all the landmarks."""
+        return self.__distances
+
+    @property
+    def coordinates(self) -> tuple[tuple[int, int]]:
+        """Coordinates of the landmarks (fields of zero distance)."""
+        x_min, _, y_min, _ = self.maze.frame
+        coordinates = []
+
+        for field in self.__distances:
+            y, x = np.argwhere(field == 0)[0]
+            coordinates.append((int(x) + x_min, int(y) + y_min))
+
+        return tuple(coordinates)
+
+    def __len__(self) -> int:
+        return len(self.__distances)
+
+    def distances_of(self, x: int, y: int) -> np.ndarray:
+        """Distances of the given field from all the landmarks."""
+        x_min, _, y_min, _ = self.maze.frame
+        return self.__distances[:, y - y_min, x - x_min]
+
+    def lower_bound(
+            self,
+            field: tuple[int, int],
+            other: tuple[int, int]
+    ) -> float:
+        """Lower bound of the distance of the given fields by the triangle
+        inequality. When any landmark reaches just one of them, they are not
+        connected at all (infinitely far)."""
+        return _lower_bound(
+            self.distances_of(*field), self.distances_of(*other))
+
+
+class LandmarkHeuristic(Heuristic):
+    """Admissible heuristic of the Maze Solving estimating the distance to
+    the goal by the triangle inequality over the landmarks. The Euclidean
+    distance is used when it's higher.
+
+    It works with any state having the `x` and `y` coordinates in the maze
+    (like `Position` or `Junction`).
+    """
+
+    def __init__(self, landmarks: Landmarks):
+        self.__landmarks = landmarks
+
+        # Distances of the last goal from the landmarks
+        self.__goal: Union[tuple[int, int], None] = None
+        self.__goal_distances: Union[np.ndarray, None] = None
+
+    @property
+    def landmarks(self) -> Landmarks:
+        return self.__landmarks
+
+    def estimate(self, state: State, goal_state: State) -> float:
+        goal = (goal_state.x, goal_state.y)
+
+        if goal != self.__goal:
+            self.__goal = goal
+            self.__goal_distances = np.asarray(
+                self.landmarks.distances_of(*goal))
+
+        bound = _lower_bound(
+            self.landmarks.distances_of(state.x, state.y),
+            self.__goal_distances
+        )
+        return max(bound, state.distance_from(goal_state))
+
+
+def _lower_bound(distances: np.ndarray, others: np.ndarray) -> float:
+    """Lower bound of the distance of two fields given by their distances
+    from the landmarks."""
+    reached, others_reached = distances >= 0, others >= 0
+
+    if np.any(reached != others_reached):
+        return float("inf")
+
+    both = reached & others_reached
+
+    if not np.any(both):
+        return 0.0
+
+    return float(np.max(np.abs(distances[both] - others[both])))
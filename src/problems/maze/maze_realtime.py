@@ -0,0 +1,303 @@
+"""This module contains the real-time search for the Maze Solving - the
+Learning Real-Time A* (LRTA*) agent.
+
+Instead of planning the whole path before the first move, the agent searches
+just a bounded neighbourhood of its field, moves towards the most promising
+field and learns - it raises the estimates of the searched fields to the
+best estimate seen behind them. Each move thus takes a bounded time, no
+matter how large the maze is.
+
+The learned estimates are kept in a table of the whole maze. It can be
+saved into a compact file and loaded back, so the later trials on the same
+maze continue learning. Over the repeated trials, the agent converges to
+the shortest path.
+
+Most importantly, it declares the following classes:
+
+    - HeuristicTable:
+        Learned estimates of the distances to a goal for all the fields.
+
+    - RealTimeSearch:
+        Algorithm moving the LRTA* agent through the maze.
+"""
+
+import heapq
+import struct
+from array import array
+from typing import Union
+
+from src.fw import State, Operator
+from src.fw.algorithms.base import Algorithm, NoSolutionFound
+from src.fw.algorithms.closed_set import ClosedSet
+from src.fw.heuristic import Heuristic
+from src.problems.maze import Maze
+from src.problems.maze.maze_state_space import Position, DirectionOperator
+
+
+class HeuristicTable(Heuristic):
+    """Table of the estimates of the distances to the given goal for all
+    the fields of the maze (as 32-bit floats). Initially, the estimates are
+    the Manhattan distances, and they are only raised by the learning, so
+    they stay admissible. Therefore, the table can be used as a heuristic
+    of the other algorithms as well.
+    """
+
+    # Header of the file: magic, version, width, height, goal coordinates
+    _FILE_HEADER = struct.Struct("<4sHxxIIii")
+    _FILE_MAGIC = b"SSRT"
+    _FILE_VERSION = 1
+
+    def __init__(
+            self,
+            maze: Maze,
+            goal: tuple[int, int],
+            values: Union[array, None] = None
+    ):
+        width, height = maze.dimensions
+        x_min, _, y_min, _ = maze.frame
+
+        if values is None:
+            values = array("f", [
+                abs(x - goal[0]) + abs(y - goal[1])
+                for y in range(y_min, y_min + height)
+                for x in range(x_min, x_min + width)
+            ])
+        elif len(values) != width * height:
+            raise ValueError(
+                f"Table of {len(values)} values doesn't fit the maze: "
+                f"{width = }, {height = }")
+
+        self.__maze = maze
+        self.__goal = goal
+        self.__values = values
+
+    @classmethod
+    def load(cls, path: str, maze: Maze) -> "HeuristicTable":
+        """Loads the table of the given maze from the file created by `save`.
+        """
+        header = cls._FILE_HEADER
+
+        with open(path, "rb") as file:
+            magic, version, width, height, goal_x, goal_y = header.unpack(
+                file.read(header.size))
+
+            if magic != cls._FILE_MAGIC or version != cls._FILE_VERSION:
+                raise ValueError(f"Not a heuristic table file (version "
+                                 f"{cls._FILE_VERSION}): {path}")
+
+            if (width, height) != maze.dimensions:
+                raise ValueError(
+                    f"Table of {width}x{height} fields doesn't fit the maze: "
+                    f"{maze.dimensions}")
+
+            values = array("f")
+            values.frombytes(file.read())
+
+        return cls(maze, (goal_x, goal_y), values)
+
+    def save(self, path: str):
+        """Saves the table into a compact binary file (a header followed by
+        4 bytes for each field)."""
+        with open(path, "wb") as file:
+            file.write(self._FILE_HEADER.pack(
+                self._FILE_MAGIC, self._FILE_VERSION,
+                *self.__maze.dimensions, *self.__goal))
+            file.write(self.__values.tobytes())
+
+    @property
+    def maze(self) -> Maze:
+        return self.__maze
+
+    @property
+    def goal(self) -> tuple[int, int]:
+        """Coordinates of the goal the distances are estimated to."""
+        return self.__goal
+
+    def value(self, x: int, y: int) -> float:
+        """Estimated distance of the given field to the goal."""
+        return self.__values[self._index(x, y)]
+
+    def raise_to(self, x: int, y: int, value: float):
+        """Raises the estimate of the given field to the given value (when
+        it's higher than the current one)."""
+        index = self._index(x, y)
+        self.__values[index] = max(self.__values[index], value)
+
+    def estimate(self, state: State, goal_state: State) -> float:
+        """Learned estimate of the distance of the state. For the other
+        goals than the one of the table, the Manhattan distance."""
+        if (goal_state.x, goal_state.y) != self.__goal:
+            return abs(state.x - goal_state.x) + abs(state.y - goal_state.y)
+        return self.value(state.x, state.y)
+
+    def _index(self, x: int, y: int) -> int:
+        """Index of the given field in the table."""
+        x_min, _, y_min, _ = self.__maze.frame
+        return (y - y_min) * self.__maze.dimensions[0] + (x - x_min)
+
+
+class RealTimeSearch(Algorithm):
+    """Real-time agent moving through the maze - the Real-Time Adaptive A*
+    (RTAA*) variant of the Learning Real-Time A* (LRTA*).
+
+    Before each move, it runs the A* algorithm from its field limited to
+    `lookahead` expansions. The best field of the fringe is where the agent
+    moves next. All the expanded fields learn their new estimate - the
+    estimate of the best field minus their distance from the agent (they
+    cannot be closer to the goal). With a single expansion, it behaves as
+    the plain LRTA*.
+
+    The learned table is kept across the solved State Spaces (as long as the
+    maze and the goal are the same), so each trial continues learning. When
+    the agent doesn't reach the goal in `max_moves` moves, it gives up.
+
+    The returned state is the whole trajectory of the agent (including the
+    moves back and forth). It expects the `Position` states and the
+    `DirectionOperator` operators.
+    """
+
+    def __init__(
+            self,
+            lookahead: int = 1,
+            table: Union[HeuristicTable, None] = None,
+            max_moves: Union[int, None] = None,
+            closed_set: Union[ClosedSet, None] = None
+    ):
+        super().__init__("LRTA_STAR", closed_set)
+
+        if lookahead < 1:
+            raise ValueError(f"Needs at least one expansion: {lookahead = }")
+
+        self.__lookahead = lookahead
+        self.__table = table
+        self.__max_moves = max_moves
+
+    @property
+    def lookahead(self) -> int:
+        """Number of the fields expanded before each move."""
+        return self.__lookahead
+
+    @property
+    def table(self) -> Union[HeuristicTable, None]:
+        """Table of the learned estimates."""
+        return self.__table
+
+    def next_state(self):
+        """Not used in this algorithm."""
+
+    def solve(
+            self,
+            initial_state: Position,
+            goal_state: Position,
+            operators: tuple[Operator]
+    ) -> State:
+        """Moves the agent from the initial state until it reaches the goal.
+        """
+        self.reset()
+
+        operators_by_diffs = {
+            (op.direction.x_diff, op.direction.y_diff): op
+            for op in operators if isinstance(op, DirectionOperator)
+        }
+
+        maze = next(iter(operators_by_diffs.values())).maze
+        goal = (goal_state.x, goal_state.y)
+        table = self.__table
+
+        if table is None or table.maze is not maze or table.goal != goal:
+            table = self.__table = HeuristicTable(maze, goal)
+
+        width, height = maze.dimensions
+        max_moves = self.__max_moves or 4 * width * height
+
+        state, moves = initial_state, 0
+
+        while (state.x, state.y) != goal:
+            steps = self._look_ahead(maze, table, (state.x, state.y), goal)
+
+            if not steps:
+                raise NoSolutionFound(state=state, message="Agent is stuck")
+
+            for x, y in steps:
+                if moves == max_moves:
+                    raise NoSolutionFound(
+                        state=state,
+                        message=f"Goal not reached in {max_moves} moves")
+
+                diffs = (x - state.x, y - state.y)
+                state = operators_by_diffs[diffs].apply(state)
+                moves += 1
+
+        return state
+
+    def _look_ahead(
+            self,
+            maze: Maze,
+            table: HeuristicTable,
+            origin: tuple[int, int],
+            goal: tuple[int, int]
+    ) -> list[tuple[int, int]]:
+        """Runs the limited A* from the origin, updates the estimates of the
+        expanded fields and returns the steps to the best field of the
+        fringe. When there's no field to go to, the list is empty."""
+        costs = {origin: 0}
+        parents: dict[tuple[int, int], tuple[int, int]] = {}
+        expanded: list[tuple[int, int]] = []
+        closed = set()
+
+        # Fringe ordered by `g + h`, the deeper fields first on ties
+        fringe = [(table.value(*origin), 0, origin)]
+
+        while fringe and len(expanded) < self.__lookahead:
+            _, negative_cost, field = fringe[0]
+
+            if field in closed or -negative_cost != costs[field]:
+                heapq.heappop(fringe)
+                continue
+
+            if field == goal:
+                break
+
+            heapq.heappop(fringe)
+            closed.add(field)
+            expanded.append(field)
+            children = 0
+
+            x, y = field
+            for dx, dy in ((1, 0), (0, 1), (-1, 0), (0, -1)):
+                child = (x + dx, y + dy)
+                cost = costs[field] + 1
+
+                if maze.is_wall(*child) or cost >= costs.get(child, cost + 1):
+                    continue
+
+                costs[child] = cost
+                parents[child] = field
+                heapq.heappush(
+                    fringe, (cost + table.value(*child), -cost, child))
+                children += 1
+
+            self.note_expansion(children)
+
+        # Skip the outdated entries to find the best field of the fringe
+        while fringe:
+            _, negative_cost, best = fringe[0]
+
+            if best not in closed and -negative_cost == costs[best]:
+                break
+
+            heapq.heappop(fringe)
+        else:
+            return []
+
+        # Expanded fields cannot be closer than through the best one
+        f_best = costs[best] + table.value(*best)
+
+        for field in expanded:
+            table.raise_to(*field, f_best - costs[field])
+
+        steps = [best]
+        while parents.get(steps[-1], origin) != origin:
+            steps.append(parents[steps[-1]])
+
+        return list(reversed(steps))
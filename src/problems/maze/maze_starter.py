@@ -1,9 +1,11 @@
+import sys
 import time
 from typing import Iterable, Union
 
 from src.fw import Algorithm, StateSpace, algorithms
 from src.fw.algorithms.base import NoSolutionFound
 from src.problems.maze import generate_maze, directions, Maze
+from src.problems.maze.maze_graph import MazeGraph, Junction
 from src.problems.maze.maze_state_space import Position, DirectionOperator
 
 
@@ -16,7 +18,9 @@ def start_maze_solving(
     print_path: bool = True,
     print_error_path: bool = True,
     print_operators: bool = True,
-    print_number_of_operators: bool = True
+    print_number_of_operators: bool = True,
+    compress_corridors: bool = False,
+    use_distance_field: bool = False
 ):
     """Facade function to schedule solution of a random maze.
 
@@ -52,6 +56,15 @@ def start_maze_solving(
 
     :param print_number_of_operators:
         Flag if the number of operators applied on the path should be printed.
+
+    :param compress_corridors:
+        Flag if the maze should be searched as a graph of junctions with the
+        corridors collapsed into weighted edges.
+
+    :param use_distance_field:
+        Flag if the informed algorithms should use the exact distances to
+        the goal (precomputed by a flood fill; requires NumPy) instead of
+        the Euclidean ones.
     """
 
     # Generate empty maze if not given one
@@ -59,10 +72,38 @@ def start_maze_solving(
 
     # If print empty maze
     if print_empty:
-        print(maze.stringify_maze())
-
-    # Prepare operators
-    operators = tuple([DirectionOperator(d, maze) for d in directions()])
+        maze.write_text(sys.stdout)
+
+    # Start and goal lie in the opposite corners inside the wall frame
+    x_min, x_max, y_min, y_max = maze.frame
+    start, goal = (x_min + 1, y_min + 1), (x_max - 1, y_max - 1)
+
+    heuristic = None
+
+    if use_distance_field:
+        # NumPy is needed only for this heuristic
+        from src.problems.maze.maze_distance_field import (
+            DistanceFieldHeuristic)
+        heuristic = DistanceFieldHeuristic(maze)
+
+    # Prepare the states and operators
+    if compress_corridors:
+        graph = MazeGraph(maze, keep=(start, goal))
+        operators = graph.operators()
+        initial_state, goal_state = Junction(*start), Junction(*goal)
+    else:
+        graph = None
+        operators = tuple([DirectionOperator(d, maze) for d in directions()])
+        initial_state = Position(maze.field_at(*start))
+        goal_state = Position(maze.field_at(*goal))
+
+    def visited_fields(state) -> list[tuple[int, int]]:
+        """Coordinates of all the fields on the path to the given state."""
+        if graph:
+            return list(graph.expand_fields(state))
+
+        parents = state.all_parents(include_self=True)
+        return [(parent.x, parent.y) for parent in parents]
 
     # For each of the given algorithms
     for algorithm in use_algorithms:
@@ -71,10 +112,11 @@ def start_maze_solving(
 
         # Define State Space
         state_space = StateSpace(
-            initial_state=Position(maze.field_at(1, 1)),
-            goal_state=Position(maze.field_at(maze_size, maze_size)),
+            initial_state=initial_state,
+            goal_state=goal_state,
             operators=operators,
-            algorithm=algorithm
+            algorithm=algorithm,
+            heuristic=heuristic
         )
 
         try:
@@ -83,8 +125,11 @@ def start_maze_solving(
             ended = time.time()
 
             # Analyze applied operators
-            applied_operators = (
-                solution.all_applied_operators(reverse_operators=True))
+            if graph:
+                applied_operators = graph.expand(solution)
+            else:
+                applied_operators = (
+                    solution.all_applied_operators(reverse_operators=True))
 
             if print_time:
                 print(f"Solution found in {ended - started} seconds")
@@ -96,15 +141,13 @@ def start_maze_solving(
                 print(f"Operators: {applied_operators}")
 
             if print_path:
-                parents = solution.all_parents(include_self=True)
-                visited = [(parent.x, parent.y) for parent in parents]
-                print(maze.stringify_maze(fields_to_replace=visited))
+                visited = visited_fields(solution)
+                maze.write_text(sys.stdout, fields_to_replace=visited)
 
         except NoSolutionFound as error:
             print(error.message)
             if print_error_path:
-                parents = error.state.all_parents(include_self=True)
-                visited = [(parent.x, parent.y) for parent in parents]
-                print(maze.stringify_maze(fields_to_replace=visited))
+                visited = visited_fields(error.state)
+                maze.write_text(sys.stdout, fields_to_replace=visited)
 
         print("\n")
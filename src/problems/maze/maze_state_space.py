@@ -1,4 +1,4 @@
-from typing import Union
+from typing import Sequence, Union
 
 from src.fw import State, Operator
 from src.problems.maze import Field, Direction, Maze
@@ -22,6 +22,31 @@ class Position(State):
     def distance_from(self, state: "Position") -> float:
         return (((self.x - state.x) ** 2) + (self.y - state.y) ** 2) ** 0.5
 
+    @classmethod
+    def distance_from_many(
+            cls,
+            states: Sequence["Position"],
+            state: "Position"
+    ) -> Sequence[float]:
+        """Calculates the distances of all the given positions at once -
+        vectorized over the array of their coordinates. Without NumPy, the
+        positions are measured one by one."""
+        try:
+            # NumPy is needed only for the batched distances
+            import numpy as np
+        except ImportError:
+            return super().distance_from_many(states, state)
+
+        coords = np.array(
+            [(s.x, s.y) for s in states], dtype=float).reshape(-1, 2)
+        return np.hypot(coords[:, 0] - state.x, coords[:, 1] - state.y)
+
+    def __eq__(self, other: "Position") -> bool:
+        return self.x == other.x and self.y == other.y
+
+    def __hash__(self) -> int:
+        return hash((self.x, self.y))
+
     def __repr__(self):
         return f"{self.field}"
 
@@ -44,14 +69,16 @@ class DirectionOperator(Operator):
     def maze(self) -> Maze:
         return self.__maze
 
-    def can_be_applied(self, state: Position) -> bool:
-        neighbour = self.maze.neighbour_in_direction(
-            state.field, self.direction)
-
-        if neighbour:
-            return not neighbour.is_wall
+    @property
+    def inverse(self) -> "DirectionOperator":
+        """Movement in the opposite direction."""
+        return DirectionOperator(self.direction.opposite, self.maze)
 
-        return False
+    def can_be_applied(self, state: Position) -> bool:
+        return not self.maze.is_wall(
+            state.x + self.direction.x_diff,
+            state.y + self.direction.y_diff
+        )
 
     def apply(self, state: Position) -> Position:
         return Position(
@@ -59,3 +86,13 @@ class DirectionOperator(Operator):
             state,
             self
         )
+
+    def __eq__(self, other: Operator) -> bool:
+        return (
+            isinstance(other, DirectionOperator) and
+            self.direction == other.direction and
+            self.maze is other.maze
+        )
+
+    def __hash__(self) -> int:
+        return hash((self.direction.x_diff, self.direction.y_diff))
@@ -0,0 +1,268 @@
+"""This module contains a fast generator of large perfect mazes (mazes with
+exactly one path between any two fields) vectorized using NumPy.
+
+The generated mazes follow the same layout as the ones of `generate_maze`:
+for the given base size, the maze has a wall frame around and all the fields
+with both coordinates odd are paths (e.g. [1, 1] or [base, base]).
+
+The row-oriented algorithms produce the maze row by row, so the maze can be
+streamed (e.g. into a file) using memory proportional to its width only.
+
+This module requires NumPy.
+"""
+
+from enum import Enum
+from typing import Iterator, Union
+
+import numpy as np
+
+from src.problems.maze import Maze
+
+
+class PerfectMazeAlgorithm(Enum):
+    """Algorithm used to generate the perfect maze.
+
+    There are two major groups of the algorithms:
+
+        - row-oriented - producing the maze row by row, while remembering just
+                         the current row (Binary Tree, Sidewinder, Eller's).
+
+        - whole-maze - needing the whole maze to be remembered during the
+                       generation (Kruskal's).
+    """
+
+    BINARY_TREE = ("Binary Tree (biased to the north-east)", True)
+    SIDEWINDER = ("Sidewinder (biased to the north)", True)
+    ELLER = ("Eller's algorithm (unbiased)", True)
+    KRUSKAL = ("Randomized Kruskal's algorithm (unbiased)", False)
+
+    def __init__(self, description: str, row_oriented: bool):
+        super().__init__()
+        self.__description = description
+        self.__row_oriented = row_oriented
+
+    @property
+    def description(self) -> str:
+        """Description of the algorithm"""
+        return self.__description
+
+    @property
+    def row_oriented(self) -> bool:
+        """If the algorithm generates the maze row by row."""
+        return self.__row_oriented
+
+
+def maze_rows(
+        base: int,
+        algorithm: PerfectMazeAlgorithm = PerfectMazeAlgorithm.SIDEWINDER,
+        seed: Union[int, None] = None
+) -> Iterator[bytes]:
+    """Generates the rows of the bit array of a perfect maze from the given
+    base size - from the lowest y-axis coordinate up. Each row is a bit array
+    of the maze width (set bit for a wall) of the `Maze.row_bytes` length.
+
+    When the given base size is even or lower than 5, it rises an error.
+    """
+    n = _cells_count(base)
+    rng = np.random.default_rng(seed)
+
+    if algorithm == PerfectMazeAlgorithm.BINARY_TREE:
+        passages = _binary_tree(n, rng)
+    elif algorithm == PerfectMazeAlgorithm.SIDEWINDER:
+        passages = _sidewinder(n, rng)
+    elif algorithm == PerfectMazeAlgorithm.ELLER:
+        passages = _eller(n, rng)
+    else:
+        passages = _kruskal(n, rng)
+
+    return _emit_rows(n, passages)
+
+
+def generate_perfect_maze(
+        base: int,
+        algorithm: PerfectMazeAlgorithm = PerfectMazeAlgorithm.SIDEWINDER,
+        seed: Union[int, None] = None
+) -> Maze:
+    """Generates a random perfect maze from the given base size. Every field
+    with both coordinates being odd is a path (e.g. [1, 1]) and there's
+    exactly one way between any two of them.
+
+    When the given base size is even or lower than 5, it rises an error.
+    """
+    bitmap = bytearray().join(maze_rows(base, algorithm, seed))
+    return Maze.of_bitmap(bitmap, base + 2, base + 2)
+
+
+def _cells_count(base: int) -> int:
+    """Validates the base size and returns the number of cells (fields with
+    both coordinates odd) in each row."""
+    if base % 2 == 0:
+        raise ValueError(f"Cannot create a maze of an even number: {base}")
+    elif base < 5:
+        raise ValueError(f"Given base number is too small: {base}")
+
+    return (base + 1) // 2
+
+
+def _emit_rows(
+        n: int,
+        passages: Iterator[tuple[np.ndarray, np.ndarray]]
+) -> Iterator[bytes]:
+    """Turns the passages of each row of cells into the packed rows of the
+    bit array. For each row of cells, it takes the passages to the east
+    (`n - 1` flags) and to the north (`n` flags).
+    """
+    width = 2 * n + 1
+    walls = np.ones(width, dtype=np.uint8)
+
+    # Bottom line of walls
+    yield _pack(walls)
+
+    for east, north in passages:
+        cells_row = walls.copy()
+        cells_row[1::2] = 0
+        cells_row[2:-1:2][east] = 0
+        yield _pack(cells_row)
+
+        passages_row = walls.copy()
+        passages_row[1::2][north] = 0
+        yield _pack(passages_row)
+
+
+def _pack(row: np.ndarray) -> bytes:
+    """Packs the given row of flags into bytes of a bit array."""
+    return np.packbits(row, bitorder="little").tobytes()
+
+
+def _binary_tree(
+        n: int,
+        rng: np.random.Generator
+) -> Iterator[tuple[np.ndarray, np.ndarray]]:
+    """Each cell opens a passage either to the north or to the east."""
+    for _ in range(n - 1):
+        north = rng.random(n) < 0.5
+        north[-1] = True
+        yield ~north[:-1], north
+
+    # The top row can only go to the east
+    yield np.ones(n - 1, dtype=bool), np.zeros(n, dtype=bool)
+
+
+def _sidewinder(
+        n: int,
+        rng: np.random.Generator
+) -> Iterator[tuple[np.ndarray, np.ndarray]]:
+    """Each row is split into random runs of cells connected to the east.
+    Each run opens a passage to the north from one of its random cells."""
+    indexes = np.arange(n)
+
+    for _ in range(n - 1):
+        closes = rng.random(n) < 0.5
+        closes[-1] = True
+
+        # Runs start at the beginning and right after each closing
+        starts = indexes[np.concatenate(([True], closes[:-1]))]
+        lengths = np.diff(np.append(starts, n))
+        picked = starts + (rng.random(len(starts)) * lengths).astype(int)
+
+        north = np.zeros(n, dtype=bool)
+        north[picked] = True
+        yield ~closes[:-1], north
+
+    # The top row is a single run
+    yield np.ones(n - 1, dtype=bool), np.zeros(n, dtype=bool)
+
+
+def _eller(
+        n: int,
+        rng: np.random.Generator
+) -> Iterator[tuple[np.ndarray, np.ndarray]]:
+    """Cells of each row are labeled by the sets of the connected cells.
+    Neighbouring cells of different sets are randomly joined and each set
+    continues to the north from at least one of its cells. The last row
+    joins all the remaining sets."""
+    labels = np.arange(n)
+    next_label = n
+
+    for row in range(n):
+        last = row == n - 1
+        parents = {int(label): int(label) for label in labels}
+
+        def find(label: int) -> int:
+            """Finds the representative of the set of the given label."""
+            while parents[label] != label:
+                parents[label] = parents[parents[label]]
+                label = parents[label]
+            return label
+
+        # Join the neighbours randomly (the last row joins all of them)
+        joins = np.ones(n - 1, dtype=bool) if last else rng.random(n - 1) < 0.5
+        east = np.zeros(n - 1, dtype=bool)
+
+        for i in np.flatnonzero(joins):
+            a, b = find(int(labels[i])), find(int(labels[i + 1]))
+            if a != b:
+                parents[b] = a
+                east[i] = True
+
+        labels = np.array([find(int(label)) for label in labels])
+
+        if last:
+            yield east, np.zeros(n, dtype=bool)
+            return
+
+        # Each set goes to the north from at least one random cell
+        north = rng.random(n) < 0.5
+        shuffled = rng.permutation(n)
+        _, first = np.unique(labels[shuffled], return_index=True)
+        north[shuffled[first]] = True
+
+        yield east, north
+
+        # Cells not connected from the south start new sets
+        new = np.flatnonzero(~north)
+        labels[new] = np.arange(next_label, next_label + len(new))
+        next_label += len(new)
+
+
+def _kruskal(
+        n: int,
+        rng: np.random.Generator
+) -> Iterator[tuple[np.ndarray, np.ndarray]]:
+    """All the walls between the cells are removed in a random order, when
+    they separate two not yet connected cells (tracked by union-find)."""
+    n_horizontal = n * (n - 1)
+    parents = list(range(n * n))
+
+    def find(cell: int) -> int:
+        """Finds the representative of the set of the given cell."""
+        while parents[cell] != cell:
+            parents[cell] = parents[parents[cell]]
+            cell = parents[cell]
+        return cell
+
+    east = np.zeros((n, n - 1), dtype=bool)
+    north = np.zeros((n, n), dtype=bool)
+
+    for wall in rng.permutation(2 * n_horizontal).tolist():
+        if wall < n_horizontal:
+            # Wall between the cell and its eastern neighbour
+            row, column = divmod(wall, n - 1)
+            a, b = row * n + column, row * n + column + 1
+        else:
+            # Wall between the cell and its northern neighbour
+            row, column = divmod(wall - n_horizontal, n)
+            a, b = row * n + column, (row + 1) * n + column
+
+        a, b = find(a), find(b)
+
+        if a != b:
+            parents[b] = a
+
+            if wall < n_horizontal:
+                east[row, column] = True
+            else:
+                north[row, column] = True
+
+    for row in range(n):
+        yield east[row], north[row]